@@ -0,0 +1,382 @@
+"""
+KMeans benchmark suite.
+
+Times seeding, assignment, full fit and inertia of every solver variant
+on synthetic blob datasets over a grid of sizes and records peak memory
+of a fit. The original list-based KMeans is kept here as a frozen
+reference point.
+
+Usage (from the repository root):
+    python -m benchmarks.kmeans_benchmark --preset quick --output bench.json
+    python -m benchmarks.kmeans_benchmark --baseline bench.json
+"""
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from implementation.data_analysis.kmeans_implementation import KMeans
+
+
+# Grids of dataset sizes: n - rows, d - columns, k - clusters.
+PRESETS: dict[str, dict[str, list[int]]] = {
+    "quick": {"n": [1000, 10000], "d": [2, 8], "k": [2, 8]},
+    "standard": {
+        "n": [10000, 100000, 1000000],
+        "d": [2, 8, 64],
+        "k": [2, 16, 256]
+    },
+    "full": {
+        "n": [10000, 100000, 1000000, 5000000],
+        "d": [2, 8, 16, 64],
+        "k": [2, 8, 32, 256]
+    }
+}
+
+# Solver variants - KMeans keyword arguments.
+SOLVER_VARIANTS: dict[str, dict[str, Any]] = {
+    "float64": {},
+    "float32": {"dtype": np.float32},
+    "deduplicate": {"deduplicate": "auto"},
+    "kmeans_parallel": {"init": "k-means||"},
+    "threads": {"n_jobs": -1},
+    "brute": {"algorithm": "brute"},
+    "kdtree": {"algorithm": "kdtree"},
+    "manhattan": {"metric": "manhattan"},
+    "cosine": {"metric": "cosine"}
+}
+
+# The reference loops over points in Python, it is run on small data only.
+REFERENCE_MAX_ROWS: int = 100000
+# Timing ratio (current / baseline) reported as a regression.
+REGRESSION_RATIO: float = 1.25
+TIMED_STAGES: list[str] = ["seeding", "assignment", "fit", "inertia"]
+
+
+### REFERENCE
+
+class ReferenceKMeans:
+    """
+    Frozen copy of the original KMeans algorithm: centroids are
+    dictionary keys and points are appended to per-cluster lists.
+    """
+
+    def __init__(self, data: NDArray, k: int):
+        self.data: NDArray = np.asarray(data)
+        self.k = k
+        self.clusters: dict[tuple[np.float64], list[NDArray]] = {}
+
+    @staticmethod
+    def euclidean_distance(data1: NDArray, data2: NDArray) -> NDArray:
+        return np.sqrt(np.sum(a=(data1 - data2)**2, axis=1))
+
+    def kmeans_plusplus(self):
+        centroids: list[NDArray] = [
+            np.array(
+                object=self.data[
+                    np.random.randint(low=0, high=len(self.data))
+                ],
+                dtype=np.float64
+            )
+        ]
+        for _ in range(self.k - 1):
+            distances: list[NDArray] = [
+                self.euclidean_distance(data1=centroid, data2=self.data)
+                for centroid in centroids
+            ]
+            min_distances: NDArray = np.min(a=np.asarray(distances), axis=0)
+            probabilities: NDArray = min_distances / np.sum(min_distances)
+            sorted_inds: NDArray = np.argsort(probabilities)
+            cumulative: NDArray = np.cumsum(probabilities[sorted_inds])
+            ind: int = min(
+                int(np.searchsorted(a=cumulative, v=np.random.rand())),
+                len(self.data) - 1
+            )
+            centroids.append(self.data[sorted_inds[ind]])
+        for centroid in centroids:
+            self.clusters[tuple(centroid)] = []
+
+    def assign_points_to_centroids(self):
+        all_centroids_distances: list[NDArray] = [
+            self.euclidean_distance(data1=centroid, data2=self.data)
+            for centroid in self.clusters.keys()
+        ]
+        closest: NDArray = np.argmin(a=all_centroids_distances, axis=0)
+        for ind, centroid_ind in enumerate(closest):
+            closest_centroid: tuple[np.float64] = (
+                list(self.clusters.keys())[centroid_ind]
+            )
+            self.clusters[closest_centroid].append(self.data[ind])
+
+    def get_inertia(self) -> np.float64:
+        inertia: float = 0.0
+        for ind, points in enumerate(self.clusters.values()):
+            if points != []:
+                centroid: tuple[np.float64] = list(self.clusters.keys())[ind]
+                inertia += np.sum((centroid - np.asarray(points))**2)
+        return inertia
+
+
+### FUNCTIONS
+
+def make_blobs(
+    n: int, d: int, k: int, seed: int = 0
+) -> NDArray[np.float64]:
+    """
+    Function generates n points of k isotropic Gaussian blobs
+    in d dimensions with centers spread in a [-10, 10] hypercube.
+    Returns a float64 array of shape (n, d).
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    centers: NDArray[np.float64] = rng.uniform(low=-10, high=10, size=(k, d))
+    blob_inds: NDArray[np.int64] = rng.integers(low=0, high=k, size=n)
+    points: NDArray[np.float64] = rng.standard_normal(size=(n, d))
+    points += centers[blob_inds]
+
+    return points
+
+
+def time_call(func: Callable, seed: int) -> float:
+    """
+    Function calls func after seeding the global random generator.
+    Returns wall time of the call in seconds.
+    """
+    np.random.seed(seed)
+    start: float = time.perf_counter()
+    func()
+
+    return time.perf_counter() - start
+
+
+def measure_peak_memory(func: Callable, seed: int) -> int:
+    """
+    Function calls func with memory allocations traced.
+    Returns peak traced memory of the call in bytes.
+    """
+    np.random.seed(seed)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def benchmark_variant(
+    data: NDArray[np.float64],
+    k: int,
+    variant: str,
+    max_iter: int,
+    seed: int,
+    measure_memory: bool
+) -> dict[str, Any]:
+    """
+    Function times seeding, assignment, fit and inertia of one
+    solver variant. Fit runs exactly max_iter iterations (tol=0)
+    so that variants do the same amount of work, the recorded
+    inertia value is the one of the fitted model.
+    Returns a benchmark record.
+    """
+    record: dict[str, Any] = {"variant": variant}
+    if variant == "reference":
+        kmeans: ReferenceKMeans | KMeans = ReferenceKMeans(data=data, k=k)
+        record["seeding"] = time_call(func=kmeans.kmeans_plusplus, seed=seed)
+        record["assignment"] = time_call(
+            func=kmeans.assign_points_to_centroids, seed=seed
+        )
+        record["inertia"] = time_call(func=kmeans.get_inertia, seed=seed)
+        record["inertia_value"] = float(kmeans.get_inertia())
+        # The original algorithm has no Lloyd iterations.
+        record["fit"] = None
+        record["peak_memory"] = None
+        return record
+
+    options: dict[str, Any] = SOLVER_VARIANTS[variant]
+    kmeans = KMeans(data=data, k=k, **options)
+    record["seeding"] = time_call(func=kmeans.initialize_centroids, seed=seed)
+    record["assignment"] = time_call(func=kmeans.assign_labels, seed=seed)
+    record["inertia"] = time_call(func=kmeans.get_inertia, seed=seed)
+
+    fitted: list[KMeans] = []
+
+    def fit():
+        fitted_kmeans: KMeans = KMeans(data=data, k=k, **options)
+        fitted_kmeans.fit(max_iter=max_iter, tol=0.0)
+        fitted.append(fitted_kmeans)
+
+    record["fit"] = time_call(func=fit, seed=seed)
+    # Inertia of the fitted model, not of the seeding above.
+    record["inertia_value"] = float(fitted[0].inertia)
+    record["peak_memory"] = (
+        measure_peak_memory(func=fit, seed=seed) if measure_memory else None
+    )
+
+    return record
+
+
+def run_benchmarks(
+    grid: dict[str, list[int]],
+    variants: list[str],
+    max_iter: int = 10,
+    seed: int = 0,
+    measure_memory: bool = True,
+    log: Callable[[str], None] = print
+) -> list[dict[str, Any]]:
+    """
+    Function runs all variants on blob datasets of every (n, d, k)
+    combination of the grid.
+    Returns a list of benchmark records.
+    """
+    records: list[dict[str, Any]] = []
+    for n, d, k in itertools.product(grid["n"], grid["d"], grid["k"]):
+        if k >= n:
+            continue
+        data: NDArray[np.float64] = make_blobs(n=n, d=d, k=k, seed=seed)
+        for variant in variants:
+            if variant == "reference" and n > REFERENCE_MAX_ROWS:
+                continue
+            record: dict[str, Any] = {"n": n, "d": d, "k": k}
+            record.update(
+                benchmark_variant(
+                    data=data,
+                    k=k,
+                    variant=variant,
+                    max_iter=max_iter,
+                    seed=seed,
+                    measure_memory=measure_memory
+                )
+            )
+            records.append(record)
+            log(
+                f"n={n} d={d} k={k} {variant}: "
+                + " ".join(
+                    f"{stage}={record[stage]:.4f}s"
+                    for stage in TIMED_STAGES if record[stage] is not None
+                )
+            )
+
+    return records
+
+
+def compare_with_baseline(
+    records: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    regression_ratio: float = REGRESSION_RATIO
+) -> list[dict[str, Any]]:
+    """
+    Function matches records with baseline records of the same
+    n, d, k and variant and calculates current / baseline timing ratios.
+    Returns comparison rows, flagged if any ratio exceeds regression_ratio.
+    """
+    key: Callable = lambda record: (
+        record["n"], record["d"], record["k"], record["variant"]
+    )
+    baseline_records: dict[tuple, dict[str, Any]] = {
+        key(record): record for record in baseline
+    }
+
+    comparison: list[dict[str, Any]] = []
+    for record in records:
+        baseline_record: dict[str, Any] | None = (
+            baseline_records.get(key(record))
+        )
+        if baseline_record is None:
+            continue
+        ratios: dict[str, float] = {
+            stage: record[stage] / baseline_record[stage]
+            for stage in TIMED_STAGES
+            if record[stage] is not None and baseline_record[stage]
+        }
+        comparison.append(
+            {
+                "n": record["n"],
+                "d": record["d"],
+                "k": record["k"],
+                "variant": record["variant"],
+                "ratios": ratios,
+                "regression": any(
+                    ratio > regression_ratio for ratio in ratios.values()
+                )
+            }
+        )
+
+    return comparison
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Benchmark KMeans solver variants."
+    )
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick")
+    parser.add_argument("--n", type=int, nargs="+", help="Overrides preset.")
+    parser.add_argument("--d", type=int, nargs="+", help="Overrides preset.")
+    parser.add_argument("--k", type=int, nargs="+", help="Overrides preset.")
+    parser.add_argument(
+        "--variants",
+        nargs="+",
+        default=["reference", *SOLVER_VARIANTS],
+        choices=["reference", *SOLVER_VARIANTS]
+    )
+    parser.add_argument("--max-iter", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--baseline", help="Stored results to compare with.")
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    grid: dict[str, list[int]] = dict(PRESETS[args.preset])
+    for axis in ("n", "d", "k"):
+        if getattr(args, axis):
+            grid[axis] = getattr(args, axis)
+
+    records: list[dict[str, Any]] = run_benchmarks(
+        grid=grid,
+        variants=args.variants,
+        max_iter=args.max_iter,
+        seed=args.seed,
+        measure_memory=not args.no_memory
+    )
+    results: dict[str, Any] = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "max_iter": args.max_iter,
+        "records": records
+    }
+    with open(file=args.output, mode="w", encoding="utf-8") as file:
+        json.dump(obj=results, fp=file, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(file=args.baseline, mode="r", encoding="utf-8") as file:
+        baseline: dict[str, Any] = json.load(fp=file)
+    comparison: list[dict[str, Any]] = compare_with_baseline(
+        records=records, baseline=baseline["records"]
+    )
+    for row in comparison:
+        print(
+            f"n={row['n']} d={row['d']} k={row['k']} {row['variant']}: "
+            + " ".join(
+                f"{stage}x{ratio:.2f}"
+                for stage, ratio in row["ratios"].items()
+            )
+            + (" REGRESSION" if row["regression"] else "")
+        )
+
+    return int(any(row["regression"] for row in comparison))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
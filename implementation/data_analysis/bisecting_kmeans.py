@@ -0,0 +1,304 @@
+import json
+import time
+import pandas as pd
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Callable, Iterable
+from implementation.data_analysis.kmeans_implementation import (
+    KMeans,
+    debug_logger,
+    error_logger
+)
+
+
+### CLASS
+
+class BisectingKMeans(KMeans):
+    """
+    Bisecting variant of KMeans: starting from one cluster of all points
+    it repeatedly splits the leaf cluster with the largest SSE with
+    best of split_runs 2-means fits on that cluster's points only.
+    Splits are recorded as a tree (node 0 is the root, split i creates
+    nodes 2i + 1 and 2i + 2), so one fit can be cut at any k up to k.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame | NDArray | str | Iterable,
+        k: int,
+        split_runs: int = 3,
+        **kmeans_options
+    ):
+        super().__init__(data=data, k=k, **kmeans_options)
+        self.split_runs: int = split_runs
+        # Split tree: centroids, SSE and parents of nodes,
+        # nodes split by every split in order.
+        self.node_centroids: NDArray[np.float64] | None = None
+        self.node_sse: NDArray[np.float64] | None = None
+        self.node_parents: NDArray[np.int64] | None = None
+        self.split_nodes: NDArray[np.int64] | None = None
+        # Leaf node of every (unique) point after the last split.
+        self.point_nodes: NDArray[np.int64] | None = None
+        # Per-split records of the last fit.
+        self.splits: list[dict[str, int | float]] = []
+
+    def split(
+        self,
+        inds: NDArray[np.int64],
+        max_iter: int,
+        tol: float,
+        **split_options
+    ) -> KMeans:
+        """
+        Method clusters points of a leaf into two with the best of
+        split_runs fits of a KMeans over these points only.
+        Returns the fitted 2-means.
+        """
+        bisection: KMeans = KMeans(
+            data=self.data[inds],
+            k=2,
+            dtype=self.dtype,
+            chunk_size=self.chunk_size,
+            sample_weight=(
+                None if self.sample_weight is None
+                else self.sample_weight[inds]
+            ),
+            seed=self.random_state.randint(low=0, high=2**31 - 1),
+            init=self.init,
+            n_jobs=self.n_jobs,
+            metric=self.metric
+        )
+        bisection.get_best_result(
+            runs=self.split_runs, max_iter=max_iter, tol=tol, **split_options
+        )
+
+        return bisection
+
+    def fit(
+        self,
+        max_iter: int = 300,
+        tol: float = 1e-4,
+        callbacks: list[
+            Callable[["BisectingKMeans", dict], bool | None]
+        ] | None = None,
+        **split_options
+    ) -> np.float64:
+        """
+        Method builds the split tree with k - 1 splits (fewer if no leaf
+        can be split). Every split is a best of split_runs 2-means fit
+        of up to max_iter iterations on the leaf's points, split_options
+        go to its get_best_result. Every split is recorded to splits
+        (see get_splits) and passed to callbacks as callback(kmeans,
+        record). Splitting stops if any callback returns True.
+        The tree is cut at its number of leaves.
+        Returns inertia of the final clusters.
+        """
+        self.trace = []
+        self.splits = []
+        # The root centroid is the (weighted) mean or median of all points.
+        self.centroids = np.zeros(
+            shape=(1, self.data.shape[1]), dtype=np.float64
+        )
+        self.labels = np.zeros(shape=len(self.data), dtype=np.int64)
+        self.update_centroids()
+        node_centroids: list[NDArray[np.float64]] = [self.centroids[0]]
+        node_sse: list[float] = [float(self.get_inertia())]
+        node_parents: list[int] = [-1]
+        split_nodes: list[int] = []
+        is_splittable: list[bool] = [True]
+        point_nodes: NDArray[np.int64] = np.zeros(
+            shape=len(self.data), dtype=np.int64
+        )
+        inertia: float = node_sse[0]
+
+        while len(split_nodes) < self.k - 1:
+            candidates: NDArray[np.float64] = np.where(
+                np.asarray(is_splittable) & (np.asarray(node_sse) > 0.0),
+                node_sse,
+                -np.inf
+            )
+            # Split nodes are not leaves anymore.
+            candidates[split_nodes] = -np.inf
+            node: int = int(np.argmax(candidates))
+            if candidates[node] == -np.inf:
+                error_logger.warning(
+                    msg=f"Only {len(split_nodes) + 1} clusters can be split."
+                )
+                break
+
+            start_time: float = time.perf_counter()
+            inds: NDArray[np.int64] = np.flatnonzero(point_nodes == node)
+            bisection: KMeans = self.split(
+                inds=inds, max_iter=max_iter, tol=tol, **split_options
+            )
+            child_costs: NDArray[np.float64] = np.concatenate(
+                bisection.map_blocks(
+                    func=lambda start, block: bisection.assigned_distances(
+                        block=block,
+                        labels=bisection.labels[start:start + len(block)]
+                    )
+                )
+            )
+            child_sse: NDArray[np.float64] = np.bincount(
+                bisection.labels,
+                weights=(
+                    child_costs if bisection.sample_weight is None
+                    else child_costs * bisection.sample_weight
+                ),
+                minlength=2
+            )
+            if np.any(np.bincount(bisection.labels, minlength=2) == 0):
+                # 2-means left all points in one cluster.
+                is_splittable[node] = False
+                continue
+
+            first_child: int = len(node_sse)
+            point_nodes[inds] = first_child + bisection.labels
+            node_centroids.extend(bisection.centroids)
+            node_sse.extend(child_sse)
+            node_parents.extend([node, node])
+            is_splittable.extend([True, True])
+            split_nodes.append(node)
+            inertia += np.sum(child_sse) - node_sse[node]
+
+            record: dict[str, int | float] = {
+                "split": len(split_nodes),
+                "node": node,
+                "points": len(inds),
+                "sse": node_sse[node],
+                "children_sse": float(np.sum(child_sse)),
+                "inertia": float(inertia),
+                "split_time": time.perf_counter() - start_time
+            }
+            self.splits.append(record)
+            debug_logger.debug(msg=f"Split: {record}")
+            if any([callback(self, record) for callback in callbacks or []]):
+                break
+
+        self.node_centroids = np.asarray(node_centroids, dtype=np.float64)
+        self.node_sse = np.asarray(node_sse, dtype=np.float64)
+        self.node_parents = np.asarray(node_parents, dtype=np.int64)
+        self.split_nodes = np.asarray(split_nodes, dtype=np.int64)
+        self.point_nodes = point_nodes
+        self.cut(k=len(split_nodes) + 1)
+
+        return self.inertia
+
+    def cut(self, k: int) -> NDArray[np.int64]:
+        """
+        Method cuts the split tree at k clusters - leaves after the first
+        k - 1 splits. Nodes are created in split order, so the cluster
+        of a point is its deepest ancestor created by these splits.
+        Sets centroids, labels and inertia of the cut.
+        Returns labels of (unique) points.
+        """
+        if not 1 <= k <= len(self.split_nodes) + 1:
+            raise ValueError(
+                "Tree can be cut at 1 to "
+                f"{len(self.split_nodes) + 1} clusters."
+            )
+        last_node: int = 2 * (k - 1)
+        ancestors: NDArray[np.int64] = np.arange(len(self.node_parents))
+        for node in range(last_node + 1, len(self.node_parents)):
+            ancestors[node] = ancestors[self.node_parents[node]]
+        leaves: NDArray[np.int64] = np.setdiff1d(
+            ar1=np.arange(last_node + 1), ar2=self.split_nodes[:k - 1]
+        )
+        leaf_labels: NDArray[np.int64] = np.full(
+            shape=len(self.node_parents), fill_value=-1, dtype=np.int64
+        )
+        leaf_labels[leaves] = np.arange(len(leaves))
+
+        self.centroids = self.node_centroids[leaves]
+        self.labels = leaf_labels[ancestors[self.point_nodes]]
+        self.inertia = np.float64(np.sum(self.node_sse[leaves]))
+        self.clusters = {}
+
+        return self.labels
+
+    def get_elbow_data(self) -> dict[int, np.float64]:
+        """
+        Method calculates inertia of every cut of the split tree,
+        a split replaces SSE of a leaf with SSE of its children.
+        Returns a dictionary of inertia by k.
+        """
+        elbow_data: dict[int, np.float64] = {1: self.node_sse[0]}
+        for split, node in enumerate(self.split_nodes, start=1):
+            elbow_data[split + 1] = (
+                elbow_data[split] - self.node_sse[node]
+                + np.sum(self.node_sse[2 * split - 1:2 * split + 1])
+            )
+
+        return elbow_data
+
+    def get_splits(self) -> pd.DataFrame:
+        """
+        Method converts splits of the last fit to a table.
+        Returns a dataframe with a row per split.
+        """
+        return pd.DataFrame(
+            data=self.splits,
+            columns=[
+                "split",
+                "node",
+                "points",
+                "sse",
+                "children_sse",
+                "inertia",
+                "split_time"
+            ]
+        )
+
+    def get_best_result(
+        self,
+        runs: int,
+        max_iter: int = 300,
+        tol: float = 1e-4,
+        **split_options
+    ) -> dict[tuple[np.float64], list[NDArray[np.float64]]]:
+        """
+        Method builds the split tree taking the best of runs
+        2-means fits for every split.
+        Returns a dictionery with clusters of the final cut.
+        """
+        self.split_runs = runs
+        self.fit(max_iter=max_iter, tol=tol, **split_options)
+
+        return self.build_clusters()
+
+    def get_params(self) -> dict[str, Any]:
+        """
+        Method collects parameters that define a fit result.
+        Returns a JSON serializable dictionary.
+        """
+        params: dict[str, Any] = super().get_params()
+        params["split_runs"] = self.split_runs
+
+        return params
+
+    def get_state(self) -> dict[str, NDArray]:
+        """
+        Method collects arrays of the fitted model and its split tree.
+        Returns a dictionary of arrays by name.
+        """
+        arrays: dict[str, NDArray] = super().get_state()
+        arrays["node_centroids"] = self.node_centroids
+        arrays["node_sse"] = self.node_sse
+        arrays["node_parents"] = self.node_parents
+        arrays["split_nodes"] = self.split_nodes
+        arrays["point_nodes"] = self.point_nodes
+
+        return arrays
+
+    def load_state(self, path: str):
+        """
+        Method loads the fitted model and its split tree.
+        """
+        super().load_state(path=path)
+        with np.load(path) as model:
+            self.node_centroids = model["node_centroids"]
+            self.node_sse = model["node_sse"]
+            self.node_parents = model["node_parents"]
+            self.split_nodes = model["split_nodes"]
+            self.point_nodes = model["point_nodes"]
+            self.split_runs = json.loads(str(model["params"]))["split_runs"]
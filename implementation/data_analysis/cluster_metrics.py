@@ -0,0 +1,327 @@
+from typing import Any
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from implementation.data_analysis.kmeans_data import (
+    DEFAULT_CHUNK_SIZE,
+    DISTANCE_BLOCK_SIZE,
+    iterate_blocks,
+    load_kmeans_data
+)
+
+
+### FUNCTIONS
+
+def cluster_statistics(
+    data: Any,
+    labels: NDArray[np.int64],
+    k: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: DTypeLike = np.float64
+) -> dict[str, NDArray[np.float64]]:
+    """
+    Function calculates per-cluster statistics in two block passes:
+    sizes and centroids (means) in the first one, within-cluster
+    sums of squares and mean distances to centroids in the second one.
+    Data is anything KMeans accepts, labels are cluster indices of rows.
+    Returns a dictionary with counts, centroids, within_ss
+    and mean_distances arrays.
+    """
+    data = load_kmeans_data(source=data, dtype=dtype)
+    labels = np.asarray(labels, dtype=np.int64)
+    k = k or int(np.max(labels)) + 1
+
+    counts: NDArray[np.float64] = np.zeros(shape=k, dtype=np.float64)
+    sums: NDArray[np.float64] = np.zeros(
+        shape=(k, data.shape[1]), dtype=np.float64
+    )
+    for start, block in iterate_blocks(
+        data=data, chunk_size=chunk_size, dtype=dtype
+    ):
+        block_labels: NDArray[np.int64] = labels[start:start + len(block)]
+        counts += np.bincount(block_labels, minlength=k)
+        for column in range(block.shape[1]):
+            sums[:, column] += np.bincount(
+                block_labels, weights=block[:, column], minlength=k
+            )
+    centroids: NDArray[np.float64] = sums / np.maximum(counts, 1.0)[
+        :, np.newaxis
+    ]
+
+    within_ss: NDArray[np.float64] = np.zeros(shape=k, dtype=np.float64)
+    distance_sums: NDArray[np.float64] = np.zeros(shape=k, dtype=np.float64)
+    for start, block in iterate_blocks(
+        data=data, chunk_size=chunk_size, dtype=dtype
+    ):
+        block_labels = labels[start:start + len(block)]
+        squared_distances: NDArray[np.float64] = np.sum(
+            a=(block - centroids[block_labels])**2, axis=1, dtype=np.float64
+        )
+        within_ss += np.bincount(
+            block_labels, weights=squared_distances, minlength=k
+        )
+        distance_sums += np.bincount(
+            block_labels, weights=np.sqrt(squared_distances), minlength=k
+        )
+
+    return {
+        "counts": counts,
+        "centroids": centroids,
+        "within_ss": within_ss,
+        "mean_distances": distance_sums / np.maximum(counts, 1.0)
+    }
+
+
+def calinski_harabasz_score(
+    inertia: float, total_sum_of_squares: float, n: int, k: int
+) -> float:
+    """
+    Function calculates Calinski-Harabasz score from within-cluster
+    (inertia) and total sums of squares: ratio of between-cluster
+    to within-cluster dispersion, each divided by degrees of freedom.
+    Higher scores mean denser and better separated clusters.
+    Returns the score as a float.
+    """
+    if k < 2 or k >= n:
+        return np.nan
+    if inertia == 0.0:
+        return np.inf
+
+    return (
+        (total_sum_of_squares - inertia) / (k - 1)
+    ) / (inertia / (n - k))
+
+
+def calinski_harabasz(
+    data: Any,
+    labels: NDArray[np.int64],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: DTypeLike = np.float64
+) -> float:
+    """
+    Function calculates Calinski-Harabasz score of a clustering
+    from cluster statistics in O(n*d) time.
+    Returns the score as a float.
+    """
+    statistics: dict[str, NDArray[np.float64]] = cluster_statistics(
+        data=data, labels=labels, chunk_size=chunk_size, dtype=dtype
+    )
+    counts: NDArray[np.float64] = statistics["counts"]
+    mean: NDArray[np.float64] = (
+        counts @ statistics["centroids"] / np.sum(counts)
+    )
+    between_ss: float = float(
+        counts @ np.sum(a=(statistics["centroids"] - mean)**2, axis=1)
+    )
+    inertia: float = float(np.sum(statistics["within_ss"]))
+
+    return calinski_harabasz_score(
+        inertia=inertia,
+        total_sum_of_squares=inertia + between_ss,
+        n=int(np.sum(counts)),
+        k=int(np.count_nonzero(counts))
+    )
+
+
+def davies_bouldin(
+    data: Any,
+    labels: NDArray[np.int64],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: DTypeLike = np.float64
+) -> float:
+    """
+    Function calculates Davies-Bouldin score of a clustering: mean over
+    clusters of the worst ratio of summed cluster scatters (mean
+    distances to centroids) to the distance between centroids.
+    Cluster statistics take O(n*d) time, centroid pairs O(k^2*d).
+    Lower scores mean better separated clusters.
+    Returns the score as a float.
+    """
+    statistics: dict[str, NDArray[np.float64]] = cluster_statistics(
+        data=data, labels=labels, chunk_size=chunk_size, dtype=dtype
+    )
+    non_empty: NDArray[np.bool_] = statistics["counts"] > 0
+    if np.count_nonzero(non_empty) < 2:
+        return np.nan
+    centroids: NDArray[np.float64] = statistics["centroids"][non_empty]
+    scatters: NDArray[np.float64] = statistics["mean_distances"][non_empty]
+
+    centroid_distances: NDArray[np.float64] = np.sqrt(
+        np.sum(
+            a=(centroids[:, np.newaxis] - centroids[np.newaxis])**2, axis=2
+        )
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios: NDArray[np.float64] = (
+            (scatters[:, np.newaxis] + scatters[np.newaxis])
+            / centroid_distances
+        )
+    np.fill_diagonal(a=ratios, val=-np.inf)
+
+    return float(np.mean(np.max(a=ratios, axis=1)))
+
+
+def stratified_sample(
+    labels: NDArray[np.int64],
+    sample_size: int,
+    random_state: np.random.RandomState
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    Function draws rows without replacement from every cluster
+    in proportion to the cluster size, at least one row per cluster.
+    Returns sorted sampled row indices and their strata (cluster labels).
+    """
+    inds: list[NDArray[np.int64]] = []
+    for label in np.unique(labels):
+        cluster_inds: NDArray[np.int64] = np.flatnonzero(labels == label)
+        cluster_sample_size: int = min(
+            max(1, round(sample_size * len(cluster_inds) / len(labels))),
+            len(cluster_inds)
+        )
+        inds.append(
+            random_state.choice(
+                cluster_inds, size=cluster_sample_size, replace=False
+            )
+        )
+    sample_inds: NDArray[np.int64] = np.sort(np.concatenate(inds))
+
+    return sample_inds, labels[sample_inds]
+
+
+def silhouette_samples(
+    data: Any,
+    labels: NDArray[np.int64],
+    sample_inds: NDArray[np.int64] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: DTypeLike = np.float64
+) -> NDArray[np.float64]:
+    """
+    Function calculates silhouette coefficients of sample rows (all rows
+    by default) against all rows. Distances are calculated in blocks of
+    sample rows by data rows of at most DISTANCE_BLOCK_SIZE elements and
+    reduced to per-cluster distance sums right away, so memory does not
+    grow with the number of rows.
+    Points of single-point clusters get coefficient 0.
+    Returns an array of coefficients in sample_inds order.
+    """
+    data = load_kmeans_data(source=data, dtype=dtype)
+    labels = np.asarray(labels, dtype=np.int64)
+    k: int = int(np.max(labels)) + 1
+    if sample_inds is None:
+        sample_inds = np.arange(len(data))
+    counts: NDArray[np.float64] = np.bincount(labels, minlength=k).astype(
+        np.float64
+    )
+
+    data_block_size: int = min(chunk_size, len(data))
+    sample_block_size: int = max(1, DISTANCE_BLOCK_SIZE // data_block_size)
+    distance_sums: NDArray[np.float64] = np.zeros(
+        shape=(len(sample_inds), k), dtype=np.float64
+    )
+    for sample_start in range(0, len(sample_inds), sample_block_size):
+        sample_block: NDArray[np.float64] = np.asarray(
+            data[sample_inds[sample_start:sample_start + sample_block_size]],
+            dtype=np.float64
+        )
+        sample_norms: NDArray[np.float64] = np.sum(a=sample_block**2, axis=1)
+        for start, block in iterate_blocks(
+            data=data, chunk_size=data_block_size, dtype=np.float64
+        ):
+            distances: NDArray[np.float64] = sample_block @ block.T
+            distances *= -2.0
+            distances += sample_norms[:, np.newaxis]
+            distances += np.sum(a=block**2, axis=1)
+            np.maximum(distances, 0.0, out=distances)
+            np.sqrt(distances, out=distances)
+
+            one_hot: NDArray[np.float64] = np.zeros(
+                shape=(len(block), k), dtype=np.float64
+            )
+            one_hot[
+                np.arange(len(block)), labels[start:start + len(block)]
+            ] = 1.0
+            distance_sums[
+                sample_start:sample_start + len(sample_block)
+            ] += distances @ one_hot
+
+    sample_labels: NDArray[np.int64] = labels[sample_inds]
+    rows: NDArray[np.int64] = np.arange(len(sample_inds))
+    sample_counts: NDArray[np.float64] = counts[sample_labels]
+    # Distance of a point to itself is 0, so it only reduces the count.
+    intra: NDArray[np.float64] = distance_sums[rows, sample_labels] / (
+        np.maximum(sample_counts - 1.0, 1.0)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_distances: NDArray[np.float64] = distance_sums / counts
+    mean_distances[:, counts == 0] = np.inf
+    mean_distances[rows, sample_labels] = np.inf
+    inter: NDArray[np.float64] = np.min(a=mean_distances, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coefficients: NDArray[np.float64] = (
+            (inter - intra) / np.maximum(intra, inter)
+        )
+    coefficients[(sample_counts <= 1) | ~np.isfinite(coefficients)] = 0.0
+
+    return coefficients
+
+
+def silhouette(
+    data: Any,
+    labels: NDArray[np.int64],
+    sample_size: int | None = None,
+    seed: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: DTypeLike = np.float64
+) -> tuple[float, float]:
+    """
+    Function calculates mean silhouette coefficient of a clustering.
+    Without sample_size (or if it covers all rows) the score is exact
+    and takes O(n^2*d) time in memory-bounded blocks. Otherwise it is
+    estimated from a stratified sample of rows against all rows in
+    O(sample_size*n*d) time: cluster means are weighted by cluster
+    shares, the standard error includes finite population correction.
+    Returns the score and its standard error (0 for the exact score).
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    if len(np.unique(labels)) < 2:
+        return np.nan, np.nan
+    if sample_size is None or sample_size >= len(labels):
+        return float(
+            np.mean(
+                silhouette_samples(
+                    data=data,
+                    labels=labels,
+                    chunk_size=chunk_size,
+                    dtype=dtype
+                )
+            )
+        ), 0.0
+
+    random_state: np.random.RandomState = np.random.RandomState(seed=seed)
+    sample_inds, strata = stratified_sample(
+        labels=labels, sample_size=sample_size, random_state=random_state
+    )
+    coefficients: NDArray[np.float64] = silhouette_samples(
+        data=data,
+        labels=labels,
+        sample_inds=sample_inds,
+        chunk_size=chunk_size,
+        dtype=dtype
+    )
+
+    score: float = 0.0
+    variance: float = 0.0
+    for label in np.unique(strata):
+        stratum: NDArray[np.float64] = coefficients[strata == label]
+        population: int = np.count_nonzero(labels == label)
+        share: float = population / len(labels)
+        score += share * np.mean(stratum)
+        if len(stratum) > 1:
+            variance += (
+                share**2 * np.var(stratum, ddof=1) / len(stratum)
+                * (1.0 - len(stratum) / population)
+            )
+
+    return float(score), float(np.sqrt(variance))
@@ -0,0 +1,347 @@
+import json
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+# Distinct values are counted exactly up to this number,
+# then estimated with HyperLogLog.
+DISTINCT_EXACT_LIMIT: int = 1 << 16
+# HyperLogLog uses 2**precision registers (relative error
+# about 1.04 / sqrt(2**precision), 0.8% for 14).
+HLL_PRECISION: int = 14
+# Values kept for quantiles, quantiles are exact up to this many
+# values and estimated from a uniform sample above.
+QUANTILE_SAMPLE_SIZE: int = 1 << 14
+# Counted values for top-k, every chunk adds its most frequent ones,
+# so counts are exact while a column has fewer distinct values.
+TOP_VALUES_CAPACITY: int = 1024
+DEFAULT_QUANTILES: tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95)
+PROFILE_CHUNK_SIZE: int = 1 << 16
+
+
+### CLASS
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter over 64-bit hashes: the first
+    precision bits of a hash select a register, the register keeps
+    the maximum position of the first set bit of the other bits.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision: int = precision
+        self.registers: NDArray[np.uint8] = np.zeros(
+            shape=1 << precision, dtype=np.uint8
+        )
+
+    def update(self, hashes: NDArray[np.uint64]):
+        """
+        Method adds hashes of values.
+        """
+        value_bits: int = 64 - self.precision
+        registers: NDArray[np.uint64] = hashes >> np.uint64(value_bits)
+        values: NDArray[np.uint64] = hashes & np.uint64((1 << value_bits) - 1)
+        # Values have at most 50 bits, so they are exact in float64
+        # and frexp exponents are their bit lengths.
+        ranks: NDArray[np.uint8] = (
+            value_bits + 1 - np.frexp(values.astype(np.float64))[1]
+        ).astype(np.uint8)
+        np.maximum.at(self.registers, registers.astype(np.int64), ranks)
+
+    def merge(self, other: "HyperLogLog"):
+        """
+        Method adds values counted by another counter of the same
+        precision.
+        """
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        """
+        Method estimates the number of distinct values, with linear
+        counting for small cardinalities.
+        Returns the estimate.
+        """
+        registers: int = len(self.registers)
+        alpha: float = 0.7213 / (1.0 + 1.079 / registers)
+        estimate: float = alpha * registers ** 2 / np.sum(
+            np.ldexp(1.0, -self.registers.astype(np.int64))
+        )
+        empty: int = int(np.sum(self.registers == 0))
+        if estimate <= 2.5 * registers and empty > 0:
+            return registers * float(np.log(registers / empty))
+
+        return float(estimate)
+
+
+class ColumnProfile:
+    """
+    Streaming profile of one column: row and null counts, distinct
+    count (exact hashes up to distinct_limit, HyperLogLog above),
+    approximate top values and for numerical columns minimum, maximum,
+    mean and std (chunk moments merged with Chan's formula) and
+    quantiles of a reservoir sample.
+    """
+
+    def __init__(
+        self,
+        distinct_limit: int = DISTINCT_EXACT_LIMIT,
+        sample_size: int = QUANTILE_SAMPLE_SIZE,
+        top_capacity: int = TOP_VALUES_CAPACITY,
+        random_state: np.random.Generator | None = None
+    ):
+        self.distinct_limit: int = distinct_limit
+        self.sample_size: int = sample_size
+        self.top_capacity: int = top_capacity
+        self.random_state: np.random.Generator = (
+            random_state or np.random.default_rng()
+        )
+        self.dtype: str | None = None
+        self.numerical: bool = False
+        self.rows: int = 0
+        self.nulls: int = 0
+        # Exact distinct hashes, dropped above distinct_limit.
+        self.hashes: NDArray[np.uint64] | None = np.empty(
+            shape=0, dtype=np.uint64
+        )
+        self.hyperloglog: HyperLogLog = HyperLogLog()
+        self.top_values: pd.Series | None = None
+        # Moments of numerical values.
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float = np.inf
+        self.max: float = -np.inf
+        self.sample: NDArray[np.float64] = np.empty(
+            shape=sample_size, dtype=np.float64
+        )
+
+    def update(self, values: pd.Series):
+        """
+        Method adds a chunk of column values.
+        """
+        dtype: str = str(values.dtype)
+        if self.dtype is None:
+            self.dtype = dtype
+            self.numerical = (
+                pd.api.types.is_numeric_dtype(values)
+                and not pd.api.types.is_bool_dtype(values)
+            )
+        elif self.dtype != dtype:
+            # Chunks were typed differently, e.g. by a chunked reader.
+            self.dtype = "mixed"
+        self.rows += len(values)
+        present: pd.Series = values.dropna()
+        self.nulls += len(values) - len(present)
+        if not len(present):
+            return
+
+        hashes: NDArray[np.uint64] = pd.util.hash_pandas_object(
+            obj=present, index=False
+        ).to_numpy()
+        self.hyperloglog.update(hashes=hashes)
+        if self.hashes is not None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > self.distinct_limit:
+                self.hashes = None
+
+        counts: pd.Series = present.value_counts().head(self.top_capacity)
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+        self.top_values = counts if self.top_values is None else (
+            self.top_values.add(other=counts, fill_value=0).nlargest(
+                n=self.top_capacity
+            )
+        )
+
+        if self.numerical:
+            self.update_moments(
+                values=present.to_numpy(dtype=np.float64, na_value=np.nan)
+            )
+
+    def update_moments(self, values: NDArray[np.float64]):
+        """
+        Method merges moments, extremes and the reservoir sample
+        of a chunk of numerical values.
+        """
+        count: int = len(values)
+        mean: float = float(np.mean(values))
+        m2: float = float(np.sum((values - mean) ** 2))
+        total: int = self.count + count
+        delta: float = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+
+        # Algorithm R over the chunk: value t replaces a random slot
+        # with probability sample_size / (t + 1), later values win.
+        seen: NDArray[np.int64] = np.arange(self.count, total)
+        slots: NDArray[np.int64] = np.where(
+            seen < self.sample_size,
+            seen,
+            self.random_state.integers(low=0, high=seen + 1)
+        )
+        kept: NDArray[np.bool_] = slots < self.sample_size
+        self.sample[slots[kept]] = values[kept]
+        self.count = total
+
+    def get_distinct(self) -> tuple[int, bool]:
+        """
+        Method counts distinct values.
+        Returns the count and whether it is exact.
+        """
+        if self.hashes is not None:
+            return len(self.hashes), True
+
+        return int(round(self.hyperloglog.count())), False
+
+    def get_profile(
+        self, top_k: int, quantiles: tuple[float, ...]
+    ) -> dict[str, Any]:
+        """
+        Method summarizes the column.
+        Returns a JSON serializable dictionary.
+        """
+        distinct, exact = self.get_distinct()
+        profile: dict[str, Any] = {
+            "dtype": self.dtype,
+            "rows": self.rows,
+            "nulls": self.nulls,
+            "distinct": distinct,
+            "distinct_exact": exact,
+            "top_values": [
+                [to_json_value(value=value), int(count)]
+                for value, count in (
+                    self.top_values.nlargest(n=top_k).items()
+                    if self.top_values is not None else []
+                )
+            ]
+        }
+        if self.numerical and self.count:
+            sample: NDArray[np.float64] = self.sample[
+                :min(self.count, self.sample_size)
+            ]
+            profile.update({
+                "min": self.min,
+                "max": self.max,
+                "mean": self.mean,
+                "std": (
+                    float(np.sqrt(self.m2 / (self.count - 1)))
+                    if self.count > 1 else None
+                ),
+                "quantiles": {
+                    str(quantile): float(value) for quantile, value in zip(
+                        quantiles, np.quantile(a=sample, q=quantiles)
+                    )
+                },
+                "quantiles_exact": self.count <= self.sample_size
+            })
+
+        return profile
+
+
+### FUNCTIONS
+
+def to_json_value(value: Any) -> Any:
+    """
+    Function converts a column value for JSON: NumPy scalars to
+    Python scalars, values other than numbers and strings to strings.
+    Returns the converted value.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
+
+
+def iterate_chunks(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    chunk_size: int = PROFILE_CHUNK_SIZE
+) -> Iterable[pd.DataFrame]:
+    """
+    Function splits a dataframe into row chunks, chunked readers
+    (e.g. pd.read_csv with chunksize) are passed through.
+    Returns an iterator of dataframes.
+    """
+    if not isinstance(data, pd.DataFrame):
+        return iter(data)
+
+    return (
+        data.iloc[start:start + chunk_size]
+        for start in range(0, max(len(data), 1), chunk_size)
+    )
+
+
+def profile_table(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    top_k: int = 10,
+    quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    chunk_size: int = PROFILE_CHUNK_SIZE,
+    seed: int | None = 0,
+    **profile_options
+) -> dict[str, Any]:
+    """
+    Function profiles every column in one pass over row chunks
+    (see ColumnProfile, profile_options go to it): dtype, nulls,
+    distinct count, top_k values and for numerical columns
+    min, max, mean, std and quantiles.
+    Returns a JSON serializable dictionary with row count and
+    profiles by column.
+    """
+    random_state: np.random.Generator = np.random.default_rng(seed=seed)
+    profiles: dict[str, ColumnProfile] = {}
+    rows: int = 0
+    for chunk in iterate_chunks(data=data, chunk_size=chunk_size):
+        rows += len(chunk)
+        for column in chunk.columns:
+            if column not in profiles:
+                profiles[column] = ColumnProfile(
+                    random_state=random_state, **profile_options
+                )
+            profiles[column].update(values=chunk[column])
+
+    return {
+        "rows": rows,
+        "columns": {
+            str(column): profile.get_profile(top_k=top_k, quantiles=quantiles)
+            for column, profile in profiles.items()
+        }
+    }
+
+
+def write_profile(profile: dict[str, Any], path: str) -> str:
+    """
+    Function writes a profile as JSON.
+    Returns the file path.
+    """
+    with open(file=path, mode="w", encoding="utf-8") as file:
+        json.dump(obj=profile, fp=file, indent=4)
+
+    return path
+
+
+def get_profile_table(profile: dict[str, Any]) -> pd.DataFrame:
+    """
+    Function flattens column profiles for display, quantiles
+    become columns.
+    Returns a dataframe with a row per column.
+    """
+    rows: dict[str, dict[str, Any]] = {}
+    for column, column_profile in profile["columns"].items():
+        row: dict[str, Any] = {
+            name: value for name, value in column_profile.items()
+            if name not in ["quantiles", "top_values"]
+        }
+        row.update(column_profile.get("quantiles", {}))
+        row["top_value"] = (
+            column_profile["top_values"][0][0]
+            if column_profile["top_values"] else None
+        )
+        rows[column] = row
+
+    return pd.DataFrame.from_dict(data=rows, orient="index")
@@ -0,0 +1,248 @@
+import hashlib
+import inspect
+import os
+from types import CodeType, ModuleType
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+
+# Repository directory, only code under it is versioned with
+# the code it references.
+REPOSITORY_DIR: str = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+# Referenced globals hashed by content, other objects by type only.
+CONSTANT_TYPES: tuple[type, ...] = (
+    bool, int, float, complex, str, bytes, type(None), list, tuple, dict,
+    set, frozenset, np.ndarray, np.generic, pd.api.extensions.ExtensionDtype
+)
+
+
+### FUNCTIONS
+
+def get_file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Function hashes file content chunk by chunk.
+    Returns a SHA-256 hex digest.
+    """
+    file_hash = hashlib.sha256()
+    with open(file=path, mode="rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def get_module_path(module: ModuleType, directory: str) -> str | None:
+    """
+    Function finds the source file of a module under a directory,
+    installed packages are left out.
+    Returns the path relative to the directory or None.
+    """
+    path: str | None = getattr(module, "__file__", None)
+    if path is None or "site-packages" in path:
+        return None
+    path = os.path.abspath(path)
+    if not path.startswith(os.path.join(os.path.abspath(directory), "")):
+        return None
+
+    return os.path.relpath(path, directory)
+
+
+def is_repository_code(value: Any, directory: str) -> bool:
+    """
+    Function checks if a function or class is defined in a module
+    under a directory.
+    Returns True for repository code.
+    """
+    module: ModuleType | None = inspect.getmodule(value)
+
+    return module is not None and (
+        get_module_path(module=module, directory=directory) is not None
+    )
+
+
+def get_code_names(code: CodeType) -> list[str]:
+    """
+    Function lists global and attribute names used by code,
+    including code of nested functions.
+    Returns names in order of use.
+    """
+    names: list[str] = list(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            names.extend(get_code_names(code=constant))
+
+    return names
+
+
+def get_class_functions(cls: type) -> list[Callable]:
+    """
+    Function collects functions of a class: methods, static
+    and class methods and property accessors.
+    Returns a list of functions.
+    """
+    functions: list[Callable] = []
+    for member in vars(cls).values():
+        if isinstance(member, (staticmethod, classmethod)):
+            member = member.__func__
+        if isinstance(member, property):
+            functions.extend([
+                accessor for accessor in [member.fget, member.fset]
+                if accessor is not None
+            ])
+        elif inspect.isfunction(member):
+            functions.append(member)
+
+    return functions
+
+
+def update_reference_hash(
+    code_hash: Any, value: Any, directory: str, visited: set[int]
+):
+    """
+    Function feeds a value referenced by code to a hash: repository
+    functions and classes with the code they reference (see
+    update_code_hash), other functions and classes by name, constants
+    by content and other objects by type.
+    """
+    if inspect.isfunction(value) or inspect.isclass(value):
+        if is_repository_code(value=value, directory=directory):
+            update_code_hash(
+                code_hash=code_hash,
+                value=value,
+                directory=directory,
+                visited=visited
+            )
+        else:
+            code_hash.update(
+                f"{value.__module__}.{value.__qualname__}".encode()
+            )
+    elif isinstance(value, CONSTANT_TYPES):
+        update_content_hash(content_hash=code_hash, value=value)
+    elif not isinstance(value, ModuleType):
+        code_hash.update(type(value).__qualname__.encode())
+
+
+def update_code_hash(
+    code_hash: Any, value: Callable, directory: str, visited: set[int]
+):
+    """
+    Function feeds source of a function or class to a hash, then
+    the globals (helpers, classes, module constants, attributes of
+    repository modules), closure values and defaults its functions
+    use, each function or class once.
+    """
+    if id(value) in visited:
+        return
+    visited.add(id(value))
+    code_hash.update(value.__qualname__.encode())
+    try:
+        code_hash.update(inspect.getsource(value).encode())
+    except (OSError, TypeError):
+        pass
+
+    functions: list[Callable] = (
+        get_class_functions(cls=value) if inspect.isclass(value)
+        else [value] if inspect.isfunction(value)
+        else []
+    )
+    for function in functions:
+        names: list[str] = get_code_names(code=function.__code__)
+        references: list[Any] = list(function.__defaults__ or ())
+        references.extend((function.__kwdefaults__ or {}).values())
+        for cell in function.__closure__ or ():
+            try:
+                references.append(cell.cell_contents)
+            except ValueError:
+                pass
+        for name in names:
+            if name not in function.__globals__:
+                continue
+            reference: Any = function.__globals__[name]
+            references.append(reference)
+            # Attributes of a repository module (module.helper).
+            if isinstance(reference, ModuleType) and get_module_path(
+                module=reference, directory=directory
+            ) is not None:
+                references.extend([
+                    getattr(reference, attribute) for attribute in names
+                    if hasattr(reference, attribute)
+                ])
+        for reference in references:
+            update_reference_hash(
+                code_hash=code_hash,
+                value=reference,
+                directory=directory,
+                visited=visited
+            )
+
+
+def get_code_version(func: Callable, directory: str = REPOSITORY_DIR) -> str:
+    """
+    Function hashes source code of a function and, recursively,
+    of the repository functions and classes and the module constants
+    it references (see update_code_hash). Editing it, a helper or
+    a constant it uses invalidates results cached under the hash,
+    edits of other code do not.
+    Returns a SHA-256 hex digest.
+    """
+    code_hash = hashlib.sha256()
+    update_code_hash(
+        code_hash=code_hash, value=func, directory=directory, visited=set()
+    )
+
+    return code_hash.hexdigest()
+
+
+def update_content_hash(content_hash: Any, value: Any):
+    """
+    Function feeds a value to a hash by content: dataframes and series
+    by row hashes, index, columns and dtypes, arrays by shape, dtype
+    and bytes, containers item by item (dictionaries and sets in key
+    order), other values by repr.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        content_hash.update(type(value).__name__.encode())
+        content_hash.update(
+            pd.util.hash_pandas_object(
+                obj=value, index=True
+            ).to_numpy().tobytes()
+        )
+        if isinstance(value, pd.DataFrame):
+            content_hash.update(repr(list(value.columns)).encode())
+            content_hash.update(repr(list(value.dtypes.astype(str))).encode())
+        else:
+            content_hash.update(repr((value.name, str(value.dtype))).encode())
+    elif isinstance(value, np.ndarray):
+        content_hash.update(f"{value.shape} {value.dtype}".encode())
+        content_hash.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        content_hash.update(b"dict")
+        for key in sorted(value, key=repr):
+            update_content_hash(content_hash=content_hash, value=key)
+            update_content_hash(content_hash=content_hash, value=value[key])
+    elif isinstance(value, (list, tuple)):
+        content_hash.update(f"{type(value).__name__} {len(value)}".encode())
+        for item in value:
+            update_content_hash(content_hash=content_hash, value=item)
+    elif isinstance(value, (set, frozenset)):
+        content_hash.update(f"{type(value).__name__} {len(value)}".encode())
+        for item in sorted(value, key=repr):
+            update_content_hash(content_hash=content_hash, value=item)
+    else:
+        content_hash.update(repr(value).encode())
+
+
+def get_content_digest(*values: Any) -> str:
+    """
+    Function hashes values by content (see update_content_hash).
+    Returns a SHA-256 hex digest.
+    """
+    content_hash = hashlib.sha256()
+    for value in values:
+        update_content_hash(content_hash=content_hash, value=value)
+
+    return content_hash.hexdigest()
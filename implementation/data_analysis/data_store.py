@@ -0,0 +1,168 @@
+import os
+from typing import Iterator
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+SIZE_LEVELS: list[str] = [
+    "Very Small", "Small", "Medium", "Large", "Very Large", "Enterprise"
+]
+FUNDING_LEVELS: list[str] = [
+    "Self-funded", "Seed", "Series A", "Series B", "Series C+"
+]
+# Explicit column types of the startups tables, ordinal columns
+# are ordered categoricals.
+STARTUP_SCHEMA: dict[str, str | pd.CategoricalDtype] = {
+    "name": "string",
+    "industry": "category",
+    "country": "category",
+    "startup_age": "int64",
+    "startup_size": pd.CategoricalDtype(categories=SIZE_LEVELS, ordered=True),
+    "year_founded": "int64",
+    "employees_number": "category",
+    "current_funding_level": pd.CategoricalDtype(
+        categories=FUNDING_LEVELS, ordered=True
+    ),
+    "amount_raised(usd)": "float64",
+    "amount_raised_log": "float64",
+    "current_funding_level(num)": "int64",
+    "startup_size(num)": "int64",
+    "growing_rate": "float64",
+    "sustainability_rate": "int64"
+}
+
+
+### FUNCTIONS
+
+def apply_schema(
+    data: pd.DataFrame,
+    schema: dict[str, str | pd.CategoricalDtype] = STARTUP_SCHEMA
+) -> pd.DataFrame:
+    """
+    Function converts columns of the schema present in data,
+    a column at a time. Other columns are kept as they are.
+    Returns a new dataframe.
+    """
+    return data.astype(
+        dtype={
+            column: dtype for column, dtype in schema.items()
+            if column in data.columns
+        }
+    )
+
+
+def get_table_path(stem: str) -> str:
+    """
+    Function chooses the storage format of a table.
+    Returns stem.parquet.
+    """
+    return f"{stem}.parquet"
+
+
+def find_table(stem: str) -> str:
+    """
+    Function finds a stored table, preferring Parquet to CSV
+    (tables stored before Parquet).
+    Returns the table path.
+    """
+    if os.path.exists(f"{stem}.parquet"):
+        return f"{stem}.parquet"
+    if os.path.exists(f"{stem}.csv"):
+        return f"{stem}.csv"
+    raise FileNotFoundError(f"No stored table {stem}.parquet or {stem}.csv.")
+
+
+def write_table(data: pd.DataFrame, path: str) -> str:
+    """
+    Function writes a table (.parquet or .csv) without its index,
+    so re-reading and writing it adds no index columns.
+    Returns the table path.
+    """
+    if path.endswith(".parquet"):
+        data.to_parquet(path=path, engine="pyarrow", index=False)
+    else:
+        data.to_csv(path_or_buf=path, index=False)
+
+    return path
+
+
+def is_stored_column(column: str) -> bool:
+    """
+    Function checks if a CSV column is a stored one, not an unnamed
+    index column of old CSV files.
+    Returns True for stored columns.
+    """
+    return not column.startswith("Unnamed:")
+
+
+def read_table(
+    path: str,
+    columns: list[str] | None = None,
+    schema: dict[str, str | pd.CategoricalDtype] = STARTUP_SCHEMA
+) -> pd.DataFrame:
+    """
+    Function reads only the given columns of a stored table.
+    Parquet stores types, CSV columns are typed by the schema
+    while parsing and floats are parsed to the written values.
+    Unnamed index columns of old CSV files are skipped.
+    Returns a dataframe with typed columns.
+    """
+    if path.endswith(".parquet"):
+        return apply_schema(
+            data=pd.read_parquet(path=path, engine="pyarrow", columns=columns),
+            schema=schema
+        )
+
+    data: pd.DataFrame = pd.read_csv(
+        filepath_or_buffer=path,
+        usecols=is_stored_column if columns is None else columns,
+        # Floats are read back exactly as written.
+        float_precision="round_trip",
+        dtype={
+            column: dtype for column, dtype in schema.items()
+            if columns is None or column in columns
+        }
+    )
+
+    return data if columns is None else data[columns]
+
+
+def iterate_table(
+    path: str,
+    columns: list[str] | None = None,
+    chunk_size: int = 1 << 16,
+    schema: dict[str, str | pd.CategoricalDtype] = STARTUP_SCHEMA
+) -> Iterator[pd.DataFrame]:
+    """
+    Function reads a stored table (.parquet by record batches, .csv or
+    JSON lines .jsonl) chunk_size rows at a time, only the given
+    columns, so tables larger than memory can be streamed.
+    Returns an iterator of dataframes typed like read_table.
+    """
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(source=path)
+        for batch in parquet_file.iter_batches(
+            batch_size=chunk_size, columns=columns
+        ):
+            yield apply_schema(data=batch.to_pandas(), schema=schema)
+    elif path.endswith(".jsonl"):
+        for chunk in pd.read_json(
+            path_or_buf=path, lines=True, chunksize=chunk_size, dtype=False
+        ):
+            yield apply_schema(
+                data=chunk if columns is None else chunk[columns],
+                schema=schema
+            )
+    else:
+        for chunk in pd.read_csv(
+            filepath_or_buffer=path,
+            usecols=is_stored_column if columns is None else columns,
+            float_precision="round_trip",
+            chunksize=chunk_size,
+            dtype={
+                column: dtype for column, dtype in schema.items()
+                if columns is None or column in columns
+            }
+        ):
+            yield chunk if columns is None else chunk[columns]
@@ -0,0 +1,157 @@
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+# Centroid update rules: (weighted) means, coordinate-wise medians
+# and means scaled to unit length.
+CENTROID_UPDATES: tuple[str, ...] = ("mean", "median", "normalized_mean")
+
+
+### CLASS
+
+class DistanceMetric:
+    """
+    Distance metric of KMeans: a batched kernel from a block of points
+    to all centroids and the centroid update rule minimizing the summed
+    kernel distances of cluster points.
+    A kernel takes a (rows, columns) block and (centroids, columns)
+    float64 centroids and returns a (rows, centroids) array.
+    Squared metrics return squared distances, their square roots are
+    used as K-Means++ seeding distances.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kernel: Callable[[NDArray, NDArray[np.float64]], NDArray[np.float64]],
+        update: str = "mean",
+        squared: bool = False
+    ):
+        if update not in CENTROID_UPDATES:
+            raise ValueError(
+                f"Unknown update {update}, expected one of {CENTROID_UPDATES}."
+            )
+        self.name: str = name
+        self.kernel: Callable[
+            [NDArray, NDArray[np.float64]], NDArray[np.float64]
+        ] = kernel
+        self.update: str = update
+        self.squared: bool = squared
+
+
+### FUNCTIONS
+
+def squared_euclidean_kernel(
+    block: NDArray, centroids: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Function calculates squared Euclidean distances with
+    ||x||^2 - 2x*c + ||c||^2 expansion.
+    Returns an array of shape (block rows, centroids).
+    """
+    distances: NDArray[np.float64] = (
+        block @ centroids.T
+    ).astype(np.float64, copy=False)
+    distances *= -2.0
+    distances += np.einsum("ij,ij->i", centroids, centroids)[np.newaxis, :]
+    distances += np.einsum(
+        "ij,ij->i", block, block, dtype=np.float64
+    )[:, np.newaxis]
+
+    return np.maximum(distances, 0.0, out=distances)
+
+
+def manhattan_kernel(
+    block: NDArray, centroids: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Function calculates Manhattan distances column by column,
+    so memory stays (block rows, centroids) for any number of columns.
+    Returns an array of shape (block rows, centroids).
+    """
+    distances: NDArray[np.float64] = np.zeros(
+        shape=(len(block), len(centroids)), dtype=np.float64
+    )
+    for column in range(block.shape[1]):
+        distances += np.abs(
+            block[:, column, np.newaxis] - centroids[np.newaxis, :, column]
+        )
+
+    return distances
+
+
+def cosine_kernel(
+    block: NDArray, centroids: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """
+    Function calculates cosine distances 1 - x*c / (||x|| ||c||)
+    with one matrix product, zero vectors are at distance 1.
+    Returns an array of shape (block rows, centroids).
+    """
+    block_norms: NDArray[np.float64] = np.sqrt(
+        np.einsum("ij,ij->i", block, block, dtype=np.float64)
+    )
+    centroid_norms: NDArray[np.float64] = np.sqrt(
+        np.einsum("ij,ij->i", centroids, centroids)
+    )
+    similarities: NDArray[np.float64] = (
+        block @ centroids.T
+    ).astype(np.float64, copy=False)
+    similarities /= np.where(block_norms > 0, block_norms, 1.0)[:, np.newaxis]
+    similarities /= np.where(centroid_norms > 0, centroid_norms, 1.0)
+
+    return np.maximum(1.0 - similarities, 0.0, out=similarities)
+
+
+# Registered metrics by name.
+METRICS: dict[str, DistanceMetric] = {
+    "euclidean": DistanceMetric(
+        name="euclidean",
+        kernel=squared_euclidean_kernel,
+        update="mean",
+        squared=True
+    ),
+    "manhattan": DistanceMetric(
+        name="manhattan", kernel=manhattan_kernel, update="median"
+    ),
+    "cosine": DistanceMetric(
+        name="cosine", kernel=cosine_kernel, update="normalized_mean"
+    )
+}
+
+
+def register_metric(
+    name: str,
+    kernel: Callable[[NDArray, NDArray[np.float64]], NDArray[np.float64]],
+    update: str = "mean",
+    squared: bool = False
+) -> DistanceMetric:
+    """
+    Function adds a metric to the registry, so KMeans can use it
+    by name (also when a saved model is loaded).
+    Returns the registered metric.
+    """
+    if name in METRICS:
+        raise ValueError(f"Metric {name} is already registered.")
+    METRICS[name] = DistanceMetric(
+        name=name, kernel=kernel, update=update, squared=squared
+    )
+
+    return METRICS[name]
+
+
+def get_metric(metric: str | DistanceMetric) -> DistanceMetric:
+    """
+    Function resolves a registered metric name.
+    Returns the metric.
+    """
+    if isinstance(metric, DistanceMetric):
+        return metric
+    if metric not in METRICS:
+        raise ValueError(
+            f"Unknown metric {metric}, expected one of {list(METRICS)}."
+        )
+
+    return METRICS[metric]
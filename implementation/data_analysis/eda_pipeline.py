@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable
+from implementation.data_analysis.content_hashing import (
+    get_code_version,
+    get_file_digest
+)
+
+
+# Cached stage outputs of the EDA pipeline.
+DEFAULT_STAGE_CACHE_DIR: str = os.path.join("assets", "cache", "eda")
+
+
+### CLASS
+
+class StageCache:
+    """
+    Content-addressed store of stage outputs: an output is pickled
+    under a key hashing the stage name, its code version,
+    keys of upstream stages and the stage parameters. Digests of
+    files a stage writes are kept next to its output.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STAGE_CACHE_DIR):
+        self.directory: str = directory
+
+    def get_key(
+        self,
+        name: str,
+        func: Callable,
+        input_keys: list[str],
+        params: dict[str, Any]
+    ) -> str:
+        """
+        Method hashes stage name, code version, upstream keys
+        and parameters.
+        Returns a SHA-256 hex digest used as a file name.
+        """
+        key: dict = {
+            "stage": name,
+            "code": get_code_version(func=func),
+            "inputs": input_keys,
+            "params": params
+        }
+        return hashlib.sha256(
+            json.dumps(obj=key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get_digests_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.outputs.json")
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self.get_path(key=key))
+
+    def load_digests(self, key: str) -> dict[str, str] | None:
+        """
+        Method loads digests of files written by a stored stage.
+        Returns digests by path, None if they are not stored.
+        """
+        path: str = self.get_digests_path(key=key)
+        if not os.path.exists(path):
+            return None
+        with open(file=path, mode="r", encoding="utf-8") as file:
+            return json.load(fp=file)
+
+    def load(self, key: str) -> Any:
+        """
+        Method loads a stored stage output.
+        Returns the output.
+        """
+        with open(file=self.get_path(key=key), mode="rb") as file:
+            return pickle.load(file)
+
+    def store(self, key: str, output: Any):
+        """
+        Method stores a stage output. The file is written under
+        a temporary name first, so an interrupted run leaves no
+        truncated entry.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path: str = self.get_path(key=key)
+        with open(file=f"{path}.tmp", mode="wb") as file:
+            pickle.dump(output, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+
+    def store_digests(self, key: str, digests: dict[str, str]):
+        """
+        Method stores digests of files written by a stage,
+        like store under a temporary name first.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path: str = self.get_digests_path(key=key)
+        with open(file=f"{path}.tmp", mode="w", encoding="utf-8") as file:
+            json.dump(obj=digests, fp=file, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+
+class Pipeline:
+    """
+    Chain of named stages. A stage runs only if its key (see
+    StageCache.get_key) is not cached or a file it writes is missing
+    or differs from the one it wrote (by digest), upstream outputs
+    are loaded from the cache only when a stage has to run.
+    Without a cache every stage runs.
+    """
+
+    def __init__(self, cache: StageCache | None = None):
+        self.cache: StageCache | None = cache
+        self.keys: dict[str, str] = {}
+        self.outputs: dict[str, Any] = {}
+        # Files written by stages.
+        self.output_paths: dict[str, list[str]] = {}
+        # Names of stages executed (not loaded from the cache).
+        self.executed: list[str] = []
+
+    def register(
+        self,
+        name: str,
+        func: Callable,
+        inputs: list[str] | None = None,
+        files: list[str] | None = None,
+        outputs: list[str] | None = None,
+        **params
+    ) -> bool:
+        """
+        Method registers a stage: computes its key from upstream keys,
+        content of files read by the stage and its parameters.
+        Returns True if the stage has to run - its key is not cached
+        or a file it writes (outputs) is missing or changed since
+        the cached run, e.g. by a run with other inputs.
+        """
+        input_keys: list[str] = [self.keys[stage] for stage in inputs or []]
+        input_keys.extend([get_file_digest(path=path) for path in files or []])
+        if self.cache is None:
+            key: str = name
+        else:
+            key = self.cache.get_key(
+                name=name, func=func, input_keys=input_keys, params=params
+            )
+        self.keys[name] = key
+        self.outputs.pop(name, None)
+        self.output_paths[name] = outputs or []
+
+        return not (
+            self.cache is not None
+            and self.cache.contains(key=key)
+            and self.cache.load_digests(key=key) == self.get_digests(name=name)
+        )
+
+    def get_digests(self, name: str) -> dict[str, str] | None:
+        """
+        Method hashes files written by a registered stage.
+        Returns digests by path, None if a file is missing.
+        """
+        paths: list[str] = self.output_paths[name]
+        if not all([os.path.exists(path) for path in paths]):
+            return None
+
+        return {path: get_file_digest(path=path) for path in paths}
+
+    def complete(self, name: str, output: Any):
+        """
+        Method records and stores the output of an executed stage
+        with digests of files it wrote.
+        """
+        self.executed.append(name)
+        self.outputs[name] = output
+        if self.cache is not None:
+            self.cache.store(key=self.keys[name], output=output)
+            self.cache.store_digests(
+                key=self.keys[name], digests=self.get_digests(name=name) or {}
+            )
+
+    def stage(
+        self,
+        name: str,
+        func: Callable,
+        inputs: list[str] | None = None,
+        files: list[str] | None = None,
+        outputs: list[str] | None = None,
+        **params
+    ) -> str:
+        """
+        Method registers and runs (if invalidated) the stage
+        func(*upstream outputs, **params). Content of files read by
+        the stage is part of its key, outputs are files it writes.
+        Returns the stage key.
+        """
+        if self.register(
+            name, func, inputs=inputs, files=files, outputs=outputs, **params
+        ):
+            self.complete(
+                name=name,
+                output=func(
+                    *[self.get(stage) for stage in inputs or []], **params
+                )
+            )
+
+        return self.keys[name]
+
+    def get(self, name: str) -> Any:
+        """
+        Method gets an output of a registered stage,
+        loading it from the cache on first use.
+        Returns the stage output.
+        """
+        if name not in self.outputs:
+            self.outputs[name] = self.cache.load(key=self.keys[name])
+
+        return self.outputs[name]
@@ -1,160 +1,349 @@
 import warnings
-warnings.filterwarnings('ignore')
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter, MultipleLocator, MaxNLocator
-import seaborn as sns
-import json
 import datetime
+import os
 from typing import Callable
+from numpy.typing import NDArray
+from implementation.data_analysis.column_profiler import (
+    get_profile_table,
+    profile_table,
+    write_profile
+)
+from implementation.data_analysis.data_store import (
+    SIZE_LEVELS,
+    apply_schema,
+    get_table_path,
+    write_table
+)
+from implementation.data_analysis.eda_pipeline import Pipeline, StageCache
+from implementation.data_analysis.figure_rendering import (
+    FigureCache,
+    FigureSpec,
+    render_figures
+)
+from implementation.data_analysis.grouped_aggregation import get_group_table
+from implementation.data_analysis.large_data_plotting import (
+    get_box_statistics,
+    get_density,
+    get_histogram,
+    is_large_data
+)
+from implementation.data_analysis.incremental_aggregates import (
+    AggregateState,
+    read_aggregate_state,
+    sync_aggregate_state
+)
 
 
-### EDA
-
-image_save_dir: str = "assets\\visualizations\\"
-
-with open(file=(
-    "C:\\Users\\artjo\\.vscode\\Space StartUps\\assets\\data\\startups_data.json"
-    ),
-    mode="r",
-    encoding="utf-8"
-) as file:
-    data: dict[str, str] = json.load(fp=file)
-
-data: pd.DataFrame = pd.DataFrame(data=data)
-
-# While data scrapping not founded values were recorded as "Unknown" or "".
-data = data.replace(to_replace=["Unknown", ""], value=None)
-
-print(data.info())  # =>
-"""
-- Data has 130 rows and 7 columns.
-- Only Industry column has one null-value.
-"""
-
+# Paths are relative to the repository root.
+DATA_PATH: str = os.path.join("assets", "data", "startups_data.json")
+# Stored as .parquet, read from .csv if it was stored before.
+MAIN_DATA_STEM: str = os.path.join("assets", "data", "main_data")
+PROFILE_PATH: str = os.path.join("assets", "data", "main_data_profile.json")
+# Mergeable aggregates of the main data and the log of startups
+# appended to and retracted from it (see write_changes).
+SUMMARY_PATH: str = os.path.join("assets", "data", "main_data_aggregates.json")
+CHANGES_PATH: str = os.path.join("assets", "data", "main_data_changes.jsonl")
+IMAGE_SAVE_DIR: str = os.path.join("assets", "visualizations")
 
-print(data[data["Industry"].isnull()]) # =>
-"""
-NewRocket startup has no industry on page.
-According to the startup's description, the Launch industry fits here.
-"""
-newrocket_ind: int = data[data.Name == "NewRocket"].index.item()
-data.at[newrocket_ind, "Industry"] = "Launch"
-
-print(data.nunique()) # =>
+NUM_FUNDING_LVL_MAPPING: dict[str, int] = {
+    "Self-funded": 0,
+    "Seed": 1,
+    "Series A": 2,
+    "Series B": 3,
+    "Series C+": 4
+}
+NUM_SIZE_MAPPING: dict[str, int] = {
+    "Very Small": 1,
+    "Small": 2,
+    "Medium": 3,
+    "Large": 4,
+    "Very Large": 5,
+    "Enterprise": 6
+}
 
+CATEGORICAL_COLUMNS: list[str] = [
+    "industry",
+    "country",
+    "startup_size",
+    "employees_number",
+    "current_funding_level"
+]
+NUMERICAL_COLUMNS: list[str] = [
+    "startup_age", "year_founded", "amount_raised(usd)"
+]
+CORRELATION_COLUMNS: list[str] = [
+    "current_funding_level(num)",
+    "startup_size(num)",
+    "startup_age",
+    "year_founded",
+    "amount_raised_log"
+]
+# Grouping keys (rows) and measures (columns) of the bivariate grid.
+BIVARIATE_KEYS: dict[str, str] = {
+    "industry": "Industry",
+    "country": "Country",
+    "startup_size": "Size",
+    "current_funding_level": "Funding_lvl"
+}
+BIVARIATE_MEASURES: dict[str, str] = {
+    "startup_age": "Age",
+    "amount_raised_log": "Amount raised(log)",
+    "amount_raised(usd)": "Amount raised(USD)"
+}
+# Panels of the industry and country analysis: title, measure, statistic.
+GROUP_ANALYSIS_PANELS: list[tuple[str, str, str]] = [
+    ("count", "current_funding_level(num)", "size"),
+    ("average funding_level", "current_funding_level(num)", "mean"),
+    ("growing_rate", "growing_rate", "mean"),
+    ("sustainability_rate", "sustainability_rate", "mean")
+]
+GROUP_ANALYSIS_KEYS: list[str] = ["industry", "country"]
+# Keys and measures of the incremental aggregates.
+SUMMARY_KEYS: list[str] = list(
+    dict.fromkeys(list(BIVARIATE_KEYS) + GROUP_ANALYSIS_KEYS)
+)
+SUMMARY_MEASURES: list[str] = list(
+    dict.fromkeys(
+        list(BIVARIATE_MEASURES)
+        + [panel[1] for panel in GROUP_ANALYSIS_PANELS]
+    )
+)
+RESEARCH_COUNTRIES: list[str] = [
+    "United States", "China", "Finland", "United Kingdom", "Japan"
+]
 
-"""
-Name and Idea columns have all the 130 values unique.
-Data contains:
-1. 11 industries - categorical data
-2. 21 locations (countries) - categorical data
-3. 20 unique year values - categorical data
-4. 6 employees number categories - categorical data
-5. 5 funding levels - categorical data
-6. 70 unique amount raised values - numerical data
-....
-"""
 
-print(data.columns) # =>
+### STAGES
 
+def load_data(path: str) -> pd.DataFrame:
+    """
+    Function loads the scrapped startups column-wise, values are kept
+    as scrapped strings.
+    Returns a dataframe of raw values.
+    """
+    return pd.read_json(
+        path_or_buf=path, dtype=False, convert_dates=False, encoding="utf-8"
+    )
 
-"""
-All columns are renamed for dataframe readability.
-Also, columns Location, Founded, Idea are concretized.
-"""
-remove_non_ch: Callable = lambda ch: ch if ch.isascii() or ch == " " else ""
-increase_readability: Callable = lambda col_name: (
-    "_".join(
-        (
-            "".join(
-                map(remove_non_ch, col_name)
-            )
-        ).split()
-    ).lower()
-)
 
-readable_column_names: list[str] = (
-    list(map(increase_readability, data.columns))
-)
-change_names_dict: dict[str, str] = (
-    dict(zip(data.columns, readable_column_names))
-)
-change_names_dict["Number of employees"] = "employees_number"
-change_names_dict["Location"] = "country"
-change_names_dict["Founded"] = "year_founded"
-change_names_dict["Idea"] = "description"
+def clean_data(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Function fills missing values, renames columns for readability,
+    drops descriptions and converts numerical columns.
+    Returns the main dataframe.
+    """
+    # While data scrapping not founded values were recorded as "Unknown" or "".
+    data = data.replace(to_replace=["Unknown", ""], value=None)
+    """
+    - Data has 130 rows and 7 columns.
+    - Only Industry column has one null-value.
+    NewRocket startup has no industry on page.
+    According to the startup's description, the Launch industry fits here.
+    """
+    newrocket_ind: int = data[data.Name == "NewRocket"].index.item()
+    data.at[newrocket_ind, "Industry"] = "Launch"
+
+    """
+    All columns are renamed for dataframe readability.
+    Also, columns Location, Founded, Idea are concretized.
+    """
+    remove_non_ch: Callable = lambda ch: (
+        ch if ch.isascii() or ch == " " else ""
+    )
+    increase_readability: Callable = lambda col_name: (
+        "_".join(
+            (
+                "".join(
+                    map(remove_non_ch, col_name)
+                )
+            ).split()
+        ).lower()
+    )
 
-data = data.rename(columns=change_names_dict)
+    readable_column_names: list[str] = (
+        list(map(increase_readability, data.columns))
+    )
+    change_names_dict: dict[str, str] = (
+        dict(zip(data.columns, readable_column_names))
+    )
+    change_names_dict["Number of employees"] = "employees_number"
+    change_names_dict["Location"] = "country"
+    change_names_dict["Founded"] = "year_founded"
+    change_names_dict["Idea"] = "description"
+
+    data = data.rename(columns=change_names_dict)
+
+    """
+    Column Idea is excluded from the main dataframe.
+    It is not relevant for EDA.
+    """
+    main_data: pd.DataFrame = data.drop(columns="description")
+
+    # Changing columns' types, a column at a time.
+    main_data["year_founded"] = pd.to_numeric(arg=main_data["year_founded"])
+    main_data["amount_raised(usd)"] = pd.to_numeric(
+        arg=main_data["amount_raised(usd)"]
+    )
 
-"""
-Column Idea is excluded from the main dataframe. It is not relevant for EDA.
-"""
-idea_data: pd.DataFrame = data[["name", "description"]]
-main_data: pd.DataFrame = data.drop(columns="description", axis=1)
+    return main_data
+
+
+def derive_features(main_data: pd.DataFrame, year: int) -> pd.DataFrame:
+    """
+    Function adds startup age and size, log of the raised amount,
+    numerical size and funding level, growing and sustainability rates.
+    Returns a new dataframe typed by the startups schema.
+    """
+    main_data = main_data.copy()
+    # Creating new column startup_age.
+    main_data.insert(
+        loc=3,
+        column="startup_age",
+        value=year - main_data["year_founded"]
+    )
+    # Creating new column startup_size.
+    mapping: dict[str, str] = dict(
+        zip(
+            main_data["employees_number"].unique(), SIZE_LEVELS
+        )
+    )
+    main_data.insert(
+        loc=4,
+        column="startup_size",
+        value=main_data["employees_number"].map(mapping)
+    )
 
-print(main_data.head())
+    # Normalizing amount data distribution.
+    # Using log1p since the data has zero values.
+    main_data["amount_raised_log"] = np.log1p(main_data["amount_raised(usd)"])
 
-# Changing columns' types.
-main_data["year_founded"] = (
-    main_data["year_founded"].apply(func=pd.to_numeric)
-)
-main_data["amount_raised(usd)"] = (
-    main_data["amount_raised(usd)"].apply(func=pd.to_numeric)
-)
+    main_data.insert(
+        loc=0,
+        column="startup_size(num)",
+        value=main_data["startup_size"].str.strip().map(NUM_SIZE_MAPPING)
+    )
+    main_data.insert(
+        loc=0,
+        column="current_funding_level(num)",
+        value=main_data["current_funding_level"].str.strip().map(
+            NUM_FUNDING_LVL_MAPPING
+        )
+    )
 
-# Creating new column startup_age.
-main_data.insert(
-    loc=3,
-    column="startup_age",
-    value=datetime.date.today().year - main_data["year_founded"]
-)
-# Creating new column startup_size.
-size_names: list[str] = [
-    "Very Small", "Small", "Medium", "Large", "Very Large", "Enterprise"
-]
-mapping: dict[str, str] = dict(
-    zip(
-        main_data["employees_number"].unique(), size_names
+    main_data["growing_rate"] = (
+        main_data["startup_size(num)"] / main_data["startup_age"]
+    )
+    main_data["sustainability_rate"] = (
+        main_data["startup_age"] * main_data["startup_size(num)"]
     )
-)
-main_data.insert(
-    loc=4,
-    column="startup_size",
-    value=main_data["employees_number"].map(mapping)
-)
-print(main_data.head())
 
-# Checking for anomalies in values.
-for column in main_data.columns:
-    print(main_data[column].unique()) if column not in [
-        "name", "amount_raised(usd)"
-    ] else None
+    return apply_schema(data=main_data)
+
+
+def profile_data(main_data: pd.DataFrame, path: str) -> dict[str, object]:
+    """
+    Function profiles every column in one pass (see profile_table)
+    and writes the profile, replacing separate info, nunique,
+    unique and describe scans.
+    Returns the profile.
+    """
+    profile: dict[str, object] = profile_table(data=main_data)
+    write_profile(profile=profile, path=path)
+
+    return profile
+
+
+def summarize_data(
+    main_data: pd.DataFrame,
+    path: str,
+    version: str,
+    changes_path: str = CHANGES_PATH
+) -> AggregateState:
+    """
+    Function updates mergeable aggregates (see AggregateState) stored
+    at path to the version of the main data: only startups logged
+    to changes_path since the last update are retracted and appended.
+    Without a stored state or if the main data changed without
+    logged changes they are calculated from scratch (see
+    sync_aggregate_state). The state is written back.
+    Returns the state.
+    """
+    state: AggregateState | None = (
+        read_aggregate_state(path=path) if os.path.exists(path) else None
+    )
+    state = sync_aggregate_state(
+        state=state,
+        current=main_data,
+        version=version,
+        keys=SUMMARY_KEYS,
+        measures=SUMMARY_MEASURES,
+        correlation_columns=CORRELATION_COLUMNS,
+        changes_path=changes_path
+    )
+    state.save(path=path)
+
+    return state
+
+
+def aggregate_data(
+    main_data: pd.DataFrame, summary: AggregateState
+) -> dict[str, object]:
+    """
+    Function collects tables the figures and the report are drawn from:
+    correlations, statistics of the bivariate grid and industry and
+    country statistics (tidy tables read from the incremental
+    aggregates), top industries of research countries and outliers.
+    Returns a dictionary of tables by name.
+    """
+    table: pd.DataFrame = summary.get_table()
+    aggregates: dict[str, object] = {
+        "correlation": summary.get_correlation(),
+        "bivariate": table[
+            table["key"].isin(list(BIVARIATE_KEYS))
+            & table["measure"].isin(list(BIVARIATE_MEASURES))
+        ].reset_index(drop=True),
+        "groups": table[
+            table["key"].isin(GROUP_ANALYSIS_KEYS)
+            & table["measure"].isin(
+                [panel[1] for panel in GROUP_ANALYSIS_PANELS]
+            )
+        ].reset_index(drop=True)
+    }
 
-pd.set_option("display.float_format", "{:.0f}".format)
-print(main_data.describe().T)
-"""
-- Space startups' foundation years - 1989-2021.
-- The oldest space startup is 35 years old, the youngest - 3
-- The amounts are between 0 and 3 000 000 000, averagely 71,5 millions.
-    Raised amounts' standart deviation is 370 636 877, which is very big.
-"""
+    aggregates["research_countries"] = {
+        country: main_data[main_data["country"] == country].groupby(
+            "industry"
+        )["industry"].count().sort_values(ascending=False).head(3)
+        for country in RESEARCH_COUNTRIES
+    }
+    aggregates["outliers"] = {
+        "amount_raised(usd)": (
+            main_data[main_data["amount_raised(usd)"] > 500000000]
+        ),
+        "startup_age": main_data[main_data["startup_age"] > 20]
+    }
 
-categorical_columns: list[str] = list(
-    main_data.select_dtypes(include="object").drop(columns=["name"]).columns
-)
-numerical_columns: list[str] = list(
-    main_data.select_dtypes(include=np.number).columns
-)
+    return aggregates
 
 
 ## Univariate analysis
 
-amount_formatter: FuncFormatter = FuncFormatter(
-    lambda amount, _: (f"{amount:,.0f}").replace(",", " ")
-)
-for column in numerical_columns:
+def plot_numerical_skew(
+    main_data: pd.DataFrame, column: str, path: str
+) -> str:
+    """
+    Function plots a histogram and a boxplot of a numerical column.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter, MultipleLocator, MaxNLocator
+    import seaborn as sns
+
+    amount_formatter: FuncFormatter = FuncFormatter(
+        lambda amount, _: (f"{amount:,.0f}").replace(",", " ")
+    )
     fig, axs = plt.subplots(
         nrows=1, ncols=2, figsize=(15, 5), layout="constrained"
     )
@@ -171,36 +360,43 @@ for column in numerical_columns:
         else:
             ax.xaxis.set_minor_locator(MultipleLocator(1))
         ax.yaxis.set_major_locator(MaxNLocator(integer=True))
-    plt.savefig(f"{image_save_dir}{column}_skew.png")
+    plt.savefig(path)
     plt.close(fig=fig)
-"""
-- Space startups were started to be actively developed in around 2005.
-    Whereas the boom was in around 2013-2020.
-- Very few space startups are more than 15 years old.
-    As a rule - 5-12 years old.
-- There a few outliers, which are 20-35 years old.
-- Overwhelming majority of space startups have zero raised amount,
-    much less amount are close to zero - 0-200 000 000.
-    There are a few outliers (3) with about
-    1 000 000 000 - 3 000 000 000 amount raised.
-"""
+    """
+    - Space startups were started to be actively developed in around 2005.
+        Whereas the boom was in around 2013-2020.
+    - Very few space startups are more than 15 years old.
+        As a rule - 5-12 years old.
+    - There a few outliers, which are 20-35 years old.
+    - Overwhelming majority of space startups have zero raised amount,
+        much less amount are close to zero - 0-200 000 000.
+        There are a few outliers (3) with about
+        1 000 000 000 - 3 000 000 000 amount raised.
+    """
+
+    return path
+
+
+def plot_categorical_univariate(main_data: pd.DataFrame, path: str) -> str:
+    """
+    Function plots counts of every categorical column.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import MultipleLocator
+    import seaborn as sns
 
-fig, axs = plt.subplots(
-    nrows=3,
-    ncols=2,
-    figsize=(18, 15),
-    layout="constrained"
-)
-print(categorical_columns)
-cat_column_ind: int = 0
-for row in range(3):
-    for column in range(2):
-        column_name: str = categorical_columns[cat_column_ind]
-        sns.countplot(
-            ax=axs[row, column], x=main_data[column_name], palette="Paired"
-        )
-        axs[row, column].yaxis.set_minor_locator(MultipleLocator(1))
-        axs[row, column].grid(
+    fig, axs = plt.subplots(
+        nrows=3,
+        ncols=2,
+        figsize=(18, 15),
+        layout="constrained"
+    )
+    for cat_column_ind, column_name in enumerate(CATEGORICAL_COLUMNS):
+        ax = axs[cat_column_ind // 2, cat_column_ind % 2]
+        sns.countplot(ax=ax, x=main_data[column_name], palette="Paired")
+        ax.yaxis.set_minor_locator(MultipleLocator(1))
+        ax.grid(
             axis="y",
             visible=True,
             which="minor",
@@ -208,303 +404,316 @@ for row in range(3):
             color="grey",
             linestyle="--"
         )
-        axs[row, column].grid(
+        ax.grid(
             axis="y",
             visible=True,
             which="major",
             linewidth=0.5,
             color="black",
             linestyle="--"
-            )
+        )
 
         if column_name in ["industry", "country"]:
-            axs[row, column].tick_params(axis="x", rotation=90)
-
-        if cat_column_ind < len(categorical_columns) - 1:
-            cat_column_ind += 1
-            continue
-        break
-axs[2, 1].remove()
-
-plt.savefig(f"{image_save_dir}categorical_univariate_observ.png")
-plt.close(fig=fig)
-"""
-Categorical data countplots:
-- The most active space startups' industry is Satellites - about 40.
-    The next is Launch - more than 25.
-- USA is a leader in space startups - more than 70.
-    The second is UK - more than 10.
-- As a rule, there are very small and small size space startups with
-    1-10 or 10-20 employees. Also, there are more than 15 large
-    space startups with 51-200 employees.
-- Mainly, space startups are currently on Seed or Self-founded funding level.
-    Also, the every next funding level appears fewer times,
-    which is not surprising.
-"""
+            ax.tick_params(axis="x", rotation=90)
+    axs[2, 1].remove()
 
-# Normalizing amount data distribution.
-# Using log1p since the data has zero values.
-main_data["amount_raised_log"] = np.log1p(main_data["amount_raised(usd)"])
-plt.figure(layout="constrained")
-sns.histplot(data=main_data["amount_raised_log"], bins=50, kde=True)
-plt.savefig(f"{image_save_dir}amount_log_distribution")
-plt.close()
-
-numerical_columns.append("amount_raised_log")
+    plt.savefig(path)
+    plt.close(fig=fig)
+    """
+    Categorical data countplots:
+    - The most active space startups' industry is Satellites - about 40.
+        The next is Launch - more than 25.
+    - USA is a leader in space startups - more than 70.
+        The second is UK - more than 10.
+    - As a rule, there are very small and small size space startups with
+        1-10 or 10-20 employees. Also, there are more than 15 large
+        space startups with 51-200 employees.
+    - Mainly, space startups are currently on Seed or Self-founded
+        funding level.
+        Also, the every next funding level appears fewer times,
+        which is not surprising.
+    """
+
+    return path
+
+
+def plot_amount_log_distribution(main_data: pd.DataFrame, path: str) -> str:
+    """
+    Function plots distribution of the log of the raised amount.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(layout="constrained")
+    sns.histplot(data=main_data["amount_raised_log"], bins=50, kde=True)
+    plt.savefig(path)
+    plt.close()
+
+    return path
 
 
 ## Bivariate analysis
 
-numerical_pairplot: sns.PairGrid = sns.pairplot(
-    data=main_data.drop(columns=["amount_raised(usd)"]),
-    height=3,
-    aspect=1
-)
-numerical_pairplot.figure.set_constrained_layout(True)
-plt.savefig(f"{image_save_dir}numerical_bivariate_observ.png")
-plt.close()
-"""
-- Startup age has positive correlation with raised amount.
-Hence founding year has negative correlation with raised amount.
-"""
-
-print(categorical_columns, numerical_columns, sep="\n")
-
-fig, axs = plt.subplots(
-    nrows=4, ncols=3, layout="constrained", figsize=(18, 25)
-)
-
-data = main_data.groupby(
-    "industry"
-)["startup_age"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[0, 0],
-    data=data,
-    x="industry",
-    y="startup_age",
-    palette="viridis"
-)
-axs[0, 0].tick_params(axis="x", rotation=90)
-axs[0, 0].set_title("Industry VS Age")
-
-data = main_data.groupby(
-    "industry"
-)["amount_raised_log"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[0, 1],
-    data=data,
-    x="industry",
-    y="amount_raised_log",
-    palette="viridis"
-)
-axs[0, 1].tick_params(axis="x", rotation=90)
-axs[0, 1].set_title("Industry VS Amount raised(log)")
-
-data = main_data.groupby(
-    "industry"
-)["amount_raised(usd)"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[0, 2],
-    data=data,
-    x="industry",
-    y="amount_raised(usd)",
-    palette="viridis"
-)
-axs[0, 2].tick_params(axis="x", rotation=90)
-axs[0, 2].set_title("Industry VS Amount raised(USD)")
-
-data = main_data.groupby(
-    "country"
-)["startup_age"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[1, 0],
-    data=data,
-    x="country",
-    y="startup_age",
-    palette="viridis"
-)
-axs[1, 0].tick_params(axis="x", rotation=90)
-axs[1, 0].set_title("Country VS Age")
-
-data = main_data.groupby(
-    "country"
-)["amount_raised_log"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[1, 1],
-    data=data,
-    x="country",
-    y="amount_raised_log",
-    palette="viridis"
-)
-axs[1, 1].tick_params(axis="x", rotation=90)
-axs[1, 1].set_title("Country VS Amount raised(log)")
-
-data = main_data.groupby(
-    "country"
-)["amount_raised(usd)"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[1, 2],
-    data=data,
-    x="country",
-    y="amount_raised(usd)",
-    palette="viridis"
-)
-axs[1, 2].tick_params(axis="x", rotation=90)
-axs[1, 2].set_title("Country VS Amount raised(USD)")
-
-data = main_data.groupby(
-    "startup_size"
-)["startup_age"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[2, 0],
-    data=data,
-    x="startup_size",
-    y="startup_age",
-    palette="viridis"
-)
-axs[2, 0].set_title("Size VS Age")
-
-data = main_data.groupby(
-    "startup_size"
-)["amount_raised_log"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[2, 1],
-    data=data,
-    x="startup_size",
-    y="amount_raised_log",
-    palette="viridis"
-)
-axs[2, 1].set_title("Size VS Amount_raised(log)")
-
-data = main_data.groupby(
-    "startup_size"
-)["amount_raised(usd)"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[2, 2],
-    data=data,
-    x="startup_size",
-    y="amount_raised(usd)",
-    palette="viridis"
-)
-axs[2, 2].set_title("Size VS Amount_raised(USD)")
-
-data = main_data.groupby(
-    "current_funding_level"
-)["startup_age"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[3, 0],
-    data=data,
-    x="current_funding_level",
-    y="startup_age",
-    palette="viridis"
-)
-axs[3, 0].set_title("Funding_lvl VS Age")
+def plot_numerical_bivariate(main_data: pd.DataFrame, path: str) -> str:
+    """
+    Function plots pairwise relations of numerical columns.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    numerical_pairplot: sns.PairGrid = sns.pairplot(
+        data=main_data[["startup_age", "year_founded", "amount_raised_log"]],
+        height=3,
+        aspect=1
+    )
+    numerical_pairplot.figure.set_constrained_layout(True)
+    plt.savefig(path)
+    plt.close()
+    """
+    - Startup age has positive correlation with raised amount.
+    Hence founding year has negative correlation with raised amount.
+    """
+
+    return path
+
+
+def plot_categorical_bivariate(table: pd.DataFrame, path: str) -> str:
+    """
+    Function plots group means of every measure by every categorical key
+    from the aggregates table of the summary (AggregateState.get_table).
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-data = main_data.groupby(
-    "current_funding_level"
-)["amount_raised_log"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[3, 1],
-    data=data,
-    x="current_funding_level",
-    y="amount_raised_log",
-    palette="viridis"
-)
-axs[3, 1].set_title("Funding_lvl VS Amount_raised(log)")
+    fig, axs = plt.subplots(
+        nrows=4, ncols=3, layout="constrained", figsize=(18, 25)
+    )
+    for row, (key, key_title) in enumerate(BIVARIATE_KEYS.items()):
+        for column, (measure, measure_title) in enumerate(
+            BIVARIATE_MEASURES.items()
+        ):
+            sns.barplot(
+                ax=axs[row, column],
+                data=get_group_table(
+                    table=table, key=key, measure=measure
+                ),
+                x=key,
+                y=measure,
+                palette="viridis"
+            )
+            if key in ["industry", "country"]:
+                axs[row, column].tick_params(axis="x", rotation=90)
+            axs[row, column].set_title(f"{key_title} VS {measure_title}")
+
+    plt.savefig(path)
+    plt.close()
+    """
+    - On average, the oldest industry is Rovers.
+        Also, the biggest amounts are raised in Rovers on average.
+    - On average, Japan has the oldest space startups.
+        On average, the top amounts raised countries are
+        China, Japan, Finland. If counting huge amount outliers then
+        the leaders are USA, China, Japan
+    - On average, the oldest space startups are
+        in size of enterprises (1000+ employees).
+        On average, the biggest amounts are raised in
+        enterprises(1000+ employees).
+        But the next are medium size space startups.
+    - On average, space startups on Series C+ funding level are
+        the oldest ones and have the biggest amounts raised.
+    """
+
+    return path
 
-data = main_data.groupby(
-    "current_funding_level"
-)["amount_raised(usd)"].mean().sort_values(ascending=False).reset_index()
-sns.barplot(
-    ax=axs[3, 2],
-    data=data,
-    x="current_funding_level",
-    y="amount_raised(usd)",
-    palette="viridis"
-)
-axs[3, 2].set_title("Funding_lvl VS Amount_raised(USD)")
 
+## Multivariate analysis
 
-plt.savefig(f"{image_save_dir}categorical_bivariate_observ.png")
-plt.close()
+def plot_correlation(correlation: pd.DataFrame, path: str) -> str:
+    """
+    Function plots the correlation matrix of numerical columns.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(12, 7), layout="constrained")
+    sns.heatmap(data=correlation, vmin=-1, vmax=1, annot=True)
+
+    plt.savefig(path)
+    plt.close()
+    """
+    - Current funding level has a strong positive correlation to
+        startup size (0.63) and raised amount (0.7). Also, there is a
+        moderate correlation to startup age positively (0.36).
+    - Startup size has a strong positive correlation to startup age (0.54),
+        raised amount (0.59) and current funding level (0.63).
+    - Startup age has a moderate positive correlation to raised amount
+        (0.41) and current funding level (0.36).
+    """
+
+    return path
+
+
+## Large-data mode
+
+def plot_binned_skew(
+    histogram: tuple[NDArray, NDArray],
+    box_statistics: dict[str, object],
+    column: str,
+    path: str
+) -> str:
+    """
+    Function plots a precomputed histogram (counts, edges) and box plot
+    (see get_box_statistics) of a numerical column, the large-data
+    plot_numerical_skew.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
 
-"""
-- On average, the oldest industry is Rovers.
-    Also, the biggest amounts are raised in Rovers on average.
-- On average, Japan has the oldest space startups.
-    On average, the top amounts raised countries are
-    China, Japan, Finland. If counting huge amount outliers then the leaders
-    are USA, China, Japan
-- On average, the oldest space startups are
-    in size of enterprises (1000+ employees).
-    On average, the biggest amounts are raised in enterprises(1000+ employees).
-    But the next are medium size space startups.
-- On average, space startups on Series C+ funding level are
-    the oldest ones and have the biggest amounts raised.
-"""
+    fig, axs = plt.subplots(
+        nrows=1, ncols=2, figsize=(15, 5), layout="constrained"
+    )
+    axs[0].stairs(*histogram, fill=True, alpha=0.6)
+    axs[0].set_xlabel(column)
+    axs[0].set_ylabel("Count")
+    axs[0].yaxis.set_major_locator(MaxNLocator(integer=True))
+    axs[1].bxp(bxpstats=[box_statistics], orientation="horizontal")
+    axs[1].set_yticks([])
+    for ax in axs:
+        if column == "amount_raised(usd)":
+            ax.tick_params(axis="x", labelrotation=45)
+            ax.xaxis.set_major_formatter(
+                FuncFormatter(
+                    lambda amount, _: (f"{amount:,.0f}").replace(",", " ")
+                )
+            )
+    plt.savefig(path)
+    plt.close(fig=fig)
 
+    return path
 
-## Multivariate analysis
 
-correlation_data: pd.DataFrame = main_data
-num_funding_lvl_mapping: dict[str, str] = {
-    "Self-funded": 0,
-    "Seed": 1,
-    "Series A": 2,
-    "Series B": 3,
-    "Series C+": 4
-}
-num_size_mapping: dict[str, str] = {
-    "Very Small": 1,
-    "Small": 2,
-    "Medium": 3,
-    "Large": 4,
-    "Very Large": 5,
-    "Enterprise": 6
-}
+def plot_category_counts(counts: dict[str, pd.Series], path: str) -> str:
+    """
+    Function plots precomputed counts of every categorical column,
+    the large-data plot_categorical_univariate.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-correlation_data.insert(
-    loc=0,
-    column="startup_size(num)",
-    value=correlation_data["startup_size"].str.strip().map(
-        num_size_mapping
-    )
-)
-correlation_data.insert(
-    loc=0,
-    column="current_funding_level(num)",
-    value=correlation_data["current_funding_level"].str.strip().map(
-        num_funding_lvl_mapping
+    fig, axs = plt.subplots(
+        nrows=3,
+        ncols=2,
+        figsize=(18, 15),
+        layout="constrained"
     )
-)
-correlation_data = correlation_data.drop(
-    columns=[
-        "name",
-        "industry",
-        "country",
-        "startup_size",
-        "employees_number",
-        "current_funding_level",
-        "amount_raised(usd)"
-    ]
-)
+    for cat_column_ind, column_name in enumerate(CATEGORICAL_COLUMNS):
+        ax = axs[cat_column_ind // 2, cat_column_ind % 2]
+        column_counts: pd.Series = counts[column_name]
+        sns.barplot(
+            ax=ax,
+            x=column_counts.index.astype(str),
+            y=column_counts.to_numpy(),
+            hue=column_counts.index.astype(str),
+            palette="Paired",
+            legend=False
+        )
+        ax.set_xlabel(column_name)
+        ax.set_ylabel("count")
+        ax.grid(
+            axis="y",
+            visible=True,
+            which="major",
+            linewidth=0.5,
+            color="black",
+            linestyle="--"
+        )
+        if column_name in ["industry", "country"]:
+            ax.tick_params(axis="x", rotation=90)
+    axs[2, 1].remove()
 
+    plt.savefig(path)
+    plt.close(fig=fig)
 
-plt.figure(figsize=(12, 7), layout="constrained")
-sns.heatmap(data=correlation_data.corr(), vmin=-1, vmax=1, annot=True)
+    return path
+
+
+def plot_binned_distribution(
+    histogram: tuple[NDArray, NDArray], column: str, path: str
+) -> str:
+    """
+    Function plots a precomputed histogram (counts, edges),
+    the large-data plot_amount_log_distribution.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.figure(layout="constrained")
+    plt.stairs(*histogram, fill=True, alpha=0.6)
+    plt.xlabel(column)
+    plt.ylabel("Count")
+    plt.savefig(path)
+    plt.close()
+
+    return path
+
+
+def plot_binned_pairs(
+    columns: list[str],
+    histograms: dict[str, tuple[NDArray, NDArray]],
+    densities: dict[tuple[str, str], tuple[NDArray, NDArray, NDArray]],
+    path: str
+) -> str:
+    """
+    Function plots pairwise relations of numerical columns from
+    precomputed histograms (diagonal) and 2D densities by
+    (x column, y column) of every pair in column order (mirrored
+    panels are transposed) on a log color scale,
+    the large-data plot_numerical_bivariate.
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
 
-plt.savefig(f"{image_save_dir}correlation_multivariate.png")
-plt.close()
+    fig, axs = plt.subplots(
+        nrows=len(columns),
+        ncols=len(columns),
+        figsize=(3 * len(columns), 3 * len(columns)),
+        layout="constrained",
+        squeeze=False
+    )
+    for row, y_column in enumerate(columns):
+        for column, x_column in enumerate(columns):
+            ax = axs[row, column]
+            if row == column:
+                ax.stairs(*histograms[x_column], fill=True, alpha=0.6)
+            elif column < row:
+                counts, x_edges, y_edges = densities[(x_column, y_column)]
+            else:
+                counts, y_edges, x_edges = densities[(y_column, x_column)]
+                counts = counts.T
+            if row != column:
+                # Empty bins are left blank.
+                ax.pcolormesh(
+                    x_edges,
+                    y_edges,
+                    np.ma.masked_equal(counts.T, 0),
+                    norm=LogNorm(),
+                    cmap="viridis"
+                )
+            if row == len(columns) - 1:
+                ax.set_xlabel(x_column)
+            if column == 0:
+                ax.set_ylabel(y_column)
+    plt.savefig(path)
+    plt.close(fig=fig)
 
-"""
-- Current funding level has a strong positive correlation to
-    startup size (0.63) and raised amount (0.7). Also, there is a
-    moderate correlation to startup age positively (0.36).
-- Startup size has a strong positive correlation to startup age (0.54),
-    raised amount (0.59) and current funding level (0.63).
-- Startup age has a moderate positive correlation to raised amount (0.41) and
-    current funding level (0.36).
-"""
+    return path
 
 
 ### K-MEANS CLUSTERING
@@ -555,156 +764,403 @@ between current_funding_leven(num), startup_age and amount_raised_log.
 
 ### ADDITIONAL ANALYSIS
 
+def plot_group_analysis(
+    table: pd.DataFrame, key: str, top: int | None, path: str
+) -> str:
+    """
+    Function plots count, average funding level, growing and
+    sustainability rates of industries or countries (top groups only
+    if top is set) from the aggregates table of the summary
+    (AggregateState.get_table).
+    Returns the figure path.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-main_data["growing_rate"] = (
-    main_data["startup_size(num)"] / main_data["startup_age"]
-)
-main_data["sustainability_rate"] = (
-    main_data["startup_age"] * main_data["startup_size(num)"]
-)
-
-# Industries
-
-fig, axs = plt.subplots(
-    nrows=2,
-    ncols=2,
-    layout="constrained",
-    figsize=(15, 10)
-)
-
-data = main_data.groupby("industry")["industry"].count().sort_values(
-    ascending=False
-)
-axs[0, 0].set_ylabel(ylabel="count")
-axs[0, 0].set_xlabel(xlabel="industry")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[0, 0])
-
-data = main_data.groupby("industry")["current_funding_level(num)"].mean().sort_values(ascending=False)
-axs[0, 1].set_ylabel(ylabel="average funding_level")
-axs[0, 1].set_xlabel(xlabel="industry")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[0, 1])
-
-data = main_data.groupby("industry")["growing_rate"].mean().sort_values(
-    ascending=False
-)
-axs[1, 0].set_ylabel(ylabel="growing_rate")
-axs[1, 0].set_xlabel(xlabel="industry")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[1, 0])
-
-data = main_data.groupby("industry")["sustainability_rate"].mean().sort_values(
-    ascending=False
-)
-axs[1, 1].set_ylabel(ylabel="sustainability_rate")
-axs[1, 1].set_xlabel(xlabel="industry")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[1, 1])
-
-plt.savefig(f"{image_save_dir}industries_analysis.png")
-plt.close()
-
-"""
-- The largest number of space startups is in the satellite industry.
-    The second place is occupied by the space launch industry.
-- Space launch startups have reached the highest funding levels
-    on average commpared to other industries.
-    The space rover industry takes second place in this regard.
-- The space launch and the space software industries have the fastest growth.
-    The satellite industry takes third place
-    just after the space software industry.
-- The space rover industry is the most sustainable. Additionaly,
-    space launch, industrial and satellite startups are
-    relatively sustainable.
-- The space launch startups is a popular and fast-growing sector
-    with high funding levels. Moreover, this industry has held out
-    strongly in the market.
-The industry statistics show a general toward early space and
-planets exploration, with reducing costs assiciated with exploration.
-"""
-
-# Countries
-
-fig, axs = plt.subplots(
-    nrows=2,
-    ncols=2,
-    layout="constrained",
-    figsize=(15, 10)
-)
-
-data = main_data.groupby("country")["country"].count().sort_values(
-    ascending=False
-).head(10)
-axs[0, 0].set_ylabel(ylabel="count")
-axs[0, 0].set_xlabel(xlabel="country")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[0, 0])
-
-data = main_data.groupby("country")["current_funding_level(num)"].mean().sort_values(ascending=False).head(10)
-axs[0, 1].set_ylabel(ylabel="average funding_level")
-axs[0, 1].set_xlabel(xlabel="country")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[0, 1])
-
-data = main_data.groupby("country")["growing_rate"].mean().sort_values(ascending=False).head(10)
-axs[1, 0].set_ylabel(ylabel="growing_rate")
-axs[1, 0].set_xlabel(xlabel="country")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[1, 0])
-
-data = main_data.groupby("country")["sustainability_rate"].mean().sort_values(
-    ascending=False
-).head(10)
-axs[1, 1].set_ylabel(ylabel="sustainability_rate")
-axs[1, 1].set_xlabel(xlabel="country")
-sns.barplot(data=data, palette="viridis", orient="h", ax=axs[1, 1])
-
-plt.savefig(f"{image_save_dir}countries_analysis.png")
-plt.close()
-
-"""
-- The largest number of startups is in the USA. The UK takes second place
-    with a significant gap.
-- China shows the fastest growth in space startups.
-- Japan and China have the highest average funding levels.
-    Finland ranks third in this regard.
-- Japan is also the most sustainable country for space startups,
-    with Finland showing almost the same results.
-    China takes the third place here.
-"""
-
-
-# Japan China Finland United Kingdom USA
+    fig, axs = plt.subplots(
+        nrows=2,
+        ncols=2,
+        layout="constrained",
+        figsize=(15, 10)
+    )
+    for ind, (title, measure, statistic) in enumerate(GROUP_ANALYSIS_PANELS):
+        ax = axs[ind // 2, ind % 2]
+        data: pd.DataFrame = get_group_table(
+            table=table,
+            key=key,
+            measure=measure,
+            statistic=statistic,
+            top=top
+        )
+        sns.barplot(
+            data=data, x=measure, y=key, palette="viridis", orient="h", ax=ax
+        )
+        ax.set_ylabel(ylabel=key)
+        ax.set_xlabel(xlabel=title)
+
+    plt.savefig(path)
+    plt.close()
+    """
+    Industries:
+    - The largest number of space startups is in the satellite industry.
+        The second place is occupied by the space launch industry.
+    - Space launch startups have reached the highest funding levels
+        on average commpared to other industries.
+        The space rover industry takes second place in this regard.
+    - The space launch and the space software industries have
+        the fastest growth.
+        The satellite industry takes third place
+        just after the space software industry.
+    - The space rover industry is the most sustainable. Additionaly,
+        space launch, industrial and satellite startups are
+        relatively sustainable.
+    - The space launch startups is a popular and fast-growing sector
+        with high funding levels. Moreover, this industry has held out
+        strongly in the market.
+    The industry statistics show a general toward early space and
+    planets exploration, with reducing costs assiciated with exploration.
+
+    Countries:
+    - The largest number of startups is in the USA. The UK takes second place
+        with a significant gap.
+    - China shows the fastest growth in space startups.
+    - Japan and China have the highest average funding levels.
+        Finland ranks third in this regard.
+    - Japan is also the most sustainable country for space startups,
+        with Finland showing almost the same results.
+        China takes the third place here.
+    """
+
+    return path
+
+
+def export_data(main_data: pd.DataFrame, path: str) -> str:
+    """
+    Function writes the main dataframe for clustering
+    (see write_table).
+    Returns the file path.
+    """
+    return write_table(data=main_data, path=path)
+
+
+### IMPLEMENTATION
+
+def get_row_figure_specs(
+    main_data: pd.DataFrame, image_save_dir: str = IMAGE_SAVE_DIR
+) -> list[FigureSpec]:
+    """
+    Function collects the row-level EDA figures, every figure gets
+    the columns it draws.
+    Returns a list of figure specs.
+    """
+    figure_path: Callable[[str], str] = lambda file_name: os.path.join(
+        image_save_dir, file_name
+    )
+    specs: list[FigureSpec] = [
+        FigureSpec(
+            func=plot_numerical_skew,
+            kwargs={
+                "main_data": main_data[[column]],
+                "column": column,
+                "path": figure_path(f"{column}_skew.png")
+            }
+        )
+        for column in NUMERICAL_COLUMNS
+    ]
+    specs.extend([
+        FigureSpec(
+            func=plot_categorical_univariate,
+            kwargs={
+                "main_data": main_data[CATEGORICAL_COLUMNS],
+                "path": figure_path("categorical_univariate_observ.png")
+            }
+        ),
+        FigureSpec(
+            func=plot_amount_log_distribution,
+            kwargs={
+                "main_data": main_data[["amount_raised_log"]],
+                "path": figure_path("amount_log_distribution.png")
+            }
+        ),
+        FigureSpec(
+            func=plot_numerical_bivariate,
+            kwargs={
+                "main_data": main_data[
+                    ["startup_age", "year_founded", "amount_raised_log"]
+                ],
+                "path": figure_path("numerical_bivariate_observ.png")
+            }
+        )
+    ])
+
+    return specs
+
+
+def get_binned_figure_specs(
+    main_data: pd.DataFrame, image_save_dir: str = IMAGE_SAVE_DIR
+) -> list[FigureSpec]:
+    """
+    Function collects the row-level EDA figures of the large-data mode:
+    histograms, box plots, category counts and 2D densities are
+    computed here in NumPy, so figures get arrays of the output
+    resolution instead of rows.
+    Returns a list of figure specs.
+    """
+    figure_path: Callable[[str], str] = lambda file_name: os.path.join(
+        image_save_dir, file_name
+    )
+    pair_columns: list[str] = [
+        "startup_age", "year_founded", "amount_raised_log"
+    ]
+    histograms: dict[str, tuple[NDArray, NDArray]] = {
+        column: get_histogram(values=main_data[column])
+        for column in dict.fromkeys(NUMERICAL_COLUMNS + pair_columns)
+    }
+
+    specs: list[FigureSpec] = [
+        FigureSpec(
+            func=plot_binned_skew,
+            kwargs={
+                "histogram": histograms[column],
+                "box_statistics": get_box_statistics(values=main_data[column]),
+                "column": column,
+                "path": figure_path(f"{column}_skew.png")
+            }
+        )
+        for column in NUMERICAL_COLUMNS
+    ]
+    specs.extend([
+        FigureSpec(
+            func=plot_category_counts,
+            kwargs={
+                "counts": {
+                    column: main_data[column].value_counts(sort=False)
+                    for column in CATEGORICAL_COLUMNS
+                },
+                "path": figure_path("categorical_univariate_observ.png")
+            }
+        ),
+        FigureSpec(
+            func=plot_binned_distribution,
+            kwargs={
+                "histogram": histograms["amount_raised_log"],
+                "column": "amount_raised_log",
+                "path": figure_path("amount_log_distribution.png")
+            }
+        ),
+        FigureSpec(
+            func=plot_binned_pairs,
+            kwargs={
+                "columns": pair_columns,
+                "histograms": {
+                    column: histograms[column] for column in pair_columns
+                },
+                "densities": {
+                    (x_column, y_column): get_density(
+                        x=main_data[x_column], y=main_data[y_column]
+                    )
+                    for ind, x_column in enumerate(pair_columns)
+                    for y_column in pair_columns[ind + 1:]
+                },
+                "path": figure_path("numerical_bivariate_observ.png")
+            }
+        )
+    ])
+
+    return specs
+
+
+def get_figure_specs(
+    main_data: pd.DataFrame,
+    aggregates: dict[str, object],
+    image_save_dir: str = IMAGE_SAVE_DIR,
+    large_data: bool | None = None
+) -> list[FigureSpec]:
+    """
+    Function collects EDA figures, every figure gets only the columns
+    or aggregate rows it draws, so its content hash (see FigureCache)
+    changes only with them. In the large-data mode (by default from
+    LARGE_DATA_ROWS rows) row-level figures are drawn from bins
+    (see get_binned_figure_specs).
+    Returns a list of figure specs.
+    """
+    figure_path: Callable[[str], str] = lambda file_name: os.path.join(
+        image_save_dir, file_name
+    )
+    bivariate: pd.DataFrame = aggregates["bivariate"][
+        ["key", "group", "measure", "mean"]
+    ]
+    groups: pd.DataFrame = aggregates["groups"][
+        ["key", "group", "measure", "size", "mean"]
+    ]
 
-research_countries: list[str] = [
-    "United States", "China", "Finland", "United Kingdom", "Japan"
-]
+    if large_data is None:
+        large_data = is_large_data(rows=len(main_data))
+
+    specs: list[FigureSpec] = (
+        get_binned_figure_specs if large_data else get_row_figure_specs
+    )(main_data=main_data, image_save_dir=image_save_dir)
+    specs.extend([
+        FigureSpec(
+            func=plot_categorical_bivariate,
+            kwargs={
+                "table": bivariate,
+                "path": figure_path("categorical_bivariate_observ.png")
+            }
+        ),
+        FigureSpec(
+            func=plot_correlation,
+            kwargs={
+                "correlation": aggregates["correlation"],
+                "path": figure_path("correlation_multivariate.png")
+            }
+        )
+    ])
+    for key, top, file_name in [
+        ("industry", None, "industries_analysis.png"),
+        ("country", 10, "countries_analysis.png")
+    ]:
+        specs.append(
+            FigureSpec(
+                func=plot_group_analysis,
+                kwargs={
+                    "table": groups[groups["key"] == key],
+                    "key": key,
+                    "top": top,
+                    "path": figure_path(file_name)
+                }
+            )
+        )
 
-for country in research_countries:
-    data = main_data[main_data["country"] == country]
-    data = data.groupby("industry")["industry"].count().sort_values(ascending=False).head(3)
-    print(country, data, "\n\n", sep="\n")
+    return specs
+
+
+def run_pipeline(
+    cache: StageCache | None = None,
+    figure_cache: FigureCache | None = None,
+    data_path: str = DATA_PATH,
+    image_save_dir: str = IMAGE_SAVE_DIR,
+    main_data_path: str = get_table_path(stem=MAIN_DATA_STEM),
+    profile_path: str = PROFILE_PATH,
+    summary_path: str = SUMMARY_PATH,
+    changes_path: str = CHANGES_PATH,
+    n_jobs: int = -1,
+    large_data: bool | None = None
+) -> Pipeline:
+    """
+    Function runs the EDA stages: load, clean, derive, profile,
+    summary, aggregate, plot and export. A stage re-executes only if
+    its code (with the helpers and constants it uses), parameters
+    or upstream outputs changed (or a file it writes is missing or
+    was overwritten, e.g. by a run on other data). The summary stage
+    applies changes logged to changes_path (see write_changes).
+    The plot stage renders figures (see get_figure_specs) headless by
+    n_jobs worker processes (-1 uses all cores), with a figure cache
+    only figures whose code or data slice changed are redrawn.
+    large_data forces the binned figures on or off (see get_figure_specs).
+    Returns the pipeline with keys and executed stages.
+    """
+    pipeline: Pipeline = Pipeline(cache=cache)
+    pipeline.stage(
+        name="load", func=load_data, files=[data_path], path=data_path
+    )
+    pipeline.stage(name="clean", func=clean_data, inputs=["load"])
+    pipeline.stage(
+        name="derive",
+        func=derive_features,
+        inputs=["clean"],
+        year=datetime.date.today().year
+    )
+    pipeline.stage(
+        name="profile",
+        func=profile_data,
+        inputs=["derive"],
+        outputs=[profile_path],
+        path=profile_path
+    )
+    pipeline.stage(
+        name="summary",
+        func=summarize_data,
+        inputs=["derive"],
+        outputs=[summary_path],
+        path=summary_path,
+        version=pipeline.keys["derive"],
+        changes_path=changes_path
+    )
+    pipeline.stage(
+        name="aggregate", func=aggregate_data, inputs=["derive", "summary"]
+    )
 
-"""
-The analysis shows, that Japan has only two space startups -
-in rover and satellite industires.
-Finland - 1 in Satellites.
-China - 2 in Launch.
-The USA focuses mostly on satellites (23) and space launches (14).
-Also, there are 8 space infrastructure startups.
-The UK focuses on Industrials (4) and Launch (4).
-Also, there are 2 space media education startups.
-"""
+    render_figures(
+        specs=get_figure_specs(
+            main_data=pipeline.get("derive"),
+            aggregates=pipeline.get("aggregate"),
+            image_save_dir=image_save_dir,
+            large_data=large_data
+        ),
+        n_jobs=n_jobs,
+        cache=figure_cache
+    )
 
-# Outliers
+    pipeline.stage(
+        name="export",
+        func=export_data,
+        inputs=["derive"],
+        outputs=[main_data_path],
+        path=main_data_path
+    )
 
-print(main_data[main_data["amount_raised(usd)"] > 500000000])
-print(main_data[main_data["startup_age"] > 20])
+    return pipeline
 
-"""
-Amount raised outliers:
-- OneWeb, Satellites, USA
-- SpaceX, Launch, USA
-- Blue Origin, Launch, USA
-Age outliers:
-- Reaction Engines, Industrials, UK
-- Ramon.Space, Satellites, USA
-- SpaceX, Launch, USA
-- Blue Origin, Launch, USA
-"""
 
-main_data.to_csv("assets/data/main_data.csv")
+def main():
+    warnings.filterwarnings('ignore')
+    figure_cache: FigureCache = FigureCache()
+    pipeline: Pipeline = run_pipeline(
+        cache=StageCache(), figure_cache=figure_cache
+    )
+    print(f"Executed stages: {pipeline.executed}")
+    print(f"Rendered figures: {figure_cache.rendered}")
+
+    aggregates: dict[str, object] = pipeline.get("aggregate")
+    pd.set_option("display.float_format", "{:.0f}".format)
+    print(get_profile_table(profile=pipeline.get("profile")).to_string())
+    """
+    - Space startups' foundation years - 1989-2021.
+    - The oldest space startup is 35 years old, the youngest - 3
+    - The amounts are between 0 and 3 000 000 000, averagely 71,5 millions.
+        Raised amounts' standart deviation is 370 636 877, which is very big.
+    """
+
+    # Japan China Finland United Kingdom USA
+    for country, data in aggregates["research_countries"].items():
+        print(country, data, "\n\n", sep="\n")
+    """
+    The analysis shows, that Japan has only two space startups -
+    in rover and satellite industires.
+    Finland - 1 in Satellites.
+    China - 2 in Launch.
+    The USA focuses mostly on satellites (23) and space launches (14).
+    Also, there are 8 space infrastructure startups.
+    The UK focuses on Industrials (4) and Launch (4).
+    Also, there are 2 space media education startups.
+    """
+
+    # Outliers
+    for data in aggregates["outliers"].values():
+        print(data)
+    """
+    Amount raised outliers:
+    - OneWeb, Satellites, USA
+    - SpaceX, Launch, USA
+    - Blue Origin, Launch, USA
+    Age outliers:
+    - Reaction Engines, Industrials, UK
+    - Ramon.Space, Satellites, USA
+    - SpaceX, Launch, USA
+    - Blue Origin, Launch, USA
+    """
+
+
+if __name__ == "__main__":
+    main()
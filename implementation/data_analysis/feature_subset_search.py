@@ -0,0 +1,170 @@
+import pandas as pd
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Iterator
+from implementation.data_analysis.cluster_metrics import (
+    calinski_harabasz_score
+)
+from implementation.data_analysis.data_store import find_table, read_table
+from implementation.data_analysis.kmeans_implementation import (
+    KMeansCache,
+    fit_subsets,
+    setup_logging
+)
+from implementation.data_analysis.streaming_statistics import MomentState
+
+
+# Numeric columns of correlation_data in exploratory_data_analysis.py.
+CORRELATION_COLUMNS: list[str] = [
+    "current_funding_level(num)",
+    "startup_size(num)",
+    "year_founded",
+    "startup_age",
+    "amount_raised_log"
+]
+
+
+### FUNCTIONS
+
+def enumerate_low_correlation_subsets(
+    correlation: pd.DataFrame,
+    threshold: float,
+    min_size: int = 2,
+    max_size: int | None = None
+) -> Iterator[list[str]]:
+    """
+    Function enumerates column subsets whose pairwise absolute
+    correlations are all not larger than threshold.
+    Subsets are extended one column at a time with columns compatible
+    with all the columns already taken, so supersets of a correlated
+    pair are never generated.
+    Yields subsets of min_size to max_size columns.
+    """
+    columns: list[str] = list(correlation.columns)
+    compatible: NDArray[np.bool_] = (
+        np.abs(correlation.to_numpy()) <= threshold
+    )
+    max_size = max_size or len(columns)
+
+    def extend(
+        subset: list[int], candidates: NDArray[np.int64]
+    ) -> Iterator[list[str]]:
+        if len(subset) >= min_size:
+            yield [columns[ind] for ind in subset]
+        if len(subset) == max_size:
+            return
+        for position, ind in enumerate(candidates):
+            rest: NDArray[np.int64] = candidates[position + 1:]
+            yield from extend(
+                subset=subset + [ind],
+                candidates=rest[compatible[ind, rest]]
+            )
+
+    yield from extend(subset=[], candidates=np.arange(len(columns)))
+
+
+def search_feature_subsets(
+    data: pd.DataFrame,
+    columns: list[str] | None = None,
+    threshold: float = 0.5,
+    k_variants: list[int] = list(range(2, 6)),
+    runs: int = 10,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    seed: int | None = None,
+    cache: KMeansCache | None = None,
+    n_jobs: int = -1,
+    min_size: int = 2,
+    max_size: int | None = None
+) -> pd.DataFrame:
+    """
+    Function searches column subsets for K-Means clustering.
+    Candidate subsets of numeric columns (all numeric columns of data
+    if columns are not given) are pruned by the correlation threshold,
+    the survivors are clustered concurrently for every k of k_variants
+    (best of runs fits of up to max_iter Lloyd iterations, see
+    KMeans.get_best_result) and scored with Calinski-Harabasz score
+    of the converged clusters. Fits go through the cache,
+    so a rerun only fits new subsets or k variants.
+    Returns a dataframe with a row per subset and k, best scores first.
+    """
+    columns = columns or list(data.select_dtypes(include=np.number).columns)
+    # Correlations and total sums of squares from one pass.
+    moments: MomentState = MomentState.from_frame(data=data, columns=columns)
+    correlation: pd.DataFrame = moments.get_correlation()
+    subsets: list[list[str]] = list(
+        enumerate_low_correlation_subsets(
+            correlation=correlation,
+            threshold=threshold,
+            min_size=min_size,
+            max_size=max_size
+        )
+    )
+    if not subsets:
+        return pd.DataFrame(
+            columns=["columns", "k", "inertia", "score", "max_correlation"]
+        )
+
+    # A fit per subset and k over the shared feature matrix.
+    results: list[dict[str, Any]] = fit_subsets(
+        data=data,
+        subsets=[subset for subset in subsets for _ in k_variants],
+        k_variants=[],
+        k=[k for _ in subsets for k in k_variants],
+        runs=runs,
+        seed=seed,
+        cache=cache,
+        n_jobs=n_jobs,
+        max_iter=max_iter,
+        tol=tol
+    )
+
+    squared_deviations: pd.Series = pd.Series(
+        data=np.diag(moments.squares), index=columns
+    )
+    rows: list[dict[str, Any]] = []
+    for result in results:
+        subset_correlation: NDArray[np.float64] = np.abs(
+            correlation.loc[result["columns"], result["columns"]].to_numpy()
+        )
+        rows.append(
+            {
+                "columns": tuple(result["columns"]),
+                "k": result["k"],
+                "inertia": result["inertia"],
+                "score": calinski_harabasz_score(
+                    inertia=result["inertia"],
+                    total_sum_of_squares=squared_deviations[
+                        result["columns"]
+                    ].sum(),
+                    n=len(data),
+                    k=result["k"]
+                ),
+                "max_correlation": np.max(
+                    subset_correlation[
+                        ~np.eye(len(subset_correlation), dtype=bool)
+                    ]
+                )
+            }
+        )
+
+    return pd.DataFrame(data=rows).sort_values(
+        by="score", ascending=False, ignore_index=True
+    )
+
+
+### IMPLEMENTATION
+
+if __name__ == "__main__":
+    setup_logging()
+    main_data: pd.DataFrame = read_table(
+        path=find_table(stem="assets/data/for_kmeans"),
+        columns=CORRELATION_COLUMNS
+    )
+    ranking: pd.DataFrame = search_feature_subsets(
+        data=main_data,
+        columns=CORRELATION_COLUMNS,
+        seed=42,
+        cache=KMeansCache()
+    )
+    print(ranking.to_string())
@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+from implementation.data_analysis.content_hashing import (
+    get_code_version,
+    get_content_digest,
+    get_file_digest
+)
+
+
+# Non-interactive backend of batch rendering, figures are only saved.
+HEADLESS_BACKEND: str = "Agg"
+# Manifest of content hashes and file digests of rendered figures by file.
+DEFAULT_FIGURE_MANIFEST: str = os.path.join(
+    "assets", "cache", "figures", "manifest.json"
+)
+
+
+### CLASS
+
+class FigureSpec:
+    """
+    Figure to render: func(*args, **kwargs) draws, saves and closes
+    one figure (or a few), its return value is collected. func must be
+    a module-level function and its arguments picklable, so the spec
+    can be rendered in a worker process. Figures written to
+    kwargs["path"] can be cached by FigureCache, their arguments
+    should then hold only the data slice the figure draws.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None
+    ):
+        self.func: Callable[..., Any] = func
+        self.args: tuple = args
+        self.kwargs: dict[str, Any] = kwargs or {}
+
+    def get_key(self) -> str:
+        """
+        Method hashes code of the plot function and content of its
+        arguments except the output path.
+        Returns a SHA-256 hex digest.
+        """
+        return get_content_digest(
+            get_code_version(func=self.func),
+            self.args,
+            {
+                name: value for name, value in self.kwargs.items()
+                if name != "path"
+            }
+        )
+
+
+class FigureCache:
+    """
+    Manifest of rendered figures: file -> content hash of the spec it
+    was rendered from (see FigureSpec.get_key) and digest of the file.
+    A spec is not rendered again if its file was rendered from the same
+    hash and was not changed since. An identical figure rendered to
+    another file is copied instead.
+    """
+
+    def __init__(self, manifest_path: str = DEFAULT_FIGURE_MANIFEST):
+        self.manifest_path: str = manifest_path
+        self.manifest: dict[str, dict[str, str]] = {}
+        if os.path.exists(manifest_path):
+            with open(file=manifest_path, mode="r", encoding="utf-8") as file:
+                # Entries of older manifests (hash -> file) are dropped.
+                self.manifest = {
+                    path: entry for path, entry in json.load(fp=file).items()
+                    if isinstance(entry, dict)
+                }
+        # Files rendered (not reused) and copied by the last render.
+        self.rendered: list[str] = []
+        self.copied: list[str] = []
+
+    def is_current(self, key: str, path: str) -> bool:
+        """
+        Method checks if a file holds the figure of a hash:
+        it was recorded with the hash and its digest did not change.
+        Returns True for a current file.
+        """
+        entry: dict[str, str] | None = self.manifest.get(path)
+
+        return (
+            entry is not None
+            and entry["key"] == key
+            and os.path.exists(path)
+            and get_file_digest(path=path) == entry["digest"]
+        )
+
+    def reuse(self, key: str, path: str) -> bool:
+        """
+        Method checks if the figure of a hash is already at path
+        or can be copied there from another file.
+        Returns True if the figure does not have to be rendered.
+        """
+        path = os.path.normpath(path)
+        if self.is_current(key=key, path=path):
+            return True
+        for cached_path, entry in self.manifest.items():
+            if (
+                entry["key"] == key
+                and cached_path != path
+                and self.is_current(key=key, path=cached_path)
+            ):
+                # The target may hold another figure, it is overwritten.
+                shutil.copyfile(src=cached_path, dst=path)
+                self.record(key=key, path=path)
+                self.copied.append(path)
+                return True
+
+        return False
+
+    def record(self, key: str, path: str):
+        """
+        Method records the hash and digest of a written figure file,
+        replacing its previous entry.
+        """
+        path = os.path.normpath(path)
+        self.manifest[path] = {
+            "key": key, "digest": get_file_digest(path=path)
+        }
+
+    def save(self):
+        """
+        Method writes the manifest.
+        """
+        directory: str = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file=self.manifest_path, mode="w", encoding="utf-8") as file:
+            json.dump(obj=self.manifest, fp=file, indent=4, sort_keys=True)
+
+
+### FUNCTIONS
+
+def use_headless_backend():
+    """
+    Function switches Matplotlib to the non-interactive backend,
+    so rendering never opens windows or blocks on display.
+    """
+    import matplotlib
+
+    matplotlib.use(HEADLESS_BACKEND, force=True)
+
+
+def render_figure(spec: FigureSpec) -> Any:
+    """
+    Function renders one figure spec.
+    Returns the result of the spec function.
+    """
+    return spec.func(*spec.args, **spec.kwargs)
+
+
+def render_figures(
+    specs: list[FigureSpec],
+    n_jobs: int = -1,
+    cache: FigureCache | None = None
+) -> list[Any]:
+    """
+    Function renders figure specs on the headless backend, in a pool
+    of n_jobs worker processes (-1 uses all cores). Plotting is
+    CPU-bound Python, so processes scale where threads would not.
+    With one worker or one spec figures are rendered in this process.
+    With a cache, specs whose figure is in the manifest are skipped
+    and the manifest is updated.
+    Returns results of the specs in spec order, paths of skipped ones.
+    """
+    results: list[Any] = [None] * len(specs)
+    pending: list[int] = list(range(len(specs)))
+    keys: list[str | None] = [None] * len(specs)
+    if cache is not None:
+        cache.rendered = []
+        cache.copied = []
+        pending = []
+        for ind, spec in enumerate(specs):
+            path: str | None = spec.kwargs.get("path")
+            keys[ind] = spec.get_key()
+            if path is not None and cache.reuse(key=keys[ind], path=path):
+                results[ind] = path
+            else:
+                pending.append(ind)
+
+    workers: int = min(
+        (os.cpu_count() or 1) if n_jobs == -1 else n_jobs, len(pending)
+    )
+    if workers <= 1:
+        if pending:
+            use_headless_backend()
+        rendered: list[Any] = [
+            render_figure(spec=specs[ind]) for ind in pending
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=use_headless_backend
+        ) as executor:
+            rendered = list(
+                executor.map(render_figure, [specs[ind] for ind in pending])
+            )
+
+    for ind, result in zip(pending, rendered):
+        results[ind] = result
+        path = specs[ind].kwargs.get("path")
+        if cache is not None and path is not None:
+            cache.record(key=keys[ind], path=path)
+            cache.rendered.append(path)
+    if cache is not None:
+        cache.save()
+
+    return results
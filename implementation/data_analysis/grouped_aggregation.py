@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+# Statistics from bincount moments (one pass over integer codes)
+# and order statistics (one sort of codes and values per measure).
+MOMENT_STATISTICS: tuple[str, ...] = ("size", "count", "sum", "mean", "std")
+ORDER_STATISTICS: tuple[str, ...] = ("min", "median", "max")
+# Rows aggregated per block, memory is a few (measures, block rows) arrays.
+AGGREGATION_CHUNK_SIZE: int = 1 << 20
+
+
+### FUNCTIONS
+
+def encode_keys(
+    data: pd.DataFrame, keys: list[str]
+) -> tuple[NDArray[np.int64], pd.DataFrame]:
+    """
+    Function factorizes every key column once into sorted integer codes
+    and shifts them by the number of groups of previous keys, so groups
+    of all keys are numbered 0..groups - 1 together. Missing keys
+    are -1 (dropped like in groupby).
+    Returns (keys, rows) codes and a table of key and group per code.
+    """
+    codes: NDArray[np.int64] = np.empty(
+        shape=(len(keys), len(data)), dtype=np.int64
+    )
+    groups: list[pd.DataFrame] = []
+    offset: int = 0
+    for row, key in enumerate(keys):
+        key_codes, labels = pd.factorize(values=data[key], sort=True)
+        codes[row] = np.where(key_codes >= 0, key_codes + offset, -1)
+        groups.append(pd.DataFrame(data={"key": key, "group": labels}))
+        offset += len(labels)
+
+    return codes, pd.concat(objs=groups, ignore_index=True)
+
+
+def segment_order_statistics(
+    codes: NDArray[np.int64],
+    values: NDArray[np.float64],
+    n_groups: int
+) -> dict[str, NDArray[np.float64]]:
+    """
+    Function sorts values by group code and value once and reads
+    minimum, median and maximum of every group from segment bounds.
+    Codes and values must not contain missing entries.
+    Returns a dictionary of (groups,) arrays by statistic, NaN for
+    empty groups.
+    """
+    order: NDArray[np.int64] = np.lexsort(keys=(values, codes))
+    sorted_values: NDArray[np.float64] = values[order]
+    counts: NDArray[np.int64] = np.bincount(codes, minlength=n_groups)
+    ends: NDArray[np.int64] = np.cumsum(counts)
+    starts: NDArray[np.int64] = ends - counts
+    present: NDArray[np.bool_] = counts > 0
+
+    statistics: dict[str, NDArray[np.float64]] = {
+        name: np.full(shape=n_groups, fill_value=np.nan)
+        for name in ORDER_STATISTICS
+    }
+    statistics["min"][present] = sorted_values[starts[present]]
+    statistics["max"][present] = sorted_values[ends[present] - 1]
+    lower: NDArray[np.int64] = starts + (counts - 1) // 2
+    upper: NDArray[np.int64] = starts + counts // 2
+    statistics["median"][present] = (
+        sorted_values[lower[present]] + sorted_values[upper[present]]
+    ) / 2.0
+
+    return statistics
+
+
+def accumulate_group_moments(
+    codes: NDArray[np.int64],
+    n_groups: int,
+    values: NDArray[np.float64],
+    shifts: NDArray[np.float64],
+    squares: bool = True,
+    chunk_size: int = AGGREGATION_CHUNK_SIZE
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Function accumulates group moments of (measures, rows) values
+    shifted by per-measure shifts with bincounts of (keys, rows)
+    group codes (see encode_keys) over blocks of rows. Missing
+    values are skipped, sums of squares are left 0 without squares.
+    Returns (groups,) row counts and (3, measures, groups) counts,
+    sums and sums of squares of values.
+    """
+    has_missing_keys: NDArray[np.bool_] = np.any(codes < 0, axis=1)
+    sizes: NDArray[np.float64] = np.zeros(shape=n_groups, dtype=np.float64)
+    moments: NDArray[np.float64] = np.zeros(
+        shape=(3, len(values), n_groups), dtype=np.float64
+    )
+    for start in range(0, codes.shape[1], chunk_size):
+        block_values: NDArray[np.float64] = (
+            values[:, start:start + chunk_size] - shifts[:, np.newaxis]
+        )
+        valid: NDArray[np.bool_] = ~np.isnan(block_values)
+        block_values[~valid] = 0.0
+        block_moments: list[NDArray[np.float64]] = [
+            valid.astype(np.float64), block_values
+        ]
+        if squares:
+            block_moments.append(block_values * block_values)
+        for key_row in range(len(codes)):
+            key_codes: NDArray[np.int64] = codes[
+                key_row, start:start + chunk_size
+            ]
+            rows: slice | NDArray[np.bool_] = slice(None)
+            if has_missing_keys[key_row]:
+                rows = key_codes >= 0
+                key_codes = key_codes[rows]
+            sizes += np.bincount(key_codes, minlength=n_groups)
+            for moment, moment_values in enumerate(block_moments):
+                for column in range(len(values)):
+                    moments[moment, column] += np.bincount(
+                        key_codes,
+                        weights=moment_values[column, rows],
+                        minlength=n_groups
+                    )
+
+    return sizes, moments
+
+
+def aggregate_groups(
+    data: pd.DataFrame,
+    keys: list[str],
+    measures: list[str],
+    statistics: tuple[str, ...] = ("count", "mean"),
+    chunk_size: int = AGGREGATION_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Function aggregates every measure by every key. Keys are hashed
+    once (see encode_keys), then counts, sums and sums of squares
+    of all keys are accumulated with bincounts of integer codes over
+    blocks of rows (see accumulate_group_moments). size counts rows
+    of a group, count, sum, mean and std (ddof=1) skip missing values
+    like pandas. Order statistics
+    (min, median, max) add one sort per key and measure.
+    Returns a tidy dataframe with a row per key, group and measure
+    and a column per statistic.
+    """
+    unknown: set[str] = set(statistics) - set(
+        MOMENT_STATISTICS + ORDER_STATISTICS
+    )
+    if unknown:
+        raise ValueError(
+            f"Unknown statistics {sorted(unknown)}, expected some of "
+            f"{MOMENT_STATISTICS + ORDER_STATISTICS}."
+        )
+
+    codes, groups = encode_keys(data=data, keys=keys)
+    n_groups: int = len(groups)
+    # (measures, rows), so every measure is contiguous.
+    values: NDArray[np.float64] = np.ascontiguousarray(
+        data[measures].to_numpy(dtype=np.float64, na_value=np.nan).T
+    )
+    # Moments are accumulated around measure means for a stable std.
+    shifts: NDArray[np.float64] = np.zeros(shape=len(measures))
+    if values.shape[1]:
+        shifts = np.nan_to_num(np.nanmean(values, axis=1))
+    sizes, moments = accumulate_group_moments(
+        codes=codes,
+        n_groups=n_groups,
+        values=values,
+        shifts=shifts,
+        squares="std" in statistics,
+        chunk_size=chunk_size
+    )
+
+    table: list[pd.DataFrame] = []
+    for column, measure in enumerate(measures):
+        counts, sums, squares = moments[:, column]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means: NDArray[np.float64] = sums / counts
+            variances: NDArray[np.float64] = (
+                squares - counts * means * means
+            ) / (counts - 1)
+        measure_table: pd.DataFrame = groups.copy()
+        measure_table["measure"] = measure
+        columns: dict[str, NDArray] = {
+            "size": sizes.astype(np.int64),
+            "count": counts.astype(np.int64),
+            "sum": sums + counts * shifts[column],
+            "mean": means + shifts[column],
+            "std": np.sqrt(np.maximum(variances, 0.0))
+        }
+        if set(statistics) & set(ORDER_STATISTICS):
+            columns.update(
+                dict.fromkeys(
+                    ORDER_STATISTICS,
+                    np.full(shape=n_groups, fill_value=np.nan)
+                )
+            )
+            for key_row in range(len(keys)):
+                present: NDArray[np.bool_] = (codes[key_row] >= 0) & ~np.isnan(
+                    values[column]
+                )
+                order_statistics: dict[str, NDArray[np.float64]] = (
+                    segment_order_statistics(
+                        codes=codes[key_row, present],
+                        values=values[column, present],
+                        n_groups=n_groups
+                    )
+                )
+                key_groups: NDArray[np.bool_] = (
+                    groups["key"] == keys[key_row]
+                ).to_numpy()
+                for name in ORDER_STATISTICS:
+                    columns[name] = np.where(
+                        key_groups, order_statistics[name], columns[name]
+                    )
+        for name in statistics:
+            measure_table[name] = columns[name]
+        table.append(measure_table)
+
+    return pd.concat(objs=table, ignore_index=True)
+
+
+def get_group_table(
+    table: pd.DataFrame,
+    key: str,
+    measure: str,
+    statistic: str = "mean",
+    ascending: bool = False,
+    top: int | None = None
+) -> pd.DataFrame:
+    """
+    Function reads one key and measure from a tidy aggregate table
+    (of aggregate_groups or AggregateState.get_table), sorted by
+    a statistic, optionally only top groups.
+    Returns a dataframe with the key and measure columns
+    (like groupby(key)[measure].statistic().sort_values().reset_index()).
+    """
+    rows: pd.DataFrame = table[
+        (table["key"] == key) & (table["measure"] == measure)
+    ]
+    group_table: pd.DataFrame = pd.DataFrame(
+        data={
+            key: rows["group"].to_numpy(),
+            measure: rows[statistic].to_numpy()
+        }
+    ).sort_values(by=measure, ascending=ascending, ignore_index=True)
+
+    return group_table if top is None else group_table.head(top)
@@ -0,0 +1,399 @@
+import json
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from implementation.data_analysis.column_profiler import to_json_value
+from implementation.data_analysis.grouped_aggregation import (
+    accumulate_group_moments,
+    encode_keys
+)
+from implementation.data_analysis.streaming_statistics import MomentState
+
+
+# Moments kept per group and measure: count, sum and sum of squares
+# of values shifted by the measure shift (see AggregateState).
+GROUP_MOMENTS: tuple[str, ...] = ("count", "sum", "squares")
+STATE_STATISTICS: tuple[str, ...] = ("size", "count", "sum", "mean", "std")
+
+
+### CLASS
+
+class AggregateState:
+    """
+    Mergeable summary of a table: row count of every group of every key,
+    count, sum and sum of squares of every measure per group and
+    pairwise moments of the correlation columns (see MomentState).
+    Measures are shifted by fixed per-column shifts (means of the first
+    appended rows) for a stable std. Every part is a sum over rows or
+    a mergeable moment, so appending or retracting rows costs time
+    proportional to them.
+    The state records the version of the table it summarizes and
+    the position in the change log (see write_changes) it has read to.
+    """
+
+    def __init__(
+        self,
+        keys: list[str],
+        measures: list[str],
+        correlation_columns: list[str]
+    ):
+        self.keys: list[str] = keys
+        self.measures: list[str] = measures
+        self.correlation_columns: list[str] = correlation_columns
+        self.shifts: NDArray[np.float64] | None = None
+        # (key, group) of every group row of the arrays.
+        self.groups: list[tuple[str, Any]] = []
+        self.group_rows: dict[tuple[str, Any], int] = {}
+        self.sizes: NDArray[np.float64] = np.zeros(shape=0)
+        self.moments: NDArray[np.float64] = np.zeros(
+            shape=(len(GROUP_MOMENTS), len(measures), 0)
+        )
+        self.correlation: MomentState = MomentState(
+            columns=correlation_columns
+        )
+        self.rows: int = 0
+        # Version of the summarized table and byte offset of
+        # the first change log record not applied yet.
+        self.version: str | None = None
+        self.log_position: int = 0
+
+    def get_columns(self) -> list[str]:
+        """
+        Method lists columns the state reads.
+        Returns the column names.
+        """
+        return list(
+            dict.fromkeys(self.keys + self.measures + self.correlation_columns)
+        )
+
+    def get_group_rows(
+        self, key: str, labels: pd.Series
+    ) -> NDArray[np.int64]:
+        """
+        Method finds rows of groups of a key, new groups get empty rows.
+        Returns an array of row numbers by label.
+        """
+        new_groups: list[tuple[str, Any]] = [
+            (key, label) for label in labels
+            if (key, label) not in self.group_rows
+        ]
+        if new_groups:
+            for group in new_groups:
+                self.group_rows[group] = len(self.groups)
+                self.groups.append(group)
+            self.sizes = np.concatenate(
+                [self.sizes, np.zeros(shape=len(new_groups))]
+            )
+            self.moments = np.concatenate(
+                [
+                    self.moments,
+                    np.zeros(
+                        shape=(
+                            len(GROUP_MOMENTS),
+                            len(self.measures),
+                            len(new_groups)
+                        )
+                    )
+                ],
+                axis=2
+            )
+
+        return np.array(
+            [self.group_rows[(key, label)] for label in labels], dtype=np.int64
+        )
+
+    def update(self, data: pd.DataFrame, sign: int):
+        """
+        Method adds (sign 1) or subtracts (sign -1) moments of rows,
+        accumulated per group like in aggregate_groups (see
+        accumulate_group_moments). Subtracted rows must have been
+        added before.
+        """
+        if not len(data):
+            return
+        if self.shifts is None:
+            self.shifts = np.nan_to_num(
+                data[self.measures].mean().to_numpy(dtype=np.float64)
+            )
+
+        codes, groups = encode_keys(data=data, keys=self.keys)
+        sizes, group_moments = accumulate_group_moments(
+            codes=codes,
+            n_groups=len(groups),
+            values=data[self.measures].to_numpy(
+                dtype=np.float64, na_value=np.nan
+            ).T,
+            shifts=self.shifts
+        )
+        # Groups are numbered key by key (see encode_keys).
+        rows: NDArray[np.int64] = np.concatenate([
+            self.get_group_rows(
+                key=key, labels=groups.loc[groups["key"] == key, "group"]
+            )
+            for key in self.keys
+        ] or [np.zeros(shape=0, dtype=np.int64)])
+
+        if sign < 0 and np.any(self.sizes[rows] < sizes):
+            raise ValueError("Retracted rows were not appended.")
+        self.sizes[rows] += sign * sizes
+        self.moments[:, :, rows] += sign * group_moments
+
+        self.correlation.combine(
+            other=MomentState.from_frame(
+                data=data, columns=self.correlation_columns
+            ),
+            sign=sign
+        )
+
+        self.rows += sign * len(data)
+
+    def append(self, data: pd.DataFrame):
+        """
+        Method adds rows to the state.
+        """
+        self.update(data=data, sign=1)
+
+    def retract(self, data: pd.DataFrame):
+        """
+        Method removes previously appended rows from the state.
+        """
+        self.update(data=data, sign=-1)
+
+    def get_table(
+        self, statistics: tuple[str, ...] = STATE_STATISTICS
+    ) -> pd.DataFrame:
+        """
+        Method reads statistics of every measure by every key,
+        groups without rows are left out.
+        Returns a tidy dataframe like aggregate_groups (see
+        get_group_table): a row per key, group and measure and a column
+        per statistic.
+        """
+        unknown: set[str] = set(statistics) - set(STATE_STATISTICS)
+        if unknown:
+            raise ValueError(
+                f"Unknown statistics {sorted(unknown)}, expected some of "
+                f"{STATE_STATISTICS}."
+            )
+
+        groups: pd.DataFrame = pd.DataFrame(
+            data=self.groups, columns=["key", "group"]
+        )
+        groups["row"] = np.arange(len(groups))
+        groups = groups[self.sizes > 0.5]
+        groups = pd.concat(
+            objs=[
+                groups[groups["key"] == key].sort_values(by="group")
+                for key in self.keys
+            ] or [groups],
+            ignore_index=True
+        )
+        rows: NDArray[np.int64] = groups.pop("row").to_numpy(dtype=np.int64)
+
+        table: list[pd.DataFrame] = []
+        for column, measure in enumerate(self.measures):
+            counts, sums, squares = self.moments[:, column, rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                means: NDArray[np.float64] = sums / counts
+                variances: NDArray[np.float64] = (
+                    squares - counts * means * means
+                ) / (counts - 1)
+            columns: dict[str, NDArray] = {
+                "size": np.round(self.sizes[rows]).astype(np.int64),
+                "count": np.round(counts).astype(np.int64),
+                "sum": sums + counts * self.shifts[column],
+                "mean": means + self.shifts[column],
+                "std": np.sqrt(np.maximum(variances, 0.0))
+            }
+            measure_table: pd.DataFrame = groups.copy()
+            measure_table["measure"] = measure
+            for name in statistics:
+                measure_table[name] = columns[name]
+            table.append(measure_table)
+
+        return pd.concat(objs=table, ignore_index=True)
+
+    def get_correlation(self) -> pd.DataFrame:
+        """
+        Method calculates Pearson correlations of the correlation
+        columns over pairwise complete rows.
+        Returns a correlation matrix like DataFrame.corr().
+        """
+        return self.correlation.get_correlation()
+
+    def save(self, path: str):
+        """
+        Method writes the state as JSON.
+        """
+        state: dict[str, Any] = {
+            "keys": self.keys,
+            "measures": self.measures,
+            "correlation_columns": self.correlation_columns,
+            "shifts": None if self.shifts is None else self.shifts.tolist(),
+            "groups": [
+                [key, to_json_value(value=label)] for key, label in self.groups
+            ],
+            "sizes": self.sizes.tolist(),
+            "moments": self.moments.tolist(),
+            "correlation": self.correlation.to_dict(),
+            "rows": self.rows,
+            "version": self.version,
+            "log_position": self.log_position
+        }
+        with open(file=path, mode="w", encoding="utf-8") as file:
+            json.dump(obj=state, fp=file)
+
+
+### FUNCTIONS
+
+def read_aggregate_state(path: str) -> AggregateState:
+    """
+    Function reads a state written by AggregateState.save.
+    Returns the state.
+    """
+    with open(file=path, mode="r", encoding="utf-8") as file:
+        saved: dict[str, Any] = json.load(fp=file)
+
+    state: AggregateState = AggregateState(
+        keys=saved["keys"],
+        measures=saved["measures"],
+        correlation_columns=saved["correlation_columns"]
+    )
+    if saved["shifts"] is not None:
+        state.shifts = np.array(saved["shifts"], dtype=np.float64)
+    state.groups = [(key, label) for key, label in saved["groups"]]
+    state.group_rows = {group: row for row, group in enumerate(state.groups)}
+    state.sizes = np.array(saved["sizes"], dtype=np.float64)
+    state.moments = np.array(saved["moments"], dtype=np.float64).reshape(
+        len(GROUP_MOMENTS), len(state.measures), len(state.groups)
+    )
+    state.correlation = MomentState.from_dict(saved=saved["correlation"])
+    state.rows = saved["rows"]
+    # States saved without a version are rebuilt on the next sync.
+    state.version = saved.get("version")
+    state.log_position = saved.get("log_position", 0)
+
+    return state
+
+
+def write_changes(
+    path: str,
+    appended: pd.DataFrame | None = None,
+    retracted: pd.DataFrame | None = None
+):
+    """
+    Function appends changed rows of a table to its change log,
+    JSON lines of {"change": "retract" or "append", "row": values}.
+    Whoever changes the table logs the rows it retracts (before
+    the change) and appends, so states of the table can be updated
+    from the changes only (see sync_aggregate_state).
+    """
+    with open(file=path, mode="a", encoding="utf-8") as file:
+        for change, rows in [("retract", retracted), ("append", appended)]:
+            if rows is None:
+                continue
+            for values in rows.itertuples(index=False, name=None):
+                record: dict[str, Any] = {
+                    "change": change,
+                    "row": {
+                        column: None if pd.isna(value)
+                        else to_json_value(value=value)
+                        for column, value in zip(rows.columns, values)
+                    }
+                }
+                file.write(json.dumps(obj=record) + "\n")
+
+
+def read_changes(
+    path: str, position: int = 0
+) -> tuple[list[tuple[int, pd.DataFrame]], int]:
+    """
+    Function reads change log records from a byte offset on, so
+    only changes logged since are read. Consecutive records of one
+    change make one batch.
+    Returns batches of rows with their sign (1 appended, -1 retracted)
+    in log order and the offset after the last record.
+    """
+    batches: list[tuple[int, pd.DataFrame]] = []
+    with open(file=path, mode="rb") as file:
+        file.seek(position)
+        records: list[dict[str, Any]] = [
+            json.loads(line) for line in file if line.strip()
+        ]
+        position = file.tell()
+
+    start: int = 0
+    for end in range(1, len(records) + 1):
+        if (
+            end == len(records)
+            or records[end]["change"] != records[start]["change"]
+        ):
+            batches.append(
+                (
+                    1 if records[start]["change"] == "append" else -1,
+                    pd.DataFrame(
+                        data=[record["row"] for record in records[start:end]]
+                    )
+                )
+            )
+            start = end
+
+    return batches, position
+
+
+def sync_aggregate_state(
+    state: AggregateState | None,
+    current: pd.DataFrame,
+    version: str,
+    keys: list[str],
+    measures: list[str],
+    correlation_columns: list[str],
+    changes_path: str | None = None
+) -> AggregateState:
+    """
+    Function brings a state to the version of a table: changes logged
+    since the state was synced (see write_changes) are retracted and
+    appended, so the update costs time proportional to them, current
+    is not scanned. The state is rebuilt from current if it is
+    missing, has other columns, the table changed without logged
+    changes, the log was truncated, a retracted row was not appended
+    or the row count does not match current.
+    Returns the updated state.
+    """
+    log_size: int = (
+        os.path.getsize(changes_path)
+        if changes_path is not None and os.path.exists(changes_path)
+        else 0
+    )
+    if (
+        state is not None
+        and state.version is not None
+        and [state.keys, state.measures, state.correlation_columns]
+        == [keys, measures, correlation_columns]
+        and state.log_position <= log_size
+        and (state.version == version or state.log_position < log_size)
+    ):
+        try:
+            if state.log_position < log_size:
+                batches, state.log_position = read_changes(
+                    path=changes_path, position=state.log_position
+                )
+                for sign, batch in batches:
+                    state.update(data=batch, sign=sign)
+            if state.rows == len(current):
+                state.version = version
+                return state
+        except (KeyError, ValueError):
+            pass
+
+    state = AggregateState(
+        keys=keys, measures=measures, correlation_columns=correlation_columns
+    )
+    state.append(data=current)
+    state.version = version
+    state.log_position = log_size
+
+    return state
@@ -0,0 +1,123 @@
+import os
+import tempfile
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from numpy.typing import DTypeLike, NDArray
+
+
+# Rows per block streamed through the distance and update passes.
+DEFAULT_CHUNK_SIZE: int = 65536
+# Max elements of a point-to-centroid distance matrix.
+DISTANCE_BLOCK_SIZE: int = 2**22
+# Automatic de-duplication is used when unique rows make up
+# no more than this share of all rows.
+DEDUPLICATE_RATIO: float = 0.5
+
+
+### FUNCTIONS
+
+def spool_chunks(
+    chunks: Iterable[pd.DataFrame | NDArray], dtype: DTypeLike
+) -> np.memmap:
+    """
+    Function writes chunks of a chunked reader (e.g. pd.read_csv with
+    chunksize) one by one to a temporary file in the compute dtype.
+    Only one chunk is held in memory at a time.
+    Returns the written rows as a read-only memory-mapped 2D array.
+    """
+    dtype = np.dtype(dtype)
+    # Temporary file is removed by OS as soon as the map is released.
+    spool_file = tempfile.TemporaryFile(suffix=".bin")
+    rows: int = 0
+    columns: int | None = None
+    for chunk in chunks:
+        block: NDArray = np.asarray(chunk, dtype=dtype)
+        if block.ndim == 1:
+            block = block.reshape(-1, 1)
+        if columns is None:
+            columns = block.shape[1]
+        elif block.shape[1] != columns:
+            raise ValueError(
+                f"Chunk has {block.shape[1]} columns, expected {columns}."
+            )
+        spool_file.write(np.ascontiguousarray(block).tobytes())
+        rows += block.shape[0]
+
+    if not rows:
+        raise ValueError("Chunked reader returned no rows.")
+    spool_file.flush()
+
+    return np.memmap(
+        filename=spool_file, dtype=dtype, mode="r", shape=(rows, columns)
+    )
+
+
+def load_kmeans_data(source: Any, dtype: DTypeLike = np.float64) -> NDArray:
+    """
+    Function converts a KMeans data source to a 2D array.
+    Supported sources:
+        - pandas DataFrame or NumPy array - converted to the compute
+            dtype in memory;
+        - np.memmap - used as is, blocks are cast while streaming;
+        - path to a .npy file - opened memory-mapped;
+        - chunked reader (iterable of DataFrames or arrays) - spooled
+            to a temporary memory-mapped file.
+    Returns an in-memory or memory-mapped 2D array.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not os.fspath(source).endswith(".npy"):
+            raise ValueError(f"Unsupported data file: {source}")
+        data: NDArray = np.load(file=source, mmap_mode="r")
+    elif isinstance(source, np.memmap):
+        data = source
+    elif isinstance(source, (pd.DataFrame, pd.Series, np.ndarray, list)):
+        data = np.asarray(source, dtype=dtype)
+    elif isinstance(source, Iterable):
+        data = spool_chunks(chunks=source, dtype=dtype)
+    else:
+        raise TypeError(f"Unsupported data source: {type(source)}")
+
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+
+    return data
+
+
+def deduplicate_rows(
+    data: NDArray, sample_weight: NDArray[np.float64] | None = None
+) -> tuple[NDArray, NDArray[np.float64], NDArray[np.int64]]:
+    """
+    Function collapses identical data rows into unique points.
+    Weight of a unique point is the sum of its rows' sample weights
+    (the number of its rows if sample weights are not given).
+    Returns unique points, their weights and indexes of the unique point
+    of every original row.
+    """
+    unique_points, inverse, counts = np.unique(
+        np.asarray(data), axis=0, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    if sample_weight is None:
+        weights: NDArray[np.float64] = counts.astype(np.float64)
+    else:
+        weights = np.bincount(
+            inverse, weights=sample_weight, minlength=len(unique_points)
+        )
+
+    return unique_points, weights, inverse
+
+
+def iterate_blocks(
+    data: NDArray, chunk_size: int, dtype: DTypeLike
+) -> Iterator[tuple[int, NDArray]]:
+    """
+    Function iterates through data in row blocks of chunk_size.
+    Memory-mapped blocks are read from disk only when yielded.
+    Yields a block start row and the block in the compute dtype.
+    """
+    for start in range(0, len(data), chunk_size):
+        yield start, np.asarray(
+            data[start:start + chunk_size], dtype=dtype
+        )
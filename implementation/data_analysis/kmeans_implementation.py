@@ -1,43 +1,179 @@
 import logging
 import pandas as pd
 import numpy as np
-import matplotlib.pylab as plt
-import seaborn as sns
-from mpl_toolkits.mplot3d import Axes3D
-from numpy.typing import NDArray
-
-
-error_logger: logging.Logger = logging.getLogger("debug_logger")
-error_logger.setLevel(logging.WARNING)
-error_handler: logging.FileHandler = logging.FileHandler(
-    filename="error_logger.log", mode="w"
+from numpy.typing import DTypeLike, NDArray
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+from implementation.data_analysis.cluster_metrics import (
+    calinski_harabasz,
+    davies_bouldin,
+    silhouette
+)
+from implementation.data_analysis.data_store import find_table, read_table
+from implementation.data_analysis.distance_metrics import (
+    DistanceMetric,
+    get_metric
+)
+from implementation.data_analysis.figure_rendering import (
+    FigureCache,
+    FigureSpec,
+    render_figures
+)
+from implementation.data_analysis.kmeans_data import (
+    DEDUPLICATE_RATIO,
+    DEFAULT_CHUNK_SIZE,
+    DISTANCE_BLOCK_SIZE,
+    deduplicate_rows,
+    load_kmeans_data
 )
-error_formatter = logging.Formatter(
-    fmt="%(name)s %(asctime)s %(message)s\nLine: %(lineno)s"
+from implementation.data_analysis.kmeans_kdtree import (
+    KDTREE_MAX_FEATURES,
+    KDTREE_MIN_K,
+    KDTree
 )
-error_handler.setFormatter(fmt=error_formatter)
-error_logger.addHandler(hdlr=error_handler)
+from implementation.data_analysis.large_data_plotting import sample_clusters
 
+
+# Handlers are attached by setup_logging, importing the module
+# does not create log files.
+error_logger: logging.Logger = logging.getLogger("debug_logger")
 debug_logger: logging.Logger = logging.getLogger("debug_logger")
-debug_logger.setLevel(logging.DEBUG)
-debug_handler: logging.FileHandler = logging.FileHandler(
-    filename="debug_logger.log", mode="w"
-)
-debug_formatter = logging.Formatter(fmt="%(name)s %(asctime)s %(message)s\nLine: %(lineno)s")
-debug_handler.setFormatter(fmt=debug_formatter)
-debug_logger.addHandler(hdlr=debug_handler)
+
+
+# Centroid initialization algorithms.
+INIT_METHODS: tuple[str, ...] = ("k-means++", "k-means||")
+# Assignment algorithms.
+ALGORITHMS: tuple[str, ...] = ("auto", "brute", "kdtree")
 
 
 ### CLASS
 
 class KMeans:
-    
-    def __init__(self, data: pd.DataFrame | NDArray, k: int):
-        self.data: NDArray = np.asarray(data)
+
+    def __init__(
+        self,
+        data: pd.DataFrame | NDArray | str | Iterable,
+        k: int,
+        dtype: DTypeLike = np.float64,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        sample_weight: NDArray | None = None,
+        deduplicate: bool | str = False,
+        seed: int | None = None,
+        init: str = "k-means++",
+        n_jobs: int = 1,
+        shift: NDArray[np.float64] | None = None,
+        algorithm: str = "auto",
+        metric: str | DistanceMetric = "euclidean"
+    ):
+        if init not in INIT_METHODS:
+            raise ValueError(
+                f"Unknown init {init}, expected one of {INIT_METHODS}."
+            )
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown algorithm {algorithm}, expected one of {ALGORITHMS}."
+            )
+        # Metric kernel and centroid update rule, see distance_metrics.
+        self.metric: DistanceMetric = get_metric(metric=metric)
+        if algorithm == "kdtree" and self.metric.name != "euclidean":
+            raise ValueError("Kd-tree assignment needs euclidean metric.")
+        # Compute dtype of distance passes. Centroids, distances and sums
+        # are always accumulated in float64.
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.data: NDArray = load_kmeans_data(source=data, dtype=self.dtype)
+        self.sample_weight: NDArray[np.float64] | None = None
+        if sample_weight is not None:
+            self.sample_weight = np.asarray(sample_weight, dtype=np.float64)
+            if self.sample_weight.shape != (len(self.data),):
+                raise ValueError(
+                    "sample_weight must have one weight per data row."
+                )
+            if np.any(self.sample_weight < 0):
+                raise ValueError("sample_weight must be non-negative.")
+        # Index of the unique point of every original row,
+        # None if rows are not de-duplicated.
+        self.inverse: NDArray[np.int64] | None = None
+        if deduplicate:
+            self.deduplicate(auto=deduplicate == "auto")
         self.k = k
+        self.chunk_size: int = chunk_size
+        # Threads processing data blocks, -1 uses all cores.
+        self.n_jobs: int = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self.seed: int | None = seed
+        self.init: str = init
+        self.algorithm: str = algorithm
+        # Kd-tree of the kdtree assignment, built on first use.
+        self.tree: KDTree | None = None
+        # Value orders of data columns for median updates,
+        # sorted on first use.
+        self.column_orders: NDArray[np.int64] | None = None
+        # Global NumPy generator is used if seed is not given.
+        self.random_state = (
+            np.random if seed is None else np.random.RandomState(seed=seed)
+        )
         self.clusters: dict[
             tuple[np.float64], list[NDArray[np.float64]]
         ] = {}
+        self.centroids: NDArray[np.float64] | None = None
+        self.labels: NDArray[np.int64] | None = None
+        self.inertia: np.float64 | None = None
+        # Column means the data is shifted by before the distance
+        # expansion, keeps squared norms small in float32.
+        # Calculated on first use if not given.
+        self.shift: NDArray[np.float64] | None = shift
+        # Per-iteration records of the last fit.
+        self.trace: list[dict[str, int | float]] = []
+        # Per-run records of the last get_best_result.
+        self.restarts: list[dict[str, int | float | bool]] = []
+
+    def deduplicate(self, auto: bool = False):
+        """
+        Method collapses identical data rows into unique points weighted
+        by their counts. In auto mode rows are collapsed only if
+        unique points make up no more than DEDUPLICATE_RATIO of rows.
+        Memory-mapped data is not collapsed in auto mode.
+        """
+        if auto and isinstance(self.data, np.memmap):
+            return
+
+        unique_points, weights, inverse = deduplicate_rows(
+            data=self.data, sample_weight=self.sample_weight
+        )
+        if auto and len(unique_points) > DEDUPLICATE_RATIO * len(self.data):
+            return
+
+        debug_logger.debug(
+            msg=f"Rows collapsed: {len(self.data)} -> {len(unique_points)}"
+        )
+        self.data = unique_points.astype(self.dtype, copy=False)
+        self.sample_weight = weights
+        self.inverse = inverse
+
+    def get_block_weights(
+        self, start: int, size: int
+    ) -> NDArray[np.float64] | None:
+        """
+        Method slices sample weights of a data block.
+        Returns None if points are not weighted.
+        """
+        if self.sample_weight is None:
+            return None
+
+        return self.sample_weight[start:start + size]
+
+    def get_labels(self) -> NDArray[np.int64]:
+        """
+        Method expands labels of unique points back to original rows.
+        Returns cluster labels of all original data rows.
+        """
+        if self.inverse is None:
+            return self.labels
+
+        return self.labels[self.inverse]
 
     @staticmethod
     def euclidean_distance(
@@ -48,408 +184,1329 @@ class KMeans:
         Method calculate Euclidean distance between two points.
         """
         return np.sqrt(np.sum(a=(data1 - data2)**2, axis=1))
-      
+
+    def map_blocks(self, func: Callable[[int, NDArray], Any]) -> list[Any]:
+        """
+        Method applies func(start, block) to every block of chunk_size
+        rows. With n_jobs > 1 blocks are read and processed by a thread
+        pool, NumPy kernels release the GIL while they run. Results keep
+        block order, so reductions over them do not depend on n_jobs.
+        Returns a list of func results.
+        """
+        process_block: Callable[[int], Any] = lambda start: func(
+            start,
+            np.asarray(
+                self.data[start:start + self.chunk_size], dtype=self.dtype
+            )
+        )
+        starts: range = range(0, len(self.data), self.chunk_size)
+        if self.n_jobs == 1 or len(starts) == 1:
+            return [process_block(start) for start in starts]
+
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            return list(executor.map(process_block, starts))
+
+    def get_shift(self) -> NDArray[np.float64]:
+        """
+        Method calculates data column means in one streaming pass.
+        Returns the column means as a float64 array.
+        """
+        if self.shift is None:
+            column_sums: NDArray[np.float64] = sum(
+                self.map_blocks(
+                    func=lambda start, block: np.sum(
+                        a=block, axis=0, dtype=np.float64
+                    )
+                )
+            )
+            self.shift = column_sums / len(self.data)
+
+        return self.shift
+
+    def block_squared_distances(
+        self,
+        block: NDArray,
+        centroids: NDArray[np.float64],
+        add_block_norms: bool = True
+    ) -> NDArray[np.float64]:
+        """
+        Method calculates squared Euclidean distances from a block of
+        points to all centroids using ||x||^2 - 2x*c + ||c||^2 expansion.
+        Points and centroids are shifted by column means first,
+        the dot products run in the compute dtype, the sum in float64.
+        Without block norms the result is only good for comparing
+        centroids of the same point.
+        Returns an array of shape (block rows, centroids).
+        """
+        shift: NDArray[np.float64] = self.get_shift()
+        shifted_block: NDArray = block - shift.astype(self.dtype)
+        shifted_centroids: NDArray = (centroids - shift).astype(self.dtype)
+
+        distances: NDArray[np.float64] = (
+            shifted_block @ shifted_centroids.T
+        ).astype(np.float64, copy=False)
+        distances *= -2.0
+        distances += np.einsum(
+            "ij,ij->i", shifted_centroids, shifted_centroids,
+            dtype=np.float64
+        )[np.newaxis, :]
+        if not add_block_norms:
+            return distances
+
+        distances += np.einsum(
+            "ij,ij->i", shifted_block, shifted_block, dtype=np.float64
+        )[:, np.newaxis]
+        # Rounding can make distances of coincident points negative.
+        return np.maximum(distances, 0.0, out=distances)
+
+    def closest_centroids(
+        self,
+        block: NDArray,
+        centroids: NDArray[np.float64]
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Method finds the closest centroid of every block point.
+        The block is split so that a distance matrix has no more than
+        DISTANCE_BLOCK_SIZE elements even for many centroids.
+        Euclidean block norms are added to the closest distances only,
+        other metrics run their kernels on the sub-blocks.
+        Returns labels and (squared for euclidean metric) distances
+        to the closest centroids.
+        """
+        rows: int = max(1, DISTANCE_BLOCK_SIZE // len(centroids))
+        labels: NDArray[np.int64] = np.empty(shape=len(block), dtype=np.int64)
+        min_distances: NDArray[np.float64] = np.empty(
+            shape=len(block), dtype=np.float64
+        )
+        shift: NDArray = self.get_shift().astype(self.dtype)
+        for start in range(0, len(block), rows):
+            sub_block: NDArray = block[start:start + rows]
+            if self.metric.name != "euclidean":
+                distances: NDArray[np.float64] = np.asarray(
+                    self.metric.kernel(sub_block, centroids), dtype=np.float64
+                )
+                labels[start:start + rows] = np.argmin(a=distances, axis=1)
+                min_distances[start:start + rows] = np.take_along_axis(
+                    distances, labels[start:start + rows, np.newaxis], axis=1
+                )[:, 0]
+                continue
+
+            distances = self.block_squared_distances(
+                block=sub_block, centroids=centroids, add_block_norms=False
+            )
+            labels[start:start + rows] = np.argmin(a=distances, axis=1)
+            shifted_block: NDArray = sub_block - shift
+            min_distances[start:start + rows] = np.maximum(
+                np.take_along_axis(
+                    distances, labels[start:start + rows, np.newaxis], axis=1
+                )[:, 0]
+                + np.einsum(
+                    "ij,ij->i", shifted_block, shifted_block,
+                    dtype=np.float64
+                ),
+                0.0
+            )
+
+        return labels, min_distances
+
+    def get_random_point(self) -> NDArray[np.float64]:
+        """
+        Method draws a data point, weighted points proportionally
+        to their weights.
+        Returns the point as a float64 array.
+        """
+        if self.sample_weight is None:
+            point_ind: int = self.random_state.randint(
+                low=0, high=len(self.data)
+            )
+        else:
+            point_ind = min(
+                int(
+                    np.searchsorted(
+                        a=np.cumsum(self.sample_weight),
+                        v=self.random_state.rand() * np.sum(self.sample_weight)
+                    )
+                ),
+                len(self.data) - 1
+            )
+
+        return np.array(object=self.data[point_ind], dtype=np.float64)
+
+    def initialize_centroids(self):
+        """
+        Method initializes centroids with the init algorithm.
+        """
+        if self.init == "k-means||":
+            self.kmeans_parallel()
+        else:
+            self.kmeans_plusplus()
+
     def kmeans_plusplus(self):
         """
         Method implements K-Means++ algorithm to initialize centroids.
+        Distances to the closest centroid are updated block by block
+        with the latest centroid only.
         Adds centorids to clusters dictionary.
         """
         # Initializing the first centroid.
-        random_centorid: NDArray[np.float64] = np.array(
-            object=self.data[
-                np.random.randint(
-                    low=0, high=len(self.data)
-                )
-            ],
-            dtype=np.float64
-        )
+        random_centorid: NDArray[np.float64] = self.get_random_point()
         centroids: list[NDArray[np.float64]] = [random_centorid]
+        min_distances: NDArray[np.float64] = np.full(
+            shape=len(self.data), fill_value=np.inf
+        )
+
+        def update_min_distances(start: int, block: NDArray):
+            block_distances: NDArray[np.float64] = self.closest_centroids(
+                block=block, centroids=centroids[-1][np.newaxis, :]
+            )[1]
+            # Blocks write to their own slices only.
+            np.minimum(
+                min_distances[start:start + len(block)],
+                np.sqrt(block_distances) if self.metric.squared
+                else block_distances,
+                out=min_distances[start:start + len(block)]
+            )
 
         for _ in range(self.k - 1):
-            # Calculating distances from all centroids to data points
-            distances: NDArray = [
-                (
-                    self.euclidean_distance(
-                        data1=centroids[ind],
-                        data2=self.data
-                    )
-                ) for ind in range(len(centroids))
-            ]
-            
-            min_distances: NDArray = np.min(a=np.asarray(distances), axis=0)
+            # Calculating distances from the latest centroid to data points
+            self.map_blocks(func=update_min_distances)
             debug_logger.debug(
-                msg=f"Min distances: {min_distances}"
-            )
-        
-            next_centroid_probabilities: NDArray[np.float64] = (
-                min_distances / np.sum(min_distances)
+                msg=f"Sum of min distances: {np.sum(min_distances)}"
             )
 
-            # Sorted positions of probabilities' indexes
-            sorted_probabilities_inds: NDArray[np.int64] = np.argsort(
-                next_centroid_probabilities
-            )
-            debug_logger.debug(
-                msg=f"sorted probabilities' indexes: {sorted_probabilities_inds}"
+            weighted_distances: NDArray[np.float64] = (
+                min_distances if self.sample_weight is None
+                else min_distances * self.sample_weight
             )
-            
-            sorted_probabilities: NDArray[np.float64] = (
-                next_centroid_probabilities[sorted_probabilities_inds]
+            next_centroid_probabilities: NDArray[np.float64] = (
+                weighted_distances / np.sum(weighted_distances)
             )
             cumulative_probabilities: NDArray[np.float64] = (
-                np.cumsum(sorted_probabilities)
+                np.cumsum(next_centroid_probabilities)
             )
-            
-            random_n: float = np.random.rand()
-            # Points have the same indexes as their probabilities since
-            # order has not changed.
-            ind_of_point_ind: int = (
-                np.searchsorted(a=cumulative_probabilities, v=random_n)
-            ) # index of a point's index
-            next_centroid: NDArray[np.float64] = self.data[
-                sorted_probabilities_inds[ind_of_point_ind]
-            ]
-            
+
+            random_n: float = self.random_state.rand()
+            next_centroid_ind: int = min(
+                int(np.searchsorted(a=cumulative_probabilities, v=random_n)),
+                len(self.data) - 1
+            )
+            next_centroid: NDArray[np.float64] = np.array(
+                object=self.data[next_centroid_ind], dtype=np.float64
+            )
+
             centroids.append(next_centroid)
-        
+
         debug_logger.debug(msg=f"List of centroids: {centroids}")
 
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.clusters = {}
         for centroid in centroids:
             # NDArray unhashable object
             self.clusters[tuple(centroid)] = []
 
+    def kmeans_parallel(self, rounds: int = 5, oversampling: float = 2.0):
+        """
+        Method implements scalable K-Means|| algorithm to initialize
+        centroids. In every round each point is sampled independently
+        with probability oversampling * k * D^2 / cost, so a round takes
+        a pass over data blocks instead of a pass per centroid.
+        Candidates weighted by their closest points are reclustered
+        to k centroids with weighted K-Means.
+        Adds centorids to clusters dictionary.
+        """
+        candidates: list[NDArray[np.float64]] = [self.get_random_point()]
+        new_candidates: NDArray[np.float64] = np.asarray(candidates)
+        min_distances: NDArray[np.float64] = np.full(
+            shape=len(self.data), fill_value=np.inf
+        )
+
+        def update_min_distances(start: int, block: NDArray) -> float:
+            block_distances: NDArray[np.float64] = (
+                min_distances[start:start + len(block)]
+            )
+            np.minimum(
+                block_distances,
+                self.closest_centroids(
+                    block=block, centroids=new_candidates
+                )[1],
+                out=block_distances
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            return np.sum(
+                block_distances if block_weights is None
+                else block_distances * block_weights
+            )
+
+        def sample_candidates(start: int, block: NDArray) -> NDArray:
+            probabilities: NDArray[np.float64] = (
+                oversampling * self.k
+                * min_distances[start:start + len(block)] / cost
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            if block_weights is not None:
+                probabilities *= block_weights
+            # Every block has its own generator, so samples
+            # do not depend on the order threads finish in.
+            block_random_state = np.random.RandomState(
+                seed=block_seeds[start // self.chunk_size]
+            )
+            is_sampled: NDArray[np.bool_] = (
+                block_random_state.rand(len(block)) < probabilities
+            )
+            return block[is_sampled].astype(np.float64)
+
+        # Extra rounds are done if fewer than k candidates are sampled.
+        for round_ind in range(rounds + self.k):
+            if round_ind >= rounds and len(candidates) > self.k:
+                break
+
+            # Updating distances with candidates of the previous round.
+            cost: float = sum(self.map_blocks(func=update_min_distances))
+            debug_logger.debug(msg=f"K-Means|| round cost: {cost}")
+            if cost == 0.0:
+                # Every point is a candidate already.
+                break
+
+            block_seeds: NDArray[np.int64] = self.random_state.randint(
+                low=0,
+                high=2**31 - 1,
+                size=-(-len(self.data) // self.chunk_size)
+            )
+            sampled: list[NDArray[np.float64]] = [
+                point
+                for block_sampled in self.map_blocks(func=sample_candidates)
+                for point in block_sampled
+            ]
+            if not sampled:
+                continue
+            new_candidates = np.asarray(sampled)
+            candidates.extend(sampled)
+
+        candidates_array: NDArray[np.float64] = np.asarray(candidates)
+        if len(candidates_array) <= self.k:
+            # Too few distinct points, centroids are completed at random.
+            centroids: NDArray[np.float64] = np.asarray(
+                candidates + [
+                    self.get_random_point()
+                    for _ in range(self.k - len(candidates))
+                ]
+            )
+        else:
+            # Weight of a candidate is the weight of its closest points.
+            candidates_weights: NDArray[np.float64] = np.zeros(
+                shape=len(candidates_array), dtype=np.float64
+            )
+            candidates_weights += sum(
+                self.map_blocks(
+                    func=lambda start, block: np.bincount(
+                        self.closest_centroids(
+                            block=block, centroids=candidates_array
+                        )[0],
+                        weights=self.get_block_weights(
+                            start=start, size=len(block)
+                        ),
+                        minlength=len(candidates_array)
+                    )
+                )
+            )
+            debug_logger.debug(
+                msg=f"K-Means|| candidates: {len(candidates_array)}"
+            )
+            reclustering: KMeans = KMeans(
+                data=candidates_array,
+                k=self.k,
+                sample_weight=candidates_weights,
+                seed=self.random_state.randint(low=0, high=2**31 - 1),
+                metric=self.metric
+            )
+            reclustering.fit()
+            centroids = reclustering.centroids
+
+        self.centroids = centroids
+        self.clusters = {}
+        for centroid in centroids:
+            self.clusters[tuple(centroid)] = []
+
+    def get_algorithm(self) -> str:
+        """
+        Method resolves the assignment algorithm. In auto mode the kd-tree
+        is used with euclidean metric for at least KDTREE_MIN_K centroids
+        and in-memory data
+        of no more than KDTREE_MAX_FEATURES columns, where its pruning
+        pays off the tree build.
+        Returns "brute" or "kdtree".
+        """
+        if self.algorithm != "auto":
+            return self.algorithm
+        if (
+            self.metric.name == "euclidean"
+            and self.k >= KDTREE_MIN_K
+            and self.data.shape[1] <= KDTREE_MAX_FEATURES
+            and not isinstance(self.data, np.memmap)
+        ):
+            return "kdtree"
+
+        return "brute"
+
+    def get_tree(self) -> KDTree:
+        """
+        Method builds a kd-tree over data shifted by column means
+        on first use, later fits and runs reuse it.
+        Returns the kd-tree.
+        """
+        if self.tree is None:
+            self.tree = KDTree(
+                data=(
+                    np.asarray(self.data, dtype=np.float64) - self.get_shift()
+                ),
+                sample_weight=self.sample_weight
+            )
+
+        return self.tree
+
+    def assign_labels(self) -> np.float64:
+        """
+        Method assigns data points to the closest centroids
+        block by block, or with the kd-tree filtering algorithm
+        (see get_algorithm). Does not build clusters dictionary,
+        so it also works on memory-mapped data.
+        Returns inertia of the assignment summed from
+        the closest centroids' distances.
+        """
+        if self.get_algorithm() == "kdtree":
+            self.labels, inertia = self.get_tree().assign(
+                centroids=self.centroids - self.get_shift()
+            )
+            return inertia
+
+        labels: NDArray[np.int64] = np.empty(
+            shape=len(self.data), dtype=np.int64
+        )
+
+        def assign_block(start: int, block: NDArray) -> float:
+            block_labels, min_distances = self.closest_centroids(
+                block=block, centroids=self.centroids
+            )
+            labels[start:start + len(block)] = block_labels
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            return np.sum(
+                min_distances if block_weights is None
+                else min_distances * block_weights
+            )
+
+        inertia: float = sum(self.map_blocks(func=assign_block))
+        self.labels = labels
+
+        return inertia
+
     def assign_points_to_centroids(self):
         """
         Method assigns data points to the closest centroids.
+        Fills clusters dictionary with arrays of cluster points,
+        de-duplicated points are expanded back to original rows.
+        """
+        self.assign_labels()
+        self.clusters = self.build_clusters()
+
+    def build_clusters(self) -> dict[tuple[np.float64], NDArray]:
         """
-        # Calculating distances from all centroids to data points
-        all_centroids_distances: list[NDArray] = [
-            (
-                self.euclidean_distance(
-                    data1=centroid,
-                    data2=self.data
+        Method groups data points by their labels,
+        de-duplicated points are expanded back to original rows.
+        Returns a dictionary of centroids and their points.
+        """
+        labels: NDArray[np.int64] = self.get_labels()
+        clusters: dict[tuple[np.float64], NDArray] = {}
+        for ind, centroid in enumerate(self.centroids):
+            if self.inverse is None:
+                points: NDArray = np.asarray(self.data[labels == ind])
+            else:
+                points = self.data[self.inverse[labels == ind]]
+            clusters[tuple(centroid)] = points
+
+        return clusters
+
+    def update_centroids(self) -> NDArray[np.bool_]:
+        """
+        Method moves centroids to the (weighted) means of their points,
+        medians or normalized means for metrics with such update rules.
+        Per-cluster sums are accumulated block by block in float64.
+        Centroids of empty clusters are kept in place.
+        Returns a mask of empty clusters.
+        """
+        if self.metric.update == "median":
+            return self.update_medians()
+
+        def accumulate_block(start: int, block: NDArray) -> tuple[
+            NDArray[np.float64], NDArray[np.float64]
+        ]:
+            block_labels: NDArray[np.int64] = (
+                self.labels[start:start + len(block)]
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            block_counts: NDArray[np.float64] = np.bincount(
+                block_labels,
+                weights=block_weights,
+                minlength=len(self.centroids)
+            )
+            block_sums: NDArray[np.float64] = np.empty(
+                shape=self.centroids.shape, dtype=np.float64
+            )
+            for column in range(block.shape[1]):
+                block_sums[:, column] = np.bincount(
+                    block_labels,
+                    weights=(
+                        block[:, column] if block_weights is None
+                        else block[:, column] * block_weights
+                    ),
+                    minlength=len(self.centroids)
                 )
-            ) for centroid in self.clusters.keys()
-        ]
-        
-        closest_centroids_indicies: NDArray[np.int64] = (
-            np.argmin(a=all_centroids_distances, axis=0)
+            return block_counts, block_sums
+
+        partial_sums: list[tuple[NDArray, NDArray]] = self.map_blocks(
+            func=accumulate_block
         )
-        
-        for ind, centroid_ind in enumerate(closest_centroids_indicies):
-            closest_centroid: tuple[np.float64] = (
-                list(self.clusters.keys())[centroid_ind]
+        # Partial sums are reduced in block order.
+        counts: NDArray[np.float64] = sum(
+            block_counts for block_counts, _ in partial_sums
+        )
+        sums: NDArray[np.float64] = sum(
+            block_sums for _, block_sums in partial_sums
+        )
+
+        empty_clusters: NDArray[np.bool_] = counts <= 0
+        self.centroids = np.where(
+            empty_clusters[:, np.newaxis],
+            self.centroids,
+            sums / np.maximum(counts, 1.0)[:, np.newaxis]
+        )
+        if self.metric.update == "normalized_mean":
+            norms: NDArray[np.float64] = np.linalg.norm(
+                self.centroids, axis=1
             )
-            self.clusters[closest_centroid].append(self.data[ind])
-        
+            self.centroids[~empty_clusters] /= np.where(
+                norms > 0, norms, 1.0
+            )[~empty_clusters, np.newaxis]
+
+        return empty_clusters
+
+    def update_medians(self) -> NDArray[np.bool_]:
+        """
+        Method moves centroids to the (weighted) coordinate-wise medians
+        of their points. Points are sorted by label and value one column
+        at a time, the median of a cluster is its first point at which
+        the cumulative weight reaches half of the cluster weight.
+        Value orders of in-memory columns are sorted once and kept,
+        later updates only stable-sort labels along them.
+        Centroids of empty clusters are kept in place.
+        Returns a mask of empty clusters.
+        """
+        weights: NDArray[np.float64] = (
+            np.ones(shape=len(self.data), dtype=np.float64)
+            if self.sample_weight is None else self.sample_weight
+        )
+        cluster_weights: NDArray[np.float64] = np.bincount(
+            self.labels, weights=weights, minlength=len(self.centroids)
+        )
+        empty_clusters: NDArray[np.bool_] = cluster_weights <= 0
+        # Half weights of clusters on the cumulative weight scale
+        # of points sorted by label.
+        half_weights: NDArray[np.float64] = (
+            np.cumsum(cluster_weights) - cluster_weights / 2
+        )[~empty_clusters]
+
+        centroids: NDArray[np.float64] = self.centroids.copy()
+        for column in range(self.data.shape[1]):
+            values: NDArray[np.float64] = np.asarray(
+                self.data[:, column], dtype=np.float64
+            )
+            if isinstance(self.data, np.memmap):
+                order: NDArray[np.int64] = np.lexsort((values, self.labels))
+            else:
+                if self.column_orders is None:
+                    self.column_orders = np.argsort(
+                        self.data, axis=0, kind="stable"
+                    )
+                order = self.column_orders[:, column][
+                    np.argsort(
+                        self.labels[self.column_orders[:, column]],
+                        kind="stable"
+                    )
+                ]
+            median_inds: NDArray[np.int64] = np.minimum(
+                np.searchsorted(
+                    a=np.cumsum(weights[order]), v=half_weights
+                ),
+                len(order) - 1
+            )
+            centroids[~empty_clusters, column] = values[order[median_inds]]
+        self.centroids = centroids
+
+        return empty_clusters
+
+    def fit(
+        self,
+        max_iter: int = 300,
+        tol: float = 1e-4,
+        callbacks: list[Callable[["KMeans", dict], bool | None]] | None = None
+    ) -> np.float64:
+        """
+        Method implements Lloyd iterations from initial centroids
+        until the centroid shift is not larger than tol or
+        max_iter iterations are done. Keeps only centroids and labels,
+        so it also works on memory-mapped data.
+        Every iteration is recorded to trace (see get_trace) and passed
+        to callbacks as callback(kmeans, record). Iterations stop
+        if any callback returns True.
+        Returns inertia of the final clusters.
+        """
+        self.trace = []
+        start_time: float = time.perf_counter()
+        self.initialize_centroids()
+        seeding_time: float = time.perf_counter() - start_time
+
+        previous_labels: NDArray[np.int64] | None = None
+        for iteration in range(1, max_iter + 1):
+            start_time = time.perf_counter()
+            inertia: np.float64 = self.assign_labels()
+            assignment_time: float = time.perf_counter() - start_time
+
+            previous_centroids: NDArray[np.float64] = self.centroids
+            start_time = time.perf_counter()
+            empty_clusters: NDArray[np.bool_] = self.update_centroids()
+            update_time: float = time.perf_counter() - start_time
+
+            shift: np.float64 = np.sum(
+                (self.centroids - previous_centroids)**2
+            )
+            record: dict[str, int | float] = {
+                "iteration": iteration,
+                # Seeding time is counted in the first iteration only.
+                "seeding_time": seeding_time if iteration == 1 else 0.0,
+                "assignment_time": assignment_time,
+                "update_time": update_time,
+                "inertia": float(inertia),
+                "centroid_shift": float(shift),
+                "changed_points": (
+                    len(self.labels) if previous_labels is None
+                    else int(np.count_nonzero(self.labels != previous_labels))
+                ),
+                "empty_clusters": int(np.count_nonzero(empty_clusters))
+            }
+            self.trace.append(record)
+            debug_logger.debug(msg=f"Iteration: {record}")
+            if record["empty_clusters"]:
+                error_logger.warning(msg="There are empty clusters.")
+            previous_labels = self.labels
+
+            stop: bool = any(
+                [callback(self, record) for callback in callbacks or []]
+            )
+            if shift <= tol or stop:
+                break
+        self.assign_labels()
+        self.inertia = self.get_inertia()
+
+        return self.inertia
+
+    def get_trace(self) -> pd.DataFrame:
+        """
+        Method converts the trace of the last fit to a table.
+        Returns a dataframe with a row per iteration.
+        """
+        return pd.DataFrame(
+            data=self.trace,
+            columns=[
+                "iteration",
+                "seeding_time",
+                "assignment_time",
+                "update_time",
+                "inertia",
+                "centroid_shift",
+                "changed_points",
+                "empty_clusters"
+            ]
+        )
+
+    def assigned_distances(
+        self, block: NDArray, labels: NDArray[np.int64]
+    ) -> NDArray[np.float64]:
+        """
+        Method calculates metric kernel distances from block points
+        to their assigned centroids, the block is split like
+        in closest_centroids.
+        Returns an array of distances.
+        """
+        rows: int = max(1, DISTANCE_BLOCK_SIZE // len(self.centroids))
+        distances: NDArray[np.float64] = np.empty(
+            shape=len(block), dtype=np.float64
+        )
+        for start in range(0, len(block), rows):
+            distances[start:start + rows] = np.take_along_axis(
+                np.asarray(
+                    self.metric.kernel(
+                        block[start:start + rows], self.centroids
+                    ),
+                    dtype=np.float64
+                ),
+                labels[start:start + rows, np.newaxis],
+                axis=1
+            )[:, 0]
+
+        return distances
+
     def get_inertia(self) -> np.float64:
         """
         Method calculates interia for final clusters.
+        (Weighted) squared distances (metric distances for other metrics)
+        to the assigned centroids are summed block by block in float64.
         Returns inertia as a float.
         """
-        # If no cluster points' list is not empty - fit_model was not implemented.
-        empty_clusters: bool = True
-        for points in self.clusters.values():
-            debug_logger.debug(
-                msg=f"points:\n{points}"
+        # If labels are not assigned - fit_model was not implemented.
+        if self.labels is None:
+            error_logger.warning(msg="There are empty clusters.")
+            return 0.0
+
+        def block_inertia(start: int, block: NDArray) -> float:
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
             )
-            if points != []:
-                empty_clusters = False
+            if self.metric.name != "euclidean":
+                costs: NDArray[np.float64] = self.assigned_distances(
+                    block=block, labels=self.labels[start:start + len(block)]
+                )
+                return np.sum(
+                    costs if block_weights is None else costs * block_weights
+                )
 
-        if empty_clusters:    
-            error_logger.warning(msg="There are empty clusters.")
-        
-        inertia: float = 0.0
-        for ind, points in enumerate(self.clusters.values()):
-            if points != []:
-                centroid: NDArray[np.float64] = (
-                    list(self.clusters.keys())[ind]
+            differences: NDArray = block - self.centroids[
+                self.labels[start:start + len(block)]
+            ].astype(self.dtype)
+            if block_weights is None:
+                return np.einsum(
+                    "ij,ij->", differences, differences, dtype=np.float64
                 )
-                inertia += np.sum((centroid - np.asarray(points))**2)
-                     
-        return inertia
-    
-    def get_best_result(self, runs: int) -> dict[
+            return np.einsum(
+                "ij,ij,i->", differences, differences, block_weights,
+                dtype=np.float64
+            )
+
+        return sum(self.map_blocks(func=block_inertia))
+
+    def get_best_result(
+        self,
+        runs: int,
+        max_iter: int = 0,
+        tol: float = 1e-4,
+        early_abandon: bool = True,
+        patience: int | None = None,
+        restart_tol: float = 1e-4
+    ) -> dict[tuple[np.float64], list[NDArray[np.float64]]]:
+        """
+        Method implements defined runs to get a result with min inertia.
+        With max_iter = 0 a run is initialization and assignment only,
+        otherwise a run is a fit of up to max_iter Lloyd iterations.
+        With early_abandon a fit stops as soon as its inertia, lowered
+        by the last decrease for every remaining iteration, still does
+        not beat the best run. Lloyd decreases shrink with iterations,
+        so this is an optimistic estimate of the run's final inertia.
+        With patience runs stop after patience runs in a row that did
+        not lower the best inertia by more than restart_tol (relative).
+        Runs are recorded to restarts (see get_restarts).
+        Centroids, labels and inertia of the best run are kept.
+        Returns a dictionery with clusters of the best result.
+        """
+        best_run: tuple | None = None
+        stale_runs: int = 0
+        self.restarts = []
+
+        def abandon(kmeans: KMeans, record: dict[str, int | float]) -> bool:
+            nonlocal abandoned
+            if len(kmeans.trace) < 2:
+                return False
+            last_decrease: float = (
+                kmeans.trace[-2]["inertia"] - record["inertia"]
+            )
+            remaining_iterations: int = max_iter - record["iteration"]
+            inertia_bound: float = (
+                record["inertia"]
+                - max(last_decrease, 0.0) * remaining_iterations
+            )
+            abandoned = inertia_bound > best_run[0]
+            return abandoned
+
+        for run in range(1, runs + 1):
+            abandoned: bool = False
+            if max_iter == 0:
+                self.initialize_centroids()
+                self.assign_labels()
+                inertia: np.float64 = self.get_inertia()
+                iterations: int = 0
+            else:
+                inertia = self.fit(
+                    max_iter=max_iter,
+                    tol=tol,
+                    callbacks=(
+                        [abandon] if early_abandon and best_run is not None
+                        else None
+                    )
+                )
+                iterations = len(self.trace)
+            self.restarts.append(
+                {
+                    "run": run,
+                    "inertia": float(inertia),
+                    "iterations": iterations,
+                    "abandoned": abandoned
+                }
+            )
+
+            if best_run is not None and (
+                inertia >= best_run[0] * (1.0 - restart_tol)
+            ):
+                stale_runs += 1
+            else:
+                stale_runs = 0
+            if best_run is None or inertia < best_run[0]:
+                best_run = (inertia, self.centroids, self.labels)
+            if patience is not None and stale_runs >= patience:
+                debug_logger.debug(
+                    msg=f"Best inertia is stable after {run} runs"
+                )
+                break
+
+        self.inertia, self.centroids, self.labels = best_run
+        self.clusters = {}
+
+        return self.build_clusters()
+
+    def get_restarts(self) -> pd.DataFrame:
+        """
+        Method converts runs of the last get_best_result to a table.
+        Returns a dataframe with a row per run.
+        """
+        return pd.DataFrame(
+            data=self.restarts,
+            columns=["run", "inertia", "iterations", "abandoned"]
+        )
+
+    def predict(
+        self, data: pd.DataFrame | NDArray | str | Iterable
+    ) -> NDArray[np.int64]:
+        """
+        Method assigns new data points to the fitted centroids.
+        Accepts the same data sources as the constructor.
+        Returns cluster labels of the new points.
+        """
+        new_points: KMeans = KMeans(
+            data=data,
+            k=self.k,
+            dtype=self.dtype,
+            chunk_size=self.chunk_size,
+            n_jobs=self.n_jobs,
+            algorithm=self.algorithm,
+            metric=self.metric
+        )
+        new_points.centroids = self.centroids
+        new_points.assign_labels()
+
+        return new_points.labels
+
+    def get_params(self) -> dict[str, int | str | None]:
+        """
+        Method collects parameters that define a fit result.
+        Returns a JSON serializable dictionary.
+        """
+        return {
+            "k": self.k,
+            "dtype": self.dtype.name,
+            "chunk_size": self.chunk_size,
+            "seed": self.seed,
+            "init": self.init,
+            "algorithm": self.algorithm,
+            "metric": self.metric.name,
+            "deduplicated": self.inverse is not None
+        }
+
+    def get_fingerprint(self) -> str:
+        """
+        Method hashes data shape, dtype and content block by block,
+        together with sample weights and de-duplication indexes.
+        Returns a SHA-256 hex digest.
+        """
+        data_hash = hashlib.sha256()
+        data_hash.update(f"{self.data.shape} {self.data.dtype}".encode())
+        for start in range(0, len(self.data), self.chunk_size):
+            data_hash.update(
+                np.ascontiguousarray(
+                    self.data[start:start + self.chunk_size]
+                ).tobytes()
+            )
+        for array in (self.sample_weight, self.inverse):
+            if array is not None:
+                data_hash.update(np.ascontiguousarray(array).tobytes())
+
+        return data_hash.hexdigest()
+
+    def get_state(self) -> dict[str, NDArray]:
+        """
+        Method collects arrays of the fitted model - centroids, labels,
+        inertia, parameters and de-duplication indexes.
+        Returns a dictionary of arrays by name.
+        """
+        arrays: dict[str, NDArray] = {
+            "centroids": self.centroids,
+            "labels": self.labels,
+            "inertia": np.float64(self.inertia),
+            "params": np.array(json.dumps(self.get_params()))
+        }
+        if self.inverse is not None:
+            arrays["inverse"] = self.inverse
+
+        return arrays
+
+    def save(self, path: str):
+        """
+        Method saves the fitted model (see get_state)
+        to a compressed .npz file.
+        """
+        np.savez_compressed(path, **self.get_state())
+
+    def load_state(self, path: str):
+        """
+        Method loads centroids, labels and inertia of a saved model.
+        """
+        with np.load(path) as model:
+            self.centroids = model["centroids"]
+            self.labels = model["labels"]
+            self.inertia = np.float64(model["inertia"])
+            if "inverse" in model:
+                self.inverse = model["inverse"]
+        self.clusters = {}
+
+    @classmethod
+    def load(cls, path: str) -> "KMeans":
+        """
+        Method restores a saved model without its data,
+        e.g. to predict in another process.
+        Returns a fitted KMeans.
+        """
+        with np.load(path) as model:
+            params: dict[str, int | str | None] = json.loads(
+                str(model["params"])
+            )
+            columns: int = model["centroids"].shape[1]
+        kmeans: KMeans = cls(
+            data=np.empty(shape=(0, columns)),
+            k=params["k"],
+            dtype=params["dtype"],
+            chunk_size=params["chunk_size"],
+            seed=params["seed"],
+            init=params["init"],
+            algorithm=params.get("algorithm", "auto"),
+            metric=params.get("metric", "euclidean")
+        )
+        kmeans.load_state(path=path)
+
+        return kmeans
+
+
+class KMeansCache:
+
+    def __init__(self, directory: str = "assets/cache/kmeans"):
+        self.directory: str = directory
+
+    def get_key(self, kmeans: KMeans, method: str, **options) -> str:
+        """
+        Method hashes data fingerprint, parameters, method and its options.
+        Returns a SHA-256 hex digest used as a file name.
+        """
+        key: dict = {
+            "fingerprint": kmeans.get_fingerprint(),
+            "params": kmeans.get_params(),
+            "method": method,
+            "options": options
+        }
+        return hashlib.sha256(
+            json.dumps(obj=key, sort_keys=True).encode()
+        ).hexdigest()
+
+    def run(self, kmeans: KMeans, method: str, **options) -> bool:
+        """
+        Method loads a stored result of kmeans.method(**options) into
+        kmeans, or runs the method and stores its result.
+        Runs without a seed are not reproducible and never cached.
+        Returns True if the stored result was used.
+        """
+        if kmeans.seed is None:
+            getattr(kmeans, method)(**options)
+            return False
+
+        path: str = os.path.join(
+            self.directory, f"{self.get_key(kmeans, method, **options)}.npz"
+        )
+        if os.path.exists(path):
+            debug_logger.debug(msg=f"Cached {method} result: {path}")
+            kmeans.load_state(path=path)
+            return True
+
+        getattr(kmeans, method)(**options)
+        os.makedirs(self.directory, exist_ok=True)
+        kmeans.save(path=path)
+
+        return False
+
+    def fit(self, kmeans: KMeans, **fit_options) -> np.float64:
+        """
+        Method implements cached KMeans.fit.
+        Returns inertia of the final clusters.
+        """
+        self.run(kmeans, "fit", **fit_options)
+
+        return kmeans.inertia
+
+    def get_best_result(self, kmeans: KMeans, runs: int, **options) -> dict[
         tuple[np.float64], list[NDArray[np.float64]]
     ]:
         """
-        Method implements defined runs to get a result with min inertia.
+        Method implements cached KMeans.get_best_result.
         Returns a dictionery with clusters of the best result.
         """
-        results: dict[np.float64, dict[tuple[np.float64], list[NDArray]]] = {}
-        for _ in range(runs):
-            self.kmeans_plusplus()
-            self.assign_points_to_centroids()
-            inertia: np.float64 = self.get_inertia()
-            results[inertia] = self.clusters
-            self.clusters = {}
-            
-        best_inertia: np.float64 = min(results.keys())
-        best_result: dict[
-            tuple[np.float64], list[NDArray[np.float64]]
-        ] = results[best_inertia]
-        
-        return best_result
+        self.run(kmeans, "get_best_result", runs=runs, **options)
+
+        return kmeans.build_clusters()
 
 
 ### FUNCTIONS
 
 def get_kmeans_elbow_data(
-        data: pd.DataFrame, k_variants: list[int]
+        data: pd.DataFrame | NDArray,
+        k_variants: list[int],
+        seed: int | None = None,
+        cache: KMeansCache | None = None,
+        **kmeans_options
     ) -> dict[int, np.float64]:
         
         elbow_data: dict[int, np.float64] = {}
         for k in k_variants:
-            kmeans: KMeans = KMeans(data=data, k=k)
-            kmeans.kmeans_plusplus()
-            kmeans.assign_points_to_centroids()
-            
-            elbow_data[k] = kmeans.get_inertia()
+            kmeans: KMeans = KMeans(
+                data=data, k=k, deduplicate="auto", seed=seed, **kmeans_options
+            )
+            if cache is None:
+                kmeans.kmeans_plusplus()
+                kmeans.assign_points_to_centroids()
+                elbow_data[k] = kmeans.get_inertia()
+            else:
+                # A single run of seeding and assignment.
+                cache.get_best_result(kmeans=kmeans, runs=1)
+                elbow_data[k] = kmeans.inertia
             
         return elbow_data
 
 
-### IMPLEMENTATION
-
-main_data: pd.DataFrame = pd.read_csv(filepath_or_buffer="assets/data/for_kmeans.csv")
+def get_kmeans_quality_data(
+    data: pd.DataFrame | NDArray,
+    k_variants: list[int],
+    runs: int = 1,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    seed: int | None = None,
+    cache: KMeansCache | None = None,
+    sample_size: int | None = 10000,
+    **best_result_options
+) -> pd.DataFrame:
+    """
+    Function clusters data for every k of k_variants (best of runs
+    fits of up to max_iter Lloyd iterations, see get_best_result)
+    and scores the converged clusterings with Calinski-Harabasz,
+    Davies-Bouldin and silhouette (estimated from sample_size rows)
+    scores.
+    Returns a dataframe with a row per k.
+    """
+    features: NDArray[np.float64] = load_kmeans_data(source=data)
+    rows: list[dict[str, Any]] = []
+    for k in k_variants:
+        kmeans: KMeans = KMeans(
+            data=features, k=k, deduplicate="auto", seed=seed
+        )
+        if cache is None:
+            kmeans.get_best_result(
+                runs=runs, max_iter=max_iter, tol=tol, **best_result_options
+            )
+        else:
+            cache.get_best_result(
+                kmeans=kmeans,
+                runs=runs,
+                max_iter=max_iter,
+                tol=tol,
+                **best_result_options
+            )
+        labels: NDArray[np.int64] = kmeans.get_labels()
+        silhouette_score, silhouette_error = silhouette(
+            data=features, labels=labels, sample_size=sample_size, seed=seed
+        )
+        rows.append(
+            {
+                "k": k,
+                "inertia": kmeans.inertia,
+                "calinski_harabasz": calinski_harabasz(
+                    data=features, labels=labels
+                ),
+                "davies_bouldin": davies_bouldin(
+                    data=features, labels=labels
+                ),
+                "silhouette": silhouette_score,
+                "silhouette_error": silhouette_error
+            }
+        )
 
-# 1st combination
+    return pd.DataFrame(data=rows)
 
-data1_for_kmeans: pd.DataFrame = main_data[
-    ["current_funding_level(num)", "startup_age"]
-]
 
-k_variants1: list[int] = list(range(1, 6))
-elbow_data1: dict[int, np.float64] = (
-    get_kmeans_elbow_data(data=data1_for_kmeans, k_variants=k_variants1)
-)
-fig, ax = plt.subplots()
-sns.lineplot(data=elbow_data1)
-plt.savefig("assets/visualizations/kmeans/elbow1.png")
-# Optimal k is 3
-data1_k: int = 3
-plt.close()
-      
-kmeans_data1: KMeans = KMeans(data=data1_for_kmeans, k=data1_k) 
-data1_kmeans_best_res: dict[tuple[np.float64], list[NDArray[np.float64]]] = (
-    kmeans_data1.get_best_result(runs=10)
-)
-    
-colors1: list[str] = ["red", "green", "orange"]
-data1_kmeans_centers: list[list[NDArray]] = list(data1_kmeans_best_res.keys())
-data1_kmeans_points: list[tuple] = list(data1_kmeans_best_res.values())
-
-fig, ax = plt.subplots(figsize=(7, 7))
-for i in range(data1_k):
-    center: NDArray = np.array(object=data1_kmeans_centers[i])
-    points: NDArray = np.array(object=data1_kmeans_points[i])
-    plt.scatter(
-       x=points[:,0],
-       y=points[:,1],
-       c=colors1[i],
-       s=20.0
+def fit_subsets(
+    data: pd.DataFrame,
+    subsets: list[list[str]],
+    k_variants: list[int],
+    k: int | list[int],
+    runs: int = 10,
+    seed: int | None = None,
+    cache: KMeansCache | None = None,
+    n_jobs: int = 1,
+    **best_result_options
+) -> list[dict[str, Any]]:
+    """
+    Function clusters column subsets of one feature matrix.
+    The dataframe is converted to an array once, subsets share it,
+    its column means and the seed. Subsets are processed concurrently
+    by n_jobs threads (-1 uses all cores).
+    For every subset it calculates elbow data over k_variants and
+    the best of runs results for its k (one k or a k per subset).
+    Returns a list of results in subsets order - dictionaries with
+    columns, elbow, k, inertia, centroids, labels of all rows and clusters.
+    """
+    columns: list[str] = list(dict.fromkeys(
+        column for subset in subsets for column in subset
+    ))
+    features: NDArray[np.float64] = np.asarray(
+        data[columns], dtype=np.float64
     )
-    plt.scatter(
-        x=center[0],
-        y=center[1],
-        c=colors1[i],
-        marker="x",
-        s=40.0
-    )
-plt.savefig("assets/visualizations/kmeans/data1.png")
-plt.show()
+    column_inds: dict[str, int] = {
+        column: ind for ind, column in enumerate(columns)
+    }
+    column_means: NDArray[np.float64] = np.mean(a=features, axis=0)
+    subsets_k: list[int] = k if isinstance(k, list) else [k] * len(subsets)
 
-all_clusters_points1: list[list[NDArray]] = list(
-    data1_kmeans_best_res.values()
-)
-main_data["kmeans1_cluster"] = np.nan
-for i, row in main_data.iterrows():
-    data_point: NDArray = np.array(
-        object=[row["current_funding_level(num)"], row["startup_age"]]
-    )
-    if any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points1[0]
-    ):
-        main_data.at[i, "kmeans1_cluster"] = 0
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points1[1]
-    ):
-        main_data.at[i, "kmeans1_cluster"] = 1
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points1[2]
-    ):
-        main_data.at[i, "kmeans1_cluster"] = 2
-    
+    def fit_subset(subset: list[str], subset_k: int) -> dict[str, Any]:
+        inds: list[int] = [column_inds[column] for column in subset]
+        subset_features: NDArray[np.float64] = features[:, inds]
+        elbow_data: dict[int, np.float64] = get_kmeans_elbow_data(
+            data=subset_features,
+            k_variants=k_variants,
+            seed=seed,
+            cache=cache,
+            shift=column_means[inds]
+        )
 
-# 2nd combination
+        kmeans: KMeans = KMeans(
+            data=subset_features,
+            k=subset_k,
+            deduplicate="auto",
+            seed=seed,
+            shift=column_means[inds]
+        )
+        if cache is None:
+            clusters: dict[tuple[np.float64], NDArray] = (
+                kmeans.get_best_result(runs=runs, **best_result_options)
+            )
+        else:
+            clusters = cache.get_best_result(
+                kmeans=kmeans, runs=runs, **best_result_options
+            )
 
-data2_for_kmeans: pd.DataFrame = main_data[
-    ["startup_age", "amount_raised_log"]
-]
+        return {
+            "columns": subset,
+            "elbow": elbow_data,
+            "k": subset_k,
+            "inertia": kmeans.inertia,
+            "centroids": kmeans.centroids,
+            "labels": kmeans.get_labels(),
+            "clusters": clusters
+        }
 
+    workers: int = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fit_subset, subsets, subsets_k))
 
-k_variants2: list[int] = list(range(1, 6))
-elbow_data2: dict[int, np.float64] = (
-    get_kmeans_elbow_data(data=data2_for_kmeans, k_variants=k_variants2)
-)
-fig, ax = plt.subplots()
-sns.lineplot(data=elbow_data2)
-plt.savefig("assets/visualizations/kmeans/elbow2.png")
-# Optimal k is 3
-data2_k: int = 3
-plt.close()
-
-kmeans_data2: KMeans = KMeans(data=data2_for_kmeans, k=data2_k) 
-data2_kmeans_best_res: dict[tuple[np.float64], list[NDArray[np.float64]]] = (
-    kmeans_data2.get_best_result(runs=10)
-)
-    
-colors2: list[str] = ["red", "green", "orange"]
-data2_kmeans_centers: list[list[NDArray]] = list(data2_kmeans_best_res.keys())
-data2_kmeans_points: list[tuple] = list(data2_kmeans_best_res.values())
-
-fig, ax = plt.subplots(figsize=(7, 7))
-for i in range(data2_k):
-    center: NDArray = np.array(object=data2_kmeans_centers[i])
-    points: NDArray = np.array(object=data2_kmeans_points[i])
-    plt.scatter(
-       x=points[:,0],
-       y=points[:,1],
-       c=colors2[i],
-       s=20.0
+
+def setup_logging():
+    """
+    Function attaches file handlers writing error_logger.log and
+    debug_logger.log to the working directory. Repeated calls
+    do not add handlers again.
+    """
+    if debug_logger.handlers:
+        return
+
+    error_logger.setLevel(logging.WARNING)
+    error_handler: logging.FileHandler = logging.FileHandler(
+        filename="error_logger.log", mode="w"
     )
-    plt.scatter(
-        x=center[0],
-        y=center[1],
-        c=colors2[i],
-        marker="x",
-        s=40.0
+    error_formatter = logging.Formatter(
+        fmt="%(name)s %(asctime)s %(message)s\nLine: %(lineno)s"
     )
-plt.savefig("assets/visualizations/kmeans/data2.png")
-plt.show()
+    error_handler.setFormatter(fmt=error_formatter)
+    error_logger.addHandler(hdlr=error_handler)
 
-all_clusters_points2: list[list[NDArray]] = list(
-    data2_kmeans_best_res.values()
-)
-main_data["kmeans2_cluster"] = np.nan
-for i, row in main_data.iterrows():
-    data_point: NDArray = np.array(
-        object=[row["startup_age"], row["amount_raised_log"]]
+    debug_logger.setLevel(logging.DEBUG)
+    debug_handler: logging.FileHandler = logging.FileHandler(
+        filename="debug_logger.log", mode="w"
     )
-    if any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points2[0]
-    ):
-        main_data.at[i, "kmeans2_cluster"] = 0
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points2[1]
-    ):
-        main_data.at[i, "kmeans2_cluster"] = 1
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points2[2]
+    debug_formatter = logging.Formatter(
+        fmt="%(name)s %(asctime)s %(message)s\nLine: %(lineno)s"
+    )
+    debug_handler.setFormatter(fmt=debug_formatter)
+    debug_logger.addHandler(hdlr=debug_handler)
+
+
+def plot_elbow(elbow_data: dict[int, np.float64], path: str):
+    """
+    Function plots inertia by k and saves the figure.
+    Plotting libraries are imported on first use.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots()
+    sns.lineplot(data=elbow_data)
+    plt.savefig(path)
+    plt.close()
+
+
+def plot_clusters(
+    result: dict[str, Any], colors: list[str], path: str, show: bool = False
+):
+    """
+    Function scatters cluster points and centroids of a fit_subsets
+    result in 2D or 3D and saves the figure, showing it (blocking)
+    only if show is set. Large results should be sampled before
+    (see sample_clusters).
+    Plotting libraries are imported on first use.
+    """
+    import matplotlib.pyplot as plt
+
+    three_dimensional: bool = len(result["columns"]) == 3
+    if three_dimensional:
+        # Registers the 3d projection.
+        from mpl_toolkits.mplot3d import Axes3D
+    fig = plt.figure(figsize=(7, 7))
+    ax = fig.add_subplot(111, projection="3d" if three_dimensional else None)
+    for i, (centroid, cluster_points) in enumerate(
+        result["clusters"].items()
     ):
-        main_data.at[i, "kmeans2_cluster"] = 2
+        center: NDArray = np.array(object=centroid)
+        points: NDArray = np.array(object=cluster_points)
+        if three_dimensional:
+            ax.scatter(
+                xs=points[:,0], ys=points[:,1], zs=points[:,2],
+                c=colors[i], s=20.0
+            )
+            ax.scatter(
+                xs=center[0], ys=center[1], zs=center[2],
+                c=colors[i], marker="x", s=40.0
+            )
+        else:
+            ax.scatter(x=points[:,0], y=points[:,1], c=colors[i], s=20.0)
+            ax.scatter(
+                x=center[0], y=center[1], c=colors[i], marker="x", s=40.0
+            )
+    if three_dimensional:
+        ax.set_xlabel(result["columns"][0])
+        ax.set_ylabel(result["columns"][1])
+        ax.set_zlabel(result["columns"][2])
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close(fig=fig)
 
 
-# 3rd combination        
-        
-data3_for_kmeans: pd.DataFrame = main_data[
-    ["current_funding_level(num)", "startup_age", "amount_raised_log"]
-]
+### IMPLEMENTATION
 
-k_variants3: list[int] = list(range(1, 6))
-elbow_data3: dict[int, np.float64] = (
-    get_kmeans_elbow_data(data=data3_for_kmeans, k_variants=k_variants3)
-)
-fig, ax = plt.subplots()
-sns.lineplot(data=elbow_data3)
-plt.savefig("assets/visualizations/kmeans/elbow3.png")
-# Optimal k is 3
-data3_k: int = 3
-plt.close()
-
-kmeans_data2: KMeans = KMeans(data=data3_for_kmeans, k=data3_k) 
-data3_kmeans_best_res: dict[tuple[np.float64], list[NDArray[np.float64]]] = (
-    kmeans_data2.get_best_result(runs=10)
-)
-    
-colors3: list[str] = ["red", "green", "orange"]
-data3_kmeans_centers: list[list[NDArray]] = list(data3_kmeans_best_res.keys())
-data3_kmeans_points: list[tuple] = list(data3_kmeans_best_res.values())
-
-fig = plt.figure(figsize=(7, 7))
-ax = fig.add_subplot(111, projection="3d")
-for i in range(data3_k):
-    center: NDArray = np.array(object=data3_kmeans_centers[i])
-    points: NDArray = np.array(object=data3_kmeans_points[i])
-    ax.scatter(
-       xs=points[:,0],
-       ys=points[:,1],
-       zs=points[:,2],
-       c=colors3[i],
-       s=20.0
-    )
-    ax.scatter(
-        xs=center[0],
-        ys=center[1],
-        zs=center[2],
-        c=colors3[i],
-        marker="x",
-        s=40.0
+def main():
+    """
+    Function runs the K-Means analysis of assets/data/for_kmeans:
+    fits the column combinations, renders changed elbow and cluster
+    plots headless in worker processes.
+    """
+    setup_logging()
+    # Fits are reproducible with the seed, so re-runs load them from the cache.
+    kmeans_seed: int = 42
+    kmeans_cache: KMeansCache = KMeansCache()
+
+    kmeans_subsets: list[list[str]] = [
+        # 1st combination
+        ["current_funding_level(num)", "startup_age"],
+        # 2nd combination
+        ["startup_age", "amount_raised_log"],
+        # 3rd combination
+        ["current_funding_level(num)", "startup_age", "amount_raised_log"]
+    ]
+    # Only the clustered columns are read.
+    main_data: pd.DataFrame = read_table(
+        path=find_table(stem="assets/data/for_kmeans"),
+        columns=list(dict.fromkeys(sum(kmeans_subsets, [])))
     )
-ax.set_xlabel("current_funding_level(num)")
-ax.set_ylabel("startup_age")
-ax.set_zlabel("amount_raised_log")
-plt.savefig("assets/visualizations/kmeans/data3.png")
-plt.show()
-
-all_clusters_points3: list[list[NDArray]] = list(
-    data3_kmeans_best_res.values()
-)
-main_data["kmeans3_cluster"] = np.nan
-for i, row in main_data.iterrows():
-    data_point: NDArray = np.array(
-        object=[
-            row["current_funding_level(num)"],
-            row["startup_age"],
-            row["amount_raised_log"]
-        ]
+    # Optimal k is 3 for all the combinations (see elbow plots).
+    kmeans_results: list[dict[str, Any]] = fit_subsets(
+        data=main_data,
+        subsets=kmeans_subsets,
+        k_variants=list(range(1, 6)),
+        k=3,
+        runs=10,
+        seed=kmeans_seed,
+        cache=kmeans_cache,
+        n_jobs=-1
     )
-    if any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points3[0]
-    ):
-        main_data.at[i, "kmeans3_cluster"] = 0
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points3[1]
-    ):
-        main_data.at[i, "kmeans3_cluster"] = 1
-    elif any(
-        np.array_equal(
-            a1=data_point,
-            a2=cluster_point) 
-        for cluster_point in all_clusters_points3[2]
-    ):
-        main_data.at[i, "kmeans3_cluster"] = 2
+
+    colors: list[str] = ["red", "green", "orange"]
+    figures: list[FigureSpec] = []
+    for number, result in enumerate(kmeans_results, start=1):
+        figures.append(
+            FigureSpec(
+                func=plot_elbow,
+                kwargs={
+                    "elbow_data": result["elbow"],
+                    "path": f"assets/visualizations/kmeans/elbow{number}.png"
+                }
+            )
+        )
+        figures.append(
+            FigureSpec(
+                func=plot_clusters,
+                kwargs={
+                    # At most SCATTER_SAMPLE_SIZE points, stratified
+                    # by cluster, are drawn.
+                    "result": {
+                        "columns": result["columns"],
+                        "clusters": sample_clusters(
+                            clusters=result["clusters"], seed=kmeans_seed
+                        )
+                    },
+                    "colors": colors,
+                    "path": f"assets/visualizations/kmeans/data{number}.png"
+                }
+            )
+        )
+        main_data[f"kmeans{number}_cluster"] = result["labels"]
+    # Unchanged figures are not redrawn.
+    render_figures(specs=figures, n_jobs=-1, cache=FigureCache())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+import numpy as np
+from numpy.typing import NDArray
+from implementation.data_analysis.kmeans_data import DISTANCE_BLOCK_SIZE
+
+
+# Max points of a leaf, leaf points are compared with their
+# remaining candidate centroids directly.
+KDTREE_LEAF_SIZE: int = 32
+# Automatic selection of the kd-tree assignment: at least this many
+# centroids and at most this many data columns.
+KDTREE_MIN_K: int = 16
+KDTREE_MAX_FEATURES: int = 4
+
+
+### CLASS
+
+class KDTree:
+    """
+    Kd-tree over (weighted) data points for the filtering assignment
+    of Kanungo et al. Every node keeps the bounding box of its points
+    and their weight, weighted sum and weighted sum of squared norms,
+    so a node whose candidates are filtered down to one centroid is
+    assigned and costed without touching its points.
+    """
+
+    def __init__(
+        self,
+        data: NDArray[np.float64],
+        sample_weight: NDArray[np.float64] | None = None,
+        leaf_size: int = KDTREE_LEAF_SIZE
+    ):
+        data = np.asarray(data, dtype=np.float64)
+        weights: NDArray[np.float64] = (
+            np.ones(shape=len(data), dtype=np.float64)
+            if sample_weight is None
+            else np.asarray(sample_weight, dtype=np.float64)
+        )
+        self.leaf_size: int = leaf_size
+        # Points are reordered so that every node covers a slice.
+        self.order: NDArray[np.int64] = np.arange(len(data))
+        self.lower: list[NDArray[np.float64]] = []
+        self.upper: list[NDArray[np.float64]] = []
+        self.start: list[int] = []
+        self.end: list[int] = []
+        self.children: list[tuple[int, int] | None] = []
+        if len(data):
+            self.build(data=data)
+        self.points: NDArray[np.float64] = data[self.order]
+        self.weights: NDArray[np.float64] = weights[self.order]
+
+        # Node statistics from prefix sums over reordered points.
+        starts: NDArray[np.int64] = np.asarray(self.start, dtype=np.int64)
+        ends: NDArray[np.int64] = np.asarray(self.end, dtype=np.int64)
+        prefix: list[NDArray[np.float64]] = [
+            np.concatenate(
+                [np.zeros(shape=(1,) + values.shape[1:]), np.cumsum(
+                    a=values, axis=0
+                )]
+            )
+            for values in (
+                self.weights,
+                self.points * self.weights[:, np.newaxis],
+                np.einsum("ij,ij->i", self.points, self.points) * self.weights
+            )
+        ]
+        self.node_weights: NDArray[np.float64] = (
+            prefix[0][ends] - prefix[0][starts]
+        )
+        self.node_sums: NDArray[np.float64] = (
+            prefix[1][ends] - prefix[1][starts]
+        )
+        self.node_squared_norms: NDArray[np.float64] = (
+            prefix[2][ends] - prefix[2][starts]
+        )
+
+    def build(self, data: NDArray[np.float64]):
+        """
+        Method splits points recursively at the median of the widest
+        dimension of their bounding box until leaves have no more than
+        leaf_size points. Nodes are numbered in depth-first order.
+        """
+        stack: list[tuple[int, int, int, int]] = [(0, len(data), -1, 0)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            node: int = len(self.start)
+            if parent >= 0:
+                left, right = self.children[parent]
+                self.children[parent] = (
+                    (node, right) if side == 0 else (left, node)
+                )
+            points: NDArray[np.float64] = data[self.order[start:end]]
+            lower: NDArray[np.float64] = np.min(a=points, axis=0)
+            upper: NDArray[np.float64] = np.max(a=points, axis=0)
+            self.lower.append(lower)
+            self.upper.append(upper)
+            self.start.append(start)
+            self.end.append(end)
+            dimension: int = int(np.argmax(upper - lower))
+            if end - start <= self.leaf_size or upper[dimension] == lower[
+                dimension
+            ]:
+                self.children.append(None)
+                continue
+
+            middle: int = (end - start) // 2
+            partition: NDArray[np.int64] = np.argpartition(
+                points[:, dimension], middle
+            )
+            self.order[start:end] = self.order[start:end][partition]
+            self.children.append((-1, -1))
+            # Right child is pushed first, so left child is built first.
+            stack.append((start + middle, end, node, 1))
+            stack.append((start, start + middle, node, 0))
+
+        self.lower = np.asarray(self.lower)
+        self.upper = np.asarray(self.upper)
+        self.start = np.asarray(self.start, dtype=np.int64)
+        self.end = np.asarray(self.end, dtype=np.int64)
+        # Children of leaves are -1.
+        self.left: NDArray[np.int64] = np.asarray(
+            [-1 if children is None else children[0]
+             for children in self.children],
+            dtype=np.int64
+        )
+        self.right: NDArray[np.int64] = np.asarray(
+            [-1 if children is None else children[1]
+             for children in self.children],
+            dtype=np.int64
+        )
+
+    def assign(
+        self, centroids: NDArray[np.float64]
+    ) -> tuple[NDArray[np.int64], float]:
+        """
+        Method assigns points to the closest centroids with the filtering
+        algorithm. Tree levels are processed at once as arrays of
+        (node, candidate centroid) pairs. A node keeps only candidates
+        that may be the closest centroid of some point of its box:
+        candidate z is dropped if it is not closer than the candidate
+        z* closest to the box center even at the box vertex furthest
+        in the direction of z - z*. Ties keep the lower centroid index
+        (like np.argmin), so labels match brute force. A node with one
+        candidate left is assigned whole from its statistics, leaf points
+        are compared with their remaining candidates.
+        Returns labels in data order and (weighted) inertia.
+        """
+        sorted_labels: NDArray[np.int64] = np.empty(
+            shape=len(self.points), dtype=np.int64
+        )
+        centroid_norms: NDArray[np.float64] = np.einsum(
+            "ij,ij->i", centroids, centroids
+        )
+        inertia: float = 0.0
+        # Pairs are grouped by node.
+        pair_nodes: NDArray[np.int64] = np.zeros(
+            shape=len(centroids) if len(self.points) else 0, dtype=np.int64
+        )
+        pair_candidates: NDArray[np.int64] = np.arange(len(pair_nodes))
+        while len(pair_nodes):
+            group_starts: NDArray[np.int64] = np.flatnonzero(
+                np.diff(pair_nodes, prepend=-1)
+            )
+            group_sizes: NDArray[np.int64] = np.diff(
+                group_starts, append=len(pair_nodes)
+            )
+            group_inds: NDArray[np.int64] = np.repeat(
+                np.arange(len(group_starts)), group_sizes
+            )
+            lower: NDArray[np.float64] = self.lower[pair_nodes]
+            upper: NDArray[np.float64] = self.upper[pair_nodes]
+            candidate_centroids: NDArray[np.float64] = (
+                centroids[pair_candidates]
+            )
+
+            center_distances: NDArray[np.float64] = np.sum(
+                a=(candidate_centroids - (lower + upper) / 2)**2, axis=1
+            )
+            best_pairs: NDArray[np.int64] = segment_argmin(
+                values=center_distances,
+                segment_starts=group_starts,
+                segment_sizes=group_sizes
+            )
+            best_candidates: NDArray[np.int64] = pair_candidates[
+                best_pairs
+            ][group_inds]
+            best_centroids: NDArray[np.float64] = centroids[best_candidates]
+            vertices: NDArray[np.float64] = np.where(
+                candidate_centroids > best_centroids, upper, lower
+            )
+            vertex_distances: NDArray[np.float64] = np.sum(
+                a=(candidate_centroids - vertices)**2, axis=1
+            )
+            best_distances: NDArray[np.float64] = np.sum(
+                a=(best_centroids - vertices)**2, axis=1
+            )
+            # Ties go to the lowest centroid index, like brute force.
+            is_closer: NDArray[np.bool_] = (
+                vertex_distances < best_distances
+            ) | (
+                (vertex_distances == best_distances)
+                & (pair_candidates < best_candidates)
+            )
+            is_closer[best_pairs] = True
+
+            pair_nodes = pair_nodes[is_closer]
+            pair_candidates = pair_candidates[is_closer]
+            group_sizes = np.add.reduceat(is_closer, group_starts)
+            group_nodes: NDArray[np.int64] = pair_nodes[
+                np.cumsum(group_sizes) - group_sizes
+            ]
+            pair_sizes: NDArray[np.int64] = np.repeat(group_sizes, group_sizes)
+
+            # Nodes with a single candidate.
+            is_single: NDArray[np.bool_] = pair_sizes == 1
+            single_nodes: NDArray[np.int64] = pair_nodes[is_single]
+            single_candidates: NDArray[np.int64] = pair_candidates[is_single]
+            sorted_labels[
+                expand_ranges(
+                    starts=self.start[single_nodes],
+                    ends=self.end[single_nodes]
+                )
+            ] = np.repeat(
+                single_candidates,
+                self.end[single_nodes] - self.start[single_nodes]
+            )
+            inertia += np.sum(
+                np.maximum(
+                    self.node_squared_norms[single_nodes]
+                    - 2.0 * np.einsum(
+                        "ij,ij->i",
+                        self.node_sums[single_nodes],
+                        centroids[single_candidates]
+                    )
+                    + self.node_weights[single_nodes]
+                    * centroid_norms[single_candidates],
+                    0.0
+                )
+            )
+
+            is_leaf: NDArray[np.bool_] = self.left[group_nodes] < 0
+            leaf_groups: NDArray[np.bool_] = is_leaf & (group_sizes > 1)
+            if np.any(leaf_groups):
+                inertia += self.assign_leaves(
+                    centroids=centroids,
+                    centroid_norms=centroid_norms,
+                    leaves=group_nodes[leaf_groups],
+                    candidate_starts=(
+                        np.cumsum(group_sizes) - group_sizes
+                    )[leaf_groups],
+                    candidate_counts=group_sizes[leaf_groups],
+                    pair_candidates=pair_candidates,
+                    sorted_labels=sorted_labels
+                )
+
+            # Remaining pairs move to both children of their nodes.
+            is_split: NDArray[np.bool_] = ~is_single & ~np.repeat(
+                is_leaf, group_sizes
+            )
+            split_nodes: NDArray[np.int64] = pair_nodes[is_split]
+            split_candidates: NDArray[np.int64] = pair_candidates[is_split]
+            pair_nodes = np.concatenate(
+                [self.left[split_nodes], self.right[split_nodes]]
+            )
+            pair_candidates = np.concatenate(
+                [split_candidates, split_candidates]
+            )
+
+        labels: NDArray[np.int64] = np.empty_like(sorted_labels)
+        labels[self.order] = sorted_labels
+
+        return labels, inertia
+
+    def assign_leaves(
+        self,
+        centroids: NDArray[np.float64],
+        centroid_norms: NDArray[np.float64],
+        leaves: NDArray[np.int64],
+        candidate_starts: NDArray[np.int64],
+        candidate_counts: NDArray[np.int64],
+        pair_candidates: NDArray[np.int64],
+        sorted_labels: NDArray[np.int64]
+    ) -> float:
+        """
+        Method compares points of leaves with the leaves' candidates
+        (slices of pair_candidates) and writes the closest ones to
+        sorted_labels. Leaves are processed in batches of no more than
+        DISTANCE_BLOCK_SIZE point-candidate pairs.
+        Returns (weighted) inertia of the leaf points.
+        """
+        leaf_sizes: NDArray[np.int64] = self.end[leaves] - self.start[leaves]
+        batches: NDArray[np.int64] = (
+            np.cumsum(leaf_sizes * candidate_counts) // DISTANCE_BLOCK_SIZE
+        )
+        inertia: float = 0.0
+        for batch in np.unique(batches):
+            in_batch: NDArray[np.bool_] = batches == batch
+            point_counts: NDArray[np.int64] = np.repeat(
+                candidate_counts[in_batch], leaf_sizes[in_batch]
+            )
+            points: NDArray[np.int64] = expand_ranges(
+                starts=self.start[leaves[in_batch]],
+                ends=self.end[leaves[in_batch]]
+            )
+            # Every point is paired with all candidates of its leaf.
+            point_candidate_starts: NDArray[np.int64] = np.repeat(
+                candidate_starts[in_batch], leaf_sizes[in_batch]
+            )
+            candidates: NDArray[np.int64] = pair_candidates[
+                expand_ranges(
+                    starts=point_candidate_starts,
+                    ends=point_candidate_starts + point_counts
+                )
+            ]
+            pair_points: NDArray[np.int64] = np.repeat(points, point_counts)
+            distances: NDArray[np.float64] = -2.0 * np.einsum(
+                "ij,ij->i", self.points[pair_points], centroids[candidates]
+            )
+            distances += centroid_norms[candidates]
+
+            segment_starts: NDArray[np.int64] = (
+                np.cumsum(point_counts) - point_counts
+            )
+            closest: NDArray[np.int64] = segment_argmin(
+                values=distances,
+                segment_starts=segment_starts,
+                segment_sizes=point_counts
+            )
+            sorted_labels[points] = candidates[closest]
+            min_distances: NDArray[np.float64] = np.maximum(
+                distances[closest]
+                + np.einsum(
+                    "ij,ij->i", self.points[points], self.points[points]
+                ),
+                0.0
+            )
+            inertia += min_distances @ self.weights[points]
+
+        return inertia
+
+
+### FUNCTIONS
+
+def expand_ranges(
+    starts: NDArray[np.int64], ends: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """
+    Function concatenates integer ranges [start, end) without a loop.
+    Returns an array of all range elements.
+    """
+    sizes: NDArray[np.int64] = ends - starts
+    offsets: NDArray[np.int64] = np.repeat(
+        starts - (np.cumsum(sizes) - sizes), sizes
+    )
+
+    return np.arange(np.sum(sizes)) + offsets
+
+
+def segment_argmin(
+    values: NDArray[np.float64],
+    segment_starts: NDArray[np.int64],
+    segment_sizes: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """
+    Function finds the first minimum of every non-empty segment
+    of consecutive values in linear time.
+    Returns indices of the minimums in values.
+    """
+    is_min: NDArray[np.bool_] = values == np.repeat(
+        np.minimum.reduceat(values, segment_starts), segment_sizes
+    )
+    min_inds: NDArray[np.int64] = np.flatnonzero(is_min)
+    min_segments: NDArray[np.int64] = np.repeat(
+        np.arange(len(segment_starts)), segment_sizes
+    )[min_inds]
+
+    return min_inds[np.flatnonzero(np.diff(min_segments, prepend=-1))]
@@ -0,0 +1,448 @@
+import json
+import os
+import pandas as pd
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any, Iterable
+from implementation.data_analysis.data_store import find_table, read_table
+from implementation.data_analysis.kmeans_data import DISTANCE_BLOCK_SIZE
+from implementation.data_analysis.kmeans_implementation import (
+    KMeans,
+    error_logger,
+    setup_logging
+)
+
+
+### CLASS
+
+class KPrototypes(KMeans):
+    """
+    K-Prototypes variant of KMeans for mixed data - numerical columns
+    and integer-coded categorical columns (see encode_categoricals).
+    Distance of a point to a prototype is the squared Euclidean distance
+    of numerical columns plus gamma times the number of mismatched
+    categorical columns. Categorical values of prototypes are modes of
+    their clusters counted with bincount, categoricals are never
+    one-hot encoded. Categorical columns are given by positions or,
+    for dataframes and .csv or .parquet tables, by names.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame | NDArray | str | Iterable,
+        k: int,
+        categorical: list[int | str] | None = None,
+        gamma: float | None = None,
+        **kmeans_options
+    ):
+        if kmeans_options.get("init", "k-means++") != "k-means++":
+            raise ValueError(
+                "KPrototypes supports k-means++ initialization only."
+            )
+        # Kd-tree filtering relies on Euclidean geometry.
+        if kmeans_options.get("algorithm", "brute") == "kdtree":
+            raise ValueError("KPrototypes supports brute assignment only.")
+        kmeans_options["algorithm"] = "brute"
+        if kmeans_options.get("metric", "euclidean") != "euclidean":
+            raise ValueError("KPrototypes supports euclidean metric only.")
+        # Tables are read with their column names (codes stay numbers),
+        # other sources are loaded by load_kmeans_data.
+        if isinstance(data, (str, os.PathLike)) and os.fspath(data).endswith(
+            (".csv", ".parquet")
+        ):
+            data = read_table(path=os.fspath(data), schema={})
+        columns: list[str] | None = (
+            list(data.columns) if isinstance(data, pd.DataFrame) else None
+        )
+        super().__init__(data=data, k=k, **kmeans_options)
+        self.categorical: list[int] = sorted(
+            get_column_positions(columns=columns, selected=categorical or [])
+        )
+        self.numerical: list[int] = [
+            column for column in range(self.data.shape[1])
+            if column not in self.categorical
+        ]
+        # Weight of a categorical mismatch, calculated on first use
+        # if not given.
+        self.gamma: float | None = gamma
+        # Number of categories (max code + 1) of categorical columns.
+        self.n_categories: list[int] = (
+            self.get_n_categories() if len(self.data) else []
+        )
+
+    def get_n_categories(self) -> list[int]:
+        """
+        Method checks that categorical columns hold non-negative integer
+        codes and finds the largest code of every column in one pass.
+        Returns numbers of categories of categorical columns.
+        """
+        def block_max_codes(start: int, block: NDArray) -> NDArray:
+            codes: NDArray = block[:, self.categorical]
+            if np.any(codes < 0) or np.any(codes != np.round(codes)):
+                raise ValueError(
+                    "Categorical columns must hold non-negative integer codes."
+                )
+            return np.max(a=codes, axis=0, initial=0)
+
+        max_codes: NDArray = np.max(
+            a=self.map_blocks(func=block_max_codes), axis=0
+        )
+
+        return [int(max_code) + 1 for max_code in max_codes]
+
+    def get_shift(self) -> NDArray[np.float64]:
+        """
+        Method calculates means of numerical columns in one streaming pass.
+        Returns the column means as a float64 array.
+        """
+        if self.shift is None:
+            self.shift = super().get_shift()[self.numerical]
+
+        return self.shift
+
+    def get_gamma(self) -> float:
+        """
+        Method calculates weight of a categorical mismatch if it is not
+        given: half of the mean (weighted) standard deviation of numerical
+        columns, sums are accumulated in one pass over data blocks.
+        Returns gamma as a float.
+        """
+        if self.gamma is not None:
+            return self.gamma
+        if not self.numerical:
+            self.gamma = 1.0
+            return self.gamma
+
+        shift: NDArray[np.float64] = self.get_shift()
+
+        def accumulate_block(start: int, block: NDArray) -> tuple[
+            float, NDArray[np.float64], NDArray[np.float64]
+        ]:
+            deviations: NDArray[np.float64] = (
+                block[:, self.numerical] - shift
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            if block_weights is None:
+                return (
+                    len(block),
+                    np.sum(a=deviations, axis=0),
+                    np.sum(a=deviations**2, axis=0)
+                )
+            return (
+                np.sum(block_weights),
+                block_weights @ deviations,
+                block_weights @ deviations**2
+            )
+
+        partial_sums: list[tuple] = self.map_blocks(func=accumulate_block)
+        total_weight: float = sum(weight for weight, _, _ in partial_sums)
+        means: NDArray[np.float64] = sum(
+            sums for _, sums, _ in partial_sums
+        ) / total_weight
+        variances: NDArray[np.float64] = sum(
+            squares for _, _, squares in partial_sums
+        ) / total_weight - means**2
+        self.gamma = float(
+            0.5 * np.mean(np.sqrt(np.maximum(variances, 0.0)))
+        )
+
+        return self.gamma
+
+    def block_squared_distances(
+        self,
+        block: NDArray,
+        centroids: NDArray[np.float64],
+        add_block_norms: bool = True
+    ) -> NDArray[np.float64]:
+        """
+        Method calculates distances from a block of points to all
+        prototypes: squared Euclidean distances of numerical columns
+        plus gamma times counts of mismatched categorical columns.
+        Returns an array of shape (block rows, prototypes).
+        """
+        distances: NDArray[np.float64] = super().block_squared_distances(
+            block=block[:, self.numerical],
+            centroids=centroids[:, self.numerical],
+            add_block_norms=add_block_norms
+        )
+        mismatches: NDArray[np.int64] = np.zeros(
+            shape=distances.shape, dtype=np.int64
+        )
+        for column in self.categorical:
+            mismatches += (
+                block[:, column, np.newaxis]
+                != centroids[np.newaxis, :, column]
+            )
+        distances += self.get_gamma() * mismatches
+
+        return distances
+
+    def closest_centroids(
+        self,
+        block: NDArray,
+        centroids: NDArray[np.float64]
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Method finds the closest prototype of every block point.
+        The block is split so that a distance matrix has no more than
+        DISTANCE_BLOCK_SIZE elements even for many prototypes.
+        Returns labels and distances to the closest prototypes.
+        """
+        rows: int = max(1, DISTANCE_BLOCK_SIZE // len(centroids))
+        labels: NDArray[np.int64] = np.empty(shape=len(block), dtype=np.int64)
+        min_distances: NDArray[np.float64] = np.empty(
+            shape=len(block), dtype=np.float64
+        )
+        for start in range(0, len(block), rows):
+            distances: NDArray[np.float64] = self.block_squared_distances(
+                block=block[start:start + rows], centroids=centroids
+            )
+            labels[start:start + rows] = np.argmin(a=distances, axis=1)
+            min_distances[start:start + rows] = np.take_along_axis(
+                distances, labels[start:start + rows, np.newaxis], axis=1
+            )[:, 0]
+
+        return labels, min_distances
+
+    def update_centroids(self) -> NDArray[np.bool_]:
+        """
+        Method moves prototypes to the (weighted) means of numerical
+        columns and the (weighted) modes of categorical columns of their
+        points. Category counts of all clusters are accumulated block
+        by block with a bincount of label * categories + code.
+        Prototypes of empty clusters are kept in place.
+        Returns a mask of empty clusters.
+        """
+        previous_centroids: NDArray[np.float64] = self.centroids
+        empty_clusters: NDArray[np.bool_] = super().update_centroids()
+        k: int = len(self.centroids)
+
+        def count_block(start: int, block: NDArray) -> list[NDArray]:
+            block_labels: NDArray[np.int64] = (
+                self.labels[start:start + len(block)]
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            return [
+                np.bincount(
+                    block_labels * categories
+                    + block[:, column].astype(np.int64),
+                    weights=block_weights,
+                    minlength=k * categories
+                )
+                for column, categories in zip(
+                    self.categorical, self.n_categories
+                )
+            ]
+
+        partial_counts: list[list[NDArray]] = self.map_blocks(
+            func=count_block
+        )
+        for ind, (column, categories) in enumerate(
+            zip(self.categorical, self.n_categories)
+        ):
+            # Counts are reduced in block order.
+            counts: NDArray[np.float64] = sum(
+                block_counts[ind] for block_counts in partial_counts
+            ).reshape(k, categories)
+            self.centroids[:, column] = np.where(
+                empty_clusters,
+                previous_centroids[:, column],
+                np.argmax(a=counts, axis=1)
+            )
+
+        return empty_clusters
+
+    def get_inertia(self) -> np.float64:
+        """
+        Method calculates the total (weighted) distance of points
+        to their prototypes block by block in float64.
+        Returns inertia as a float.
+        """
+        if self.labels is None:
+            error_logger.warning(msg="There are empty clusters.")
+            return 0.0
+
+        gamma: float = self.get_gamma()
+
+        def block_inertia(start: int, block: NDArray) -> float:
+            prototypes: NDArray[np.float64] = self.centroids[
+                self.labels[start:start + len(block)]
+            ]
+            differences: NDArray = (
+                block[:, self.numerical] - prototypes[:, self.numerical]
+            )
+            costs: NDArray[np.float64] = np.einsum(
+                "ij,ij->i", differences, differences, dtype=np.float64
+            )
+            costs += gamma * np.count_nonzero(
+                block[:, self.categorical] != prototypes[:, self.categorical],
+                axis=1
+            )
+            block_weights: NDArray[np.float64] | None = (
+                self.get_block_weights(start=start, size=len(block))
+            )
+            return np.sum(
+                costs if block_weights is None else costs * block_weights
+            )
+
+        return sum(self.map_blocks(func=block_inertia))
+
+    def predict(
+        self, data: pd.DataFrame | NDArray | str | Iterable
+    ) -> NDArray[np.int64]:
+        """
+        Method assigns new data points to the fitted prototypes.
+        Accepts the same data sources as the constructor.
+        Returns cluster labels of the new points.
+        """
+        new_points: KPrototypes = KPrototypes(
+            data=data,
+            k=self.k,
+            categorical=self.categorical,
+            gamma=self.get_gamma(),
+            dtype=self.dtype,
+            chunk_size=self.chunk_size,
+            n_jobs=self.n_jobs
+        )
+        new_points.centroids = self.centroids
+        new_points.assign_labels()
+
+        return new_points.labels
+
+    def get_params(self) -> dict[str, Any]:
+        """
+        Method collects parameters that define a fit result.
+        Returns a JSON serializable dictionary.
+        """
+        params: dict[str, Any] = super().get_params()
+        params["categorical"] = self.categorical
+        params["gamma"] = self.get_gamma()
+
+        return params
+
+    @classmethod
+    def load(cls, path: str) -> "KPrototypes":
+        """
+        Method restores a saved model without its data,
+        e.g. to predict in another process.
+        Returns a fitted KPrototypes.
+        """
+        kprototypes: KPrototypes = super().load(path=path)
+        with np.load(path) as model:
+            params: dict[str, Any] = json.loads(str(model["params"]))
+        kprototypes.categorical = params["categorical"]
+        kprototypes.numerical = [
+            column for column in range(kprototypes.centroids.shape[1])
+            if column not in kprototypes.categorical
+        ]
+        kprototypes.gamma = params["gamma"]
+
+        return kprototypes
+
+
+### FUNCTIONS
+
+def get_column_positions(
+    columns: list[str] | None, selected: list[int | str]
+) -> list[int]:
+    """
+    Function converts column names to positions among columns
+    of the loaded data, positions are kept.
+    Returns a list of column positions.
+    """
+    names: list[str] = [
+        column for column in selected if isinstance(column, str)
+    ]
+    if names and columns is None:
+        raise ValueError(
+            f"Columns {names} are given by name, but the data source has "
+            "no column names (dataframes and .csv or .parquet tables have "
+            "them), give their positions."
+        )
+    unknown: list[str] = [column for column in names if column not in columns]
+    if unknown:
+        raise ValueError(f"Columns {unknown} are not in the data.")
+
+    return [
+        columns.index(column) if isinstance(column, str) else column
+        for column in selected
+    ]
+
+def encode_categoricals(
+    data: pd.DataFrame, columns: list[str]
+) -> tuple[pd.DataFrame, dict[str, pd.Index]]:
+    """
+    Function replaces categorical columns with integer codes of their
+    sorted categories, missing values get a code of their own.
+    Other columns are kept as they are.
+    Returns the encoded dataframe and categories of encoded columns.
+    """
+    encoded: pd.DataFrame = data.copy()
+    categories: dict[str, pd.Index] = {}
+    for column in columns:
+        codes, uniques = pd.factorize(
+            values=data[column], sort=True, use_na_sentinel=False
+        )
+        encoded[column] = codes
+        categories[column] = uniques
+
+    return encoded, categories
+
+
+def decode_prototypes(
+    centroids: NDArray[np.float64],
+    columns: list[str],
+    categories: dict[str, pd.Index]
+) -> pd.DataFrame:
+    """
+    Function converts category codes of prototypes back to categories.
+    Returns a dataframe with a row per prototype.
+    """
+    prototypes: pd.DataFrame = pd.DataFrame(data=centroids, columns=columns)
+    for column, column_categories in categories.items():
+        prototypes[column] = column_categories[
+            prototypes[column].astype(np.int64)
+        ]
+
+    return prototypes
+
+
+### IMPLEMENTATION
+
+if __name__ == "__main__":
+    setup_logging()
+    categorical_columns: list[str] = [
+        "industry",
+        "country",
+        "startup_size",
+        "current_funding_level"
+    ]
+    columns: list[str] = categorical_columns + [
+        "startup_age",
+        "amount_raised_log"
+    ]
+    main_data: pd.DataFrame = read_table(
+        path=find_table(stem="assets/data/main_data"), columns=columns
+    )
+    encoded_data, data_categories = encode_categoricals(
+        data=main_data, columns=categorical_columns
+    )
+    kprototypes: KPrototypes = KPrototypes(
+        data=encoded_data,
+        k=3,
+        categorical=categorical_columns,
+        deduplicate="auto",
+        seed=42
+    )
+    kprototypes.get_best_result(runs=10, max_iter=300)
+    print(
+        decode_prototypes(
+            centroids=kprototypes.centroids,
+            columns=columns,
+            categories=data_categories
+        ).to_string()
+    )
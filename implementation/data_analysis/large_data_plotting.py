@@ -0,0 +1,181 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+# From this many rows figures are drawn from bins and samples
+# computed here, so drawing cost and image size depend on the
+# resolution instead of the row count.
+LARGE_DATA_ROWS: int = 1 << 15
+HISTOGRAM_BINS: int = 100
+# Bins per axis of 2D densities.
+DENSITY_BINS: int = 128
+# Points scattered per figure (a few more if small strata get
+# their minimum) and at least per stratum (cluster).
+SCATTER_SAMPLE_SIZE: int = 1 << 12
+STRATUM_SAMPLE_MINIMUM: int = 64
+# Outliers drawn by a box plot.
+BOX_FLIERS: int = 256
+
+
+### FUNCTIONS
+
+def is_large_data(rows: int, threshold: int = LARGE_DATA_ROWS) -> bool:
+    """
+    Function decides if a table is drawn in the large-data mode.
+    Returns True from threshold rows.
+    """
+    return rows >= threshold
+
+
+def get_finite(values: pd.Series | NDArray) -> NDArray[np.float64]:
+    """
+    Function drops missing and infinite values.
+    Returns a float array.
+    """
+    values = np.asarray(values, dtype=np.float64)
+
+    return values[np.isfinite(values)]
+
+
+def get_histogram(
+    values: pd.Series | NDArray, bins: int = HISTOGRAM_BINS
+) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """
+    Function bins values in one pass, missing values are skipped.
+    Returns counts and bin edges (bins + 1 values).
+    """
+    return np.histogram(a=get_finite(values=values), bins=bins)
+
+
+def get_density(
+    x: pd.Series | NDArray,
+    y: pd.Series | NDArray,
+    bins: int = DENSITY_BINS
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Function counts (x, y) pairs on a bins x bins grid, pairs with
+    a missing value are skipped.
+    Returns (x bins, y bins) counts, x edges and y edges.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    present: NDArray[np.bool_] = np.isfinite(x) & np.isfinite(y)
+
+    return np.histogram2d(x=x[present], y=y[present], bins=bins)
+
+
+def get_box_statistics(
+    values: pd.Series | NDArray,
+    whisker: float = 1.5,
+    fliers: int = BOX_FLIERS,
+    seed: int | None = 0
+) -> dict[str, Any]:
+    """
+    Function calculates a box plot of values: quartiles, whiskers at
+    the furthest values within whisker IQRs and outliers beyond them,
+    at most fliers of them (the extremes and a uniform sample).
+    Returns a dictionary for matplotlib Axes.bxp.
+    """
+    values = get_finite(values=values)
+    if not len(values):
+        return {
+            "med": np.nan, "q1": np.nan, "q3": np.nan, "whislo": np.nan,
+            "whishi": np.nan, "fliers": np.empty(shape=0)
+        }
+
+    q1, median, q3 = np.quantile(a=values, q=[0.25, 0.5, 0.75])
+    iqr: float = q3 - q1
+    inside: NDArray[np.bool_] = (
+        (values >= q1 - whisker * iqr) & (values <= q3 + whisker * iqr)
+    )
+    outliers: NDArray[np.float64] = values[~inside]
+    if len(outliers) > fliers:
+        random_state: np.random.Generator = np.random.default_rng(seed=seed)
+        outliers = np.concatenate([
+            [outliers.min(), outliers.max()],
+            random_state.choice(a=outliers, size=fliers - 2, replace=False)
+        ])
+
+    return {
+        "med": median,
+        "q1": q1,
+        "q3": q3,
+        "whislo": values[inside].min(),
+        "whishi": values[inside].max(),
+        "fliers": outliers
+    }
+
+
+def get_stratified_sample(
+    labels: pd.Series | NDArray,
+    size: int = SCATTER_SAMPLE_SIZE,
+    minimum: int = STRATUM_SAMPLE_MINIMUM,
+    seed: int | None = 0
+) -> NDArray[np.int64]:
+    """
+    Function samples rows of every stratum (label) without replacement,
+    proportionally to its size but at least minimum rows of it (or all),
+    so small strata stay visible. Strata are ranked in one random
+    permutation, no per-stratum loops.
+    Returns sorted row numbers, all rows if there are at most size.
+    """
+    labels = np.asarray(labels)
+    if len(labels) <= size:
+        return np.arange(len(labels))
+
+    _, codes, counts = np.unique(
+        labels, return_inverse=True, return_counts=True
+    )
+    quotas: NDArray[np.int64] = np.minimum(
+        counts,
+        np.maximum(minimum, np.floor(size * counts / len(labels)))
+    ).astype(np.int64)
+    random_state: np.random.Generator = np.random.default_rng(seed=seed)
+    order: NDArray[np.int64] = random_state.permutation(len(labels))
+    # Stable sort keeps the random order within strata.
+    by_stratum: NDArray[np.int64] = order[
+        np.argsort(codes[order], kind="stable")
+    ]
+    stratum_codes: NDArray[np.int64] = codes[by_stratum]
+    ranks: NDArray[np.int64] = np.arange(len(labels)) - np.searchsorted(
+        stratum_codes, stratum_codes
+    )
+
+    return np.sort(by_stratum[ranks < quotas[stratum_codes]])
+
+
+def sample_clusters(
+    clusters: dict[tuple, list],
+    size: int = SCATTER_SAMPLE_SIZE,
+    minimum: int = STRATUM_SAMPLE_MINIMUM,
+    seed: int | None = 0
+) -> dict[tuple, NDArray[np.float64]]:
+    """
+    Function samples points of clusters by centroid (like
+    fit_subsets results), stratified by cluster (see get_stratified_sample).
+    Returns sampled points by centroid.
+    """
+    points: list[NDArray[np.float64]] = [
+        np.asarray(cluster_points, dtype=np.float64)
+        for cluster_points in clusters.values()
+    ]
+    labels: NDArray[np.int64] = np.repeat(
+        np.arange(len(points)),
+        [len(cluster_points) for cluster_points in points]
+    )
+    sample: NDArray[np.int64] = get_stratified_sample(
+        labels=labels, size=size, minimum=minimum, seed=seed
+    )
+    starts: NDArray[np.int64] = np.searchsorted(labels, np.arange(len(points)))
+
+    return {
+        centroid: cluster_points[
+            sample[labels[sample] == number] - starts[number]
+        ]
+        for number, (centroid, cluster_points) in enumerate(
+            zip(clusters, points)
+        )
+    }
@@ -0,0 +1,317 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from implementation.data_analysis.data_store import (
+    STARTUP_SCHEMA,
+    iterate_table
+)
+
+
+# Rows read and reduced at a time, memory is a few (rows, columns) arrays.
+STREAM_CHUNK_SIZE: int = 1 << 16
+
+
+### CLASS
+
+class MomentState:
+    """
+    Mergeable pairwise moments of numerical columns. For every pair
+    (i, j) of columns, over rows where both are present: the count,
+    the mean and the sum of squared deviations of column i, and
+    the co-moment of i and j. The diagonal holds the moments of every
+    column alone. States of chunks are merged with Chan's parallel
+    (Welford) update and can be subtracted again, so states of chunks,
+    files or processes combine in any order into the statistics of
+    all rows, with pairwise-complete correlations like DataFrame.corr().
+    """
+
+    def __init__(self, columns: list[str]):
+        self.columns: list[str] = columns
+        shape: tuple[int, int] = (len(columns), len(columns))
+        self.counts: NDArray[np.float64] = np.zeros(shape=shape)
+        self.means: NDArray[np.float64] = np.zeros(shape=shape)
+        self.squares: NDArray[np.float64] = np.zeros(shape=shape)
+        self.co_moments: NDArray[np.float64] = np.zeros(shape=shape)
+
+    @classmethod
+    def from_values(
+        cls, values: NDArray[np.float64], columns: list[str]
+    ) -> "MomentState":
+        """
+        Method calculates moments of a (rows, columns) array, missing
+        values are NaN. Values are shifted by column means first,
+        so the sums are numerically stable.
+        Returns a new state.
+        """
+        state: MomentState = cls(columns=columns)
+        present: NDArray[np.bool_] = ~np.isnan(values)
+        if not present.any():
+            return state
+
+        weights: NDArray[np.float64] = present.astype(np.float64)
+        shifts: NDArray[np.float64] = np.where(present, values, 0.0).sum(
+            axis=0
+        ) / np.maximum(weights.sum(axis=0), 1.0)
+        shifted: NDArray[np.float64] = np.where(present, values - shifts, 0.0)
+        state.counts = weights.T @ weights
+        # sums[i, j]: sum of column i over rows where i and j are present.
+        sums: NDArray[np.float64] = shifted.T @ weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means: NDArray[np.float64] = np.where(
+                state.counts > 0, sums / state.counts, 0.0
+            )
+        state.means = means + shifts[:, np.newaxis] * (state.counts > 0)
+        state.squares = np.maximum(
+            (shifted * shifted).T @ weights - sums * means, 0.0
+        )
+        state.co_moments = shifted.T @ shifted - sums * means.T
+
+        return state
+
+    @classmethod
+    def from_frame(
+        cls, data: pd.DataFrame, columns: list[str] | None = None
+    ) -> "MomentState":
+        """
+        Method calculates moments of columns of a dataframe.
+        Returns a new state.
+        """
+        columns = list(data.columns) if columns is None else columns
+
+        return cls.from_values(
+            values=data[columns].to_numpy(dtype=np.float64, na_value=np.nan),
+            columns=columns
+        )
+
+    def combine(self, other: "MomentState", sign: int):
+        """
+        Method adds (sign 1) or subtracts (sign -1) moments of other
+        rows of the same columns with Chan's update: for counts n_a, n_b
+        and mean difference d, M2 = M2_a + M2_b + d_i d_j n_a n_b / n.
+        Subtracted rows must have been added before.
+        """
+        if other.columns != self.columns:
+            raise ValueError(
+                f"Moments of {other.columns} cannot be combined "
+                f"with moments of {self.columns}."
+            )
+
+        counts: NDArray[np.float64] = self.counts + sign * other.counts
+        if np.any(counts < -0.5):
+            raise ValueError("Subtracted rows were not added.")
+        counts = np.maximum(counts, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Rows a are self before a merge, the rest after a subtraction.
+            base_counts: NDArray[np.float64] = (
+                self.counts if sign > 0 else counts
+            )
+            means: NDArray[np.float64] = np.where(
+                counts > 0,
+                (self.counts * self.means + sign * other.counts * other.means)
+                / counts,
+                0.0
+            )
+            base_means: NDArray[np.float64] = self.means if sign > 0 else means
+            deltas: NDArray[np.float64] = other.means - base_means
+            # n_a n_b / n of the merged rows a and b.
+            factors: NDArray[np.float64] = np.where(
+                counts > 0,
+                base_counts * other.counts / (
+                    counts if sign > 0 else self.counts
+                ),
+                0.0
+            )
+        factors = np.nan_to_num(factors)
+        self.squares = np.where(
+            counts > 0,
+            np.maximum(
+                self.squares
+                + sign * (other.squares + deltas * deltas * factors),
+                0.0
+            ),
+            0.0
+        )
+        self.co_moments = np.where(
+            counts > 0,
+            self.co_moments
+            + sign * (other.co_moments + deltas * deltas.T * factors),
+            0.0
+        )
+        self.means = means
+        self.counts = counts
+
+    def merge(self, other: "MomentState"):
+        """
+        Method adds moments of other rows.
+        """
+        self.combine(other=other, sign=1)
+
+    def subtract(self, other: "MomentState"):
+        """
+        Method removes moments of previously added rows.
+        """
+        self.combine(other=other, sign=-1)
+
+    def update(self, data: pd.DataFrame):
+        """
+        Method adds a chunk of rows.
+        """
+        self.merge(
+            other=MomentState.from_frame(data=data, columns=self.columns)
+        )
+
+    def get_statistics(self, ddof: int = 1) -> pd.DataFrame:
+        """
+        Method reads moments of every column alone.
+        Returns a dataframe of count, mean and std by column.
+        """
+        counts: NDArray[np.float64] = np.diag(self.counts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variances: NDArray[np.float64] = np.where(
+                counts > ddof, np.diag(self.squares) / (counts - ddof), np.nan
+            )
+
+        return pd.DataFrame(
+            data={
+                "count": counts.astype(np.int64),
+                "mean": np.where(counts > 0, np.diag(self.means), np.nan),
+                "std": np.sqrt(variances)
+            },
+            index=self.columns
+        )
+
+    def get_correlation(self) -> pd.DataFrame:
+        """
+        Method calculates Pearson correlations of every pair of columns
+        over rows where both are present (NaN for fewer than 2 rows
+        or a constant column).
+        Returns a correlation matrix like DataFrame.corr().
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation: NDArray[np.float64] = np.clip(
+                self.co_moments / np.sqrt(self.squares * self.squares.T),
+                -1.0,
+                1.0
+            )
+        correlation[self.counts < 2] = np.nan
+
+        return pd.DataFrame(
+            data=correlation, index=self.columns, columns=self.columns
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Method converts the state for JSON.
+        Returns a dictionary of lists.
+        """
+        return {
+            "columns": self.columns,
+            "counts": self.counts.tolist(),
+            "means": self.means.tolist(),
+            "squares": self.squares.tolist(),
+            "co_moments": self.co_moments.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, saved: dict[str, Any]) -> "MomentState":
+        """
+        Method reads a state converted by to_dict.
+        Returns the state.
+        """
+        state: MomentState = cls(columns=saved["columns"])
+        shape: tuple[int, int] = (len(state.columns), len(state.columns))
+        for name in ["counts", "means", "squares", "co_moments"]:
+            setattr(
+                state,
+                name,
+                np.array(saved[name], dtype=np.float64).reshape(shape)
+            )
+
+        return state
+
+
+### FUNCTIONS
+
+def stream_moments(
+    chunks: Iterable[pd.DataFrame], columns: list[str]
+) -> MomentState:
+    """
+    Function accumulates moments of columns over dataframe chunks,
+    one chunk in memory at a time.
+    Returns the state.
+    """
+    state: MomentState = MomentState(columns=columns)
+    for chunk in chunks:
+        state.update(data=chunk)
+
+    return state
+
+
+def get_file_moments(
+    path: str,
+    columns: list[str],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    schema: dict[str, str | pd.CategoricalDtype] = STARTUP_SCHEMA
+) -> MomentState:
+    """
+    Function accumulates moments of columns of a stored table
+    (CSV, Parquet or JSON lines, see iterate_table) chunk by chunk.
+    Returns the state.
+    """
+    return stream_moments(
+        chunks=iterate_table(
+            path=path, columns=columns, chunk_size=chunk_size, schema=schema
+        ),
+        columns=columns
+    )
+
+
+def get_streaming_moments(
+    paths: list[str],
+    columns: list[str],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    n_jobs: int = 1,
+    schema: dict[str, str | pd.CategoricalDtype] = STARTUP_SCHEMA
+) -> MomentState:
+    """
+    Function accumulates moments of columns over stored tables (e.g.
+    partitions of a dataset) out of core: every file is streamed by
+    one of n_jobs worker processes (-1 uses all cores) and the states
+    of the files are merged in file order.
+    Returns the merged state, its get_correlation matches
+    DataFrame.corr() of all rows.
+    """
+    workers: int = min(
+        (os.cpu_count() or 1) if n_jobs == -1 else n_jobs, len(paths)
+    )
+    if workers <= 1:
+        states: list[MomentState] = [
+            get_file_moments(
+                path=path,
+                columns=columns,
+                chunk_size=chunk_size,
+                schema=schema
+            )
+            for path in paths
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            states = list(
+                executor.map(
+                    get_file_moments,
+                    paths,
+                    [columns] * len(paths),
+                    [chunk_size] * len(paths),
+                    [schema] * len(paths)
+                )
+            )
+
+    state: MomentState = MomentState(columns=columns)
+    for file_state in states:
+        state.merge(other=file_state)
+
+    return state
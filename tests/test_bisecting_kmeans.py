@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.bisecting_kmeans import BisectingKMeans
+from implementation.data_analysis.kmeans_implementation import KMeansCache
+import numpy as np
+
+
+class TestBisectingKMeans(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.blob_labels: np.ndarray = np.repeat(a=[0, 1, 2, 3], repeats=50)
+        centers: np.ndarray = np.array(
+            [[0.0, 0.0], [0.0, 20.0], [20.0, 0.0], [20.0, 20.0]]
+        )
+        self.data: np.ndarray = (
+            centers[self.blob_labels] + random_state.randn(200, 2)
+        )
+
+    def test_fit(self):
+        kmeans: BisectingKMeans = BisectingKMeans(data=self.data, k=6, seed=0)
+        kmeans.fit()
+
+        self.assertEqual(
+            first=len(kmeans.get_splits()),
+            second=5,
+            msg="Wrong number of splits."
+        )
+        self.assertEqual(
+            first=len(kmeans.centroids),
+            second=6,
+            msg="Wrong number of clusters."
+        )
+        self.assertAlmostEqual(
+            first=kmeans.inertia,
+            second=kmeans.get_inertia(),
+            msg="Tree inertia differs from point inertia."
+        )
+
+    def test_cut(self):
+        kmeans: BisectingKMeans = BisectingKMeans(data=self.data, k=6, seed=0)
+        kmeans.fit()
+        elbow_data: dict[int, np.float64] = kmeans.get_elbow_data()
+
+        self.assertEqual(
+            first=list(elbow_data),
+            second=[1, 2, 3, 4, 5, 6],
+            msg="Elbow data does not cover every k."
+        )
+        self.assertTrue(
+            expr=all(
+                elbow_data[k] > elbow_data[k + 1] for k in range(1, 6)
+            ),
+            msg="Inertia does not fall with splits."
+        )
+        for k in range(1, 7):
+            labels: np.ndarray = kmeans.cut(k=k)
+            self.assertEqual(
+                first=len(np.unique(labels)),
+                second=k,
+                msg="Cut has a wrong number of clusters."
+            )
+            self.assertAlmostEqual(
+                first=kmeans.get_inertia(),
+                second=elbow_data[k],
+                msg="Cut inertia differs from elbow data."
+            )
+
+        kmeans.cut(k=4)
+        self.assertEqual(
+            first=len(set(zip(kmeans.labels, self.blob_labels))),
+            second=4,
+            msg="Blobs are not recovered."
+        )
+        with self.assertRaises(expected_exception=ValueError):
+            kmeans.cut(k=7)
+
+    def test_save_and_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache: KMeansCache = KMeansCache(directory=directory)
+            kmeans: BisectingKMeans = BisectingKMeans(
+                data=self.data, k=5, seed=0
+            )
+            cache.get_best_result(kmeans=kmeans, runs=2)
+            cached: BisectingKMeans = BisectingKMeans(
+                data=self.data, k=5, seed=0
+            )
+            self.assertTrue(
+                expr=cache.run(cached, "get_best_result", runs=2),
+                msg="Bisecting result is not cached."
+            )
+            cached.cut(k=3)
+            kmeans.cut(k=3)
+            self.assertTrue(
+                expr=np.array_equal(a1=cached.labels, a2=kmeans.labels),
+                msg="Split tree is not restored."
+            )
+
+            path: str = os.path.join(directory, "bisecting.npz")
+            kmeans.save(path=path)
+            loaded: BisectingKMeans = BisectingKMeans.load(path=path)
+        self.assertEqual(
+            first=loaded.get_elbow_data(),
+            second=kmeans.get_elbow_data(),
+            msg="Loaded split tree differs."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+from implementation.data_analysis.cluster_metrics import (
+    calinski_harabasz,
+    calinski_harabasz_score,
+    davies_bouldin,
+    silhouette
+)
+from implementation.data_analysis.kmeans_implementation import (
+    KMeans,
+    get_kmeans_quality_data
+)
+import pandas as pd
+import numpy as np
+
+
+class TestClusterMetrics(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.data: np.ndarray = np.concatenate(
+            [
+                random_state.randn(120, 2),
+                random_state.randn(60, 2) + 4,
+                random_state.randn(20, 2) - 5
+            ]
+        )
+        self.labels: np.ndarray = np.repeat(a=[0, 1, 2], repeats=[120, 60, 20])
+        self.distances: np.ndarray = np.sqrt(
+            np.sum(
+                a=(self.data[:, np.newaxis] - self.data[np.newaxis])**2,
+                axis=2
+            )
+        )
+        self.centroids: np.ndarray = np.array(
+            [np.mean(a=self.data[self.labels == label], axis=0)
+             for label in range(3)]
+        )
+
+    def test_calinski_harabasz_score(self):
+        self.assertEqual(
+            first=calinski_harabasz_score(
+                inertia=10.0, total_sum_of_squares=30.0, n=12, k=3
+            ),
+            second=(20.0 / 2) / (10.0 / 9),
+            msg="Wrong Calinski-Harabasz score."
+        )
+
+    def test_calinski_harabasz(self):
+        inertia: float = np.sum(
+            a=(self.data - self.centroids[self.labels])**2
+        )
+        total_sum_of_squares: float = np.sum(
+            a=(self.data - np.mean(a=self.data, axis=0))**2
+        )
+        self.assertAlmostEqual(
+            first=calinski_harabasz(
+                data=self.data, labels=self.labels, chunk_size=64
+            ),
+            second=calinski_harabasz_score(
+                inertia=inertia,
+                total_sum_of_squares=total_sum_of_squares,
+                n=200,
+                k=3
+            ),
+            msg="Wrong chunked Calinski-Harabasz score."
+        )
+
+    def test_davies_bouldin(self):
+        scatters: np.ndarray = np.array(
+            [
+                np.mean(
+                    np.sqrt(
+                        np.sum(
+                            a=(self.data[self.labels == label]
+                               - self.centroids[label])**2,
+                            axis=1
+                        )
+                    )
+                )
+                for label in range(3)
+            ]
+        )
+        ratios: list[float] = [
+            max(
+                (scatters[i] + scatters[j])
+                / np.linalg.norm(self.centroids[i] - self.centroids[j])
+                for j in range(3) if j != i
+            )
+            for i in range(3)
+        ]
+        self.assertAlmostEqual(
+            first=davies_bouldin(
+                data=self.data, labels=self.labels, chunk_size=64
+            ),
+            second=np.mean(ratios),
+            msg="Wrong Davies-Bouldin score."
+        )
+
+    def test_silhouette(self):
+        coefficients: list[float] = []
+        for ind, label in enumerate(self.labels):
+            intra: float = (
+                np.sum(self.distances[ind, self.labels == label])
+                / (np.count_nonzero(self.labels == label) - 1)
+            )
+            inter: float = min(
+                np.mean(self.distances[ind, self.labels == other])
+                for other in range(3) if other != label
+            )
+            coefficients.append((inter - intra) / max(intra, inter))
+
+        score, error = silhouette(
+            data=self.data, labels=self.labels, chunk_size=64
+        )
+        self.assertAlmostEqual(
+            first=score,
+            second=np.mean(coefficients),
+            msg="Wrong exact silhouette score."
+        )
+        self.assertEqual(first=error, second=0.0, msg="Exact score has error.")
+
+        sample_score, sample_error = silhouette(
+            data=self.data, labels=self.labels, sample_size=50, seed=0
+        )
+        self.assertGreater(a=sample_error, b=0.0, msg="No error estimate.")
+        self.assertLess(
+            a=abs(sample_score - score),
+            b=4 * sample_error,
+            msg="Sampled silhouette is far from the exact score."
+        )
+
+    def test_quality_of_converged_clusters(self):
+        quality: pd.DataFrame = get_kmeans_quality_data(
+            data=self.data, k_variants=[2, 3], runs=2, seed=0
+        )
+        seeding_quality: pd.DataFrame = get_kmeans_quality_data(
+            data=self.data, k_variants=[2, 3], runs=2, seed=0, max_iter=0
+        )
+        for row in quality.itertuples():
+            kmeans: KMeans = KMeans(
+                data=self.data, k=row.k, deduplicate="auto", seed=0
+            )
+            kmeans.get_best_result(runs=2, max_iter=300)
+            self.assertAlmostEqual(
+                first=row.inertia,
+                second=kmeans.inertia,
+                msg="Clusters are scored before they converge."
+            )
+            self.assertAlmostEqual(
+                first=row.calinski_harabasz,
+                second=calinski_harabasz(
+                    data=self.data, labels=kmeans.get_labels()
+                ),
+                msg="Score is not the one of converged clusters."
+            )
+        self.assertTrue(
+            expr=(quality["inertia"] < seeding_quality["inertia"]).any(),
+            msg="Converged clusters do not lower the inertia of seeding."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import numpy as np
+import pandas as pd
+from implementation.data_analysis.column_profiler import (
+    HyperLogLog,
+    get_profile_table,
+    profile_table
+)
+
+
+class TestColumnProfiler(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.Generator = np.random.default_rng(seed=0)
+        amounts: pd.Series = pd.Series(
+            random_state.lognormal(mean=10.0, sigma=2.0, size=1000)
+        )
+        amounts[::7] = np.nan
+        self.data: pd.DataFrame = pd.DataFrame({
+            "amount": amounts,
+            "age": random_state.integers(low=1, high=40, size=1000),
+            "country": pd.Series(
+                random_state.choice(
+                    a=["United States", "France", "Japan", None], size=1000
+                )
+            ).astype("category")
+        })
+
+    def test_profile_matches_pandas(self):
+        # Small chunks, so chunk merging is exercised.
+        profile: dict = profile_table(data=self.data, chunk_size=64)
+        self.assertEqual(
+            first=profile["rows"], second=len(self.data), msg="Rows are lost."
+        )
+        for column in self.data.columns:
+            column_profile: dict = profile["columns"][column]
+            self.assertEqual(
+                first=column_profile["nulls"],
+                second=int(self.data[column].isna().sum()),
+                msg=f"Nulls of {column} are miscounted."
+            )
+            self.assertEqual(
+                first=column_profile["distinct"],
+                second=self.data[column].nunique(),
+                msg=f"Distinct values of {column} are miscounted."
+            )
+            # Values of equal counts may come in any order.
+            self.assertEqual(
+                first=[count for _, count in column_profile["top_values"]],
+                second=list(self.data[column].value_counts().iloc[:10]),
+                msg=f"Top value counts of {column} are wrong."
+            )
+
+        description: pd.DataFrame = self.data.describe()
+        for column in ["amount", "age"]:
+            column_profile = profile["columns"][column]
+            for statistic, name in [
+                ("mean", "mean"), ("std", "std"), ("min", "min"),
+                ("max", "max"), ("50%", "quantiles")
+            ]:
+                value: float = column_profile[name]
+                if name == "quantiles":
+                    value = value["0.5"]
+                self.assertAlmostEqual(
+                    first=value,
+                    second=description.loc[statistic, column],
+                    places=6,
+                    msg=f"{statistic} of {column} differs from describe."
+                )
+        self.assertNotIn(
+            member="mean",
+            container=profile["columns"]["country"],
+            msg="Categorical column has moments."
+        )
+        self.assertEqual(
+            first=list(get_profile_table(profile=profile).index),
+            second=list(self.data.columns),
+            msg="Profile table does not have a row per column."
+        )
+
+    def test_chunked_input(self):
+        chunks: list[pd.DataFrame] = [
+            self.data.iloc[start:start + 300]
+            for start in range(0, len(self.data), 300)
+        ]
+        # Top values of equal counts and float sums may differ by order.
+        pd.testing.assert_frame_equal(
+            left=get_profile_table(
+                profile=profile_table(data=iter(chunks))
+            ).drop(columns="top_value"),
+            right=get_profile_table(
+                profile=profile_table(data=self.data)
+            ).drop(columns="top_value"),
+            check_exact=False,
+            obj="Profile of chunks"
+        )
+
+    def test_approximate_distinct(self):
+        values: pd.DataFrame = pd.DataFrame({"id": np.arange(50000)})
+        column_profile: dict = profile_table(
+            data=values, chunk_size=4096, distinct_limit=1000, sample_size=100
+        )["columns"]["id"]
+        self.assertFalse(
+            expr=column_profile["distinct_exact"],
+            msg="Distinct count above the limit is reported as exact."
+        )
+        self.assertAlmostEqual(
+            first=column_profile["distinct"],
+            second=50000,
+            delta=50000 * 0.05,
+            msg="HyperLogLog estimate is off by more than 5%."
+        )
+        self.assertFalse(
+            expr=column_profile["quantiles_exact"],
+            msg="Sampled quantiles are reported as exact."
+        )
+        self.assertAlmostEqual(
+            first=column_profile["quantiles"]["0.5"],
+            second=25000,
+            delta=5000,
+            msg="Median of the sample is far from the median."
+        )
+
+        first: HyperLogLog = HyperLogLog()
+        second: HyperLogLog = HyperLogLog()
+        hashes: np.ndarray = pd.util.hash_array(np.arange(20000))
+        first.update(hashes=hashes[:12000])
+        second.update(hashes=hashes[8000:])
+        first.merge(other=second)
+        self.assertAlmostEqual(
+            first=first.count(),
+            second=20000,
+            delta=20000 * 0.05,
+            msg="Merged counters count overlapping values twice."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.data_store import (
+    STARTUP_SCHEMA,
+    apply_schema,
+    read_table,
+    write_table
+)
+import pandas as pd
+
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+        self.data: pd.DataFrame = apply_schema(
+            data=pd.DataFrame(
+                data={
+                    "name": ["A", "B", "C"],
+                    "industry": ["Launch", "Satellites", "Launch"],
+                    "startup_size": ["Small", "Very Small", "Enterprise"],
+                    "current_funding_level": ["Seed", "Series A", "Seed"],
+                    "year_founded": ["2015", "2019", "2001"],
+                    "amount_raised(usd)": [1e6, 0.0, 3e9]
+                }
+            )
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_round_trip(self, path: str):
+        write_table(data=self.data, path=path)
+        # Re-writing a read table must not add index columns.
+        write_table(data=read_table(path=path), path=path)
+        data: pd.DataFrame = read_table(path=path)
+        self.assertEqual(
+            first=list(data.columns),
+            second=list(self.data.columns),
+            msg="Stored columns differ from the written ones."
+        )
+        self.assertTrue(
+            expr=data.equals(self.data),
+            msg="Stored table differs from the written one."
+        )
+        projected: pd.DataFrame = read_table(
+            path=path, columns=["startup_size", "year_founded"]
+        )
+        self.assertEqual(
+            first=list(projected.columns),
+            second=["startup_size", "year_founded"],
+            msg="Read columns differ from the projected ones."
+        )
+        self.assertEqual(
+            first=projected["startup_size"].dtype,
+            second=STARTUP_SCHEMA["startup_size"],
+            msg="Size is not read as an ordered categorical."
+        )
+
+    def test_schema(self):
+        self.assertEqual(
+            first=str(self.data["year_founded"].dtype),
+            second="int64",
+            msg="Year is not converted."
+        )
+        self.assertTrue(
+            expr=self.data["startup_size"].cat.ordered,
+            msg="Size is not ordered."
+        )
+        self.assertEqual(
+            first=self.data["current_funding_level"].max(),
+            second="Series A",
+            msg="Funding levels are not ordered by level."
+        )
+
+    def test_csv_round_trip(self):
+        self.assert_round_trip(
+            path=os.path.join(self.temp_dir.name, "table.csv")
+        )
+
+    def test_parquet_round_trip(self):
+        self.assert_round_trip(
+            path=os.path.join(self.temp_dir.name, "table.parquet")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.distance_metrics import (
+    METRICS,
+    cosine_kernel,
+    manhattan_kernel,
+    register_metric,
+    squared_euclidean_kernel
+)
+from implementation.data_analysis.kmeans_implementation import KMeans
+import numpy as np
+
+
+class TestDistanceMetrics(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.block: np.ndarray = random_state.randn(30, 4)
+        self.centroids: np.ndarray = random_state.randn(5, 4)
+        self.differences: np.ndarray = (
+            self.block[:, np.newaxis] - self.centroids[np.newaxis]
+        )
+
+    def tearDown(self):
+        METRICS.pop("chebyshev", None)
+
+    def test_kernels(self):
+        self.assertTrue(
+            expr=np.allclose(
+                a=squared_euclidean_kernel(self.block, self.centroids),
+                b=np.sum(a=self.differences**2, axis=2)
+            ),
+            msg="Wrong squared Euclidean distances."
+        )
+        self.assertTrue(
+            expr=np.allclose(
+                a=manhattan_kernel(self.block, self.centroids),
+                b=np.sum(a=np.abs(self.differences), axis=2)
+            ),
+            msg="Wrong Manhattan distances."
+        )
+        similarities: np.ndarray = (self.block @ self.centroids.T) / np.outer(
+            np.linalg.norm(self.block, axis=1),
+            np.linalg.norm(self.centroids, axis=1)
+        )
+        self.assertTrue(
+            expr=np.allclose(
+                a=cosine_kernel(self.block, self.centroids),
+                b=1.0 - similarities
+            ),
+            msg="Wrong cosine distances."
+        )
+
+    def test_weighted_medians(self):
+        kmeans: KMeans = KMeans(
+            data=np.array([[0.0, 1.0], [1.0, 5.0], [10.0, 2.0], [20.0, 0.0]]),
+            k=2,
+            sample_weight=np.array([1.0, 1.0, 3.0, 1.0]),
+            metric="manhattan"
+        )
+        kmeans.centroids = np.array([[0.0, 0.0], [100.0, 100.0]])
+        kmeans.labels = np.array([0, 0, 0, 0])
+        empty_clusters: np.ndarray = kmeans.update_centroids()
+
+        self.assertTrue(
+            expr=np.array_equal(
+                a1=kmeans.centroids, a2=[[10.0, 2.0], [100.0, 100.0]]
+            ),
+            msg="Centroids are not weighted medians."
+        )
+        self.assertEqual(
+            first=list(empty_clusters),
+            second=[False, True],
+            msg="Wrong empty clusters."
+        )
+
+    def test_cosine_fit(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        directions: np.ndarray = np.repeat(
+            a=[[1.0, 0.0], [0.0, 1.0]], repeats=50, axis=0
+        )
+        data: np.ndarray = (
+            directions * random_state.uniform(low=1, high=100, size=(100, 1))
+            + random_state.randn(100, 2) * 0.05
+        )
+        kmeans: KMeans = KMeans(data=data, k=2, seed=0, metric="cosine")
+        kmeans.fit()
+
+        self.assertEqual(
+            first=len(
+                set(zip(kmeans.labels, np.repeat(a=[0, 1], repeats=50)))
+            ),
+            second=2,
+            msg="Directions are not clustered."
+        )
+        self.assertTrue(
+            expr=np.allclose(
+                a=np.linalg.norm(kmeans.centroids, axis=1), b=1.0
+            ),
+            msg="Centroids are not normalized."
+        )
+
+    def test_custom_metric(self):
+        kernel_calls: list[int] = []
+
+        def chebyshev_kernel(block, centroids):
+            kernel_calls.append(len(block))
+            return np.max(
+                a=np.abs(block[:, np.newaxis] - centroids[np.newaxis]), axis=2
+            )
+
+        register_metric(name="chebyshev", kernel=chebyshev_kernel)
+        kmeans: KMeans = KMeans(
+            data=self.block, k=3, chunk_size=10, seed=0, metric="chebyshev"
+        )
+        kmeans.fit()
+
+        self.assertEqual(
+            first=max(kernel_calls),
+            second=10,
+            msg="Custom kernel is not called on blocks."
+        )
+        self.assertAlmostEqual(
+            first=kmeans.inertia,
+            second=np.sum(
+                np.max(
+                    a=np.abs(self.block - kmeans.centroids[kmeans.labels]),
+                    axis=1
+                )
+            ),
+            msg="Wrong custom metric inertia."
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "kmeans.npz")
+            kmeans.save(path=path)
+            self.assertEqual(
+                first=KMeans.load(path=path).metric.name,
+                second="chebyshev",
+                msg="Metric is not restored."
+            )
+        with self.assertRaises(expected_exception=ValueError):
+            KMeans(data=self.block, k=3, metric="cosine", algorithm="kdtree")
+
+
+if __name__ == "__main__":
+    unittest.main()
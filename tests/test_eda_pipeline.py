@@ -0,0 +1,240 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from implementation.data_analysis.content_hashing import get_code_version
+from implementation.data_analysis.eda_pipeline import Pipeline, StageCache
+from implementation.data_analysis.exploratory_data_analysis import (
+    DATA_PATH,
+    clean_data,
+    derive_features,
+    load_data
+)
+import pandas as pd
+
+
+HELPER_SOURCE: str = (
+    "SCALE = {scale}\n\n\ndef scale(value):\n    return value * SCALE\n"
+    "\n\ndef unused(value):\n    return value + {offset}\n"
+)
+
+
+def double(values: list[int]) -> list[int]:
+    return [value * 2 for value in values]
+
+
+def write_sum(values: list[int], path: str) -> str:
+    with open(file=path, mode="w") as file:
+        file.write(str(sum(values)))
+    return path
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+        self.cache: StageCache = StageCache(
+            directory=os.path.join(self.temp_dir.name, "cache")
+        )
+        self.path: str = os.path.join(self.temp_dir.name, "sum.txt")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_pipeline(self, values: list[int]) -> Pipeline:
+        pipeline: Pipeline = Pipeline(cache=self.cache)
+        pipeline.stage(name="load", func=lambda values: values, values=values)
+        pipeline.stage(name="double", func=double, inputs=["load"])
+        pipeline.stage(
+            name="export",
+            func=write_sum,
+            inputs=["double"],
+            outputs=[self.path],
+            path=self.path
+        )
+        return pipeline
+
+    def test_cached_stages_skipped(self):
+        self.assertEqual(
+            first=self.run_pipeline(values=[1, 2, 3]).executed,
+            second=["load", "double", "export"],
+            msg="Stages of the first run are not executed."
+        )
+        pipeline: Pipeline = self.run_pipeline(values=[1, 2, 3])
+        self.assertEqual(
+            first=pipeline.executed,
+            second=[],
+            msg="Unchanged stages are executed again."
+        )
+        self.assertEqual(
+            first=pipeline.get("double"),
+            second=[2, 4, 6],
+            msg="Cached stage output differs from the computed one."
+        )
+
+    def test_invalidation(self):
+        self.run_pipeline(values=[1, 2, 3])
+        self.assertEqual(
+            first=self.run_pipeline(values=[1, 2, 4]).executed,
+            second=["load", "double", "export"],
+            msg="Changed parameters do not invalidate downstream stages."
+        )
+        with open(file=self.path, mode="r") as file:
+            self.assertEqual(
+                first=file.read(), second="14", msg="Output is stale."
+            )
+
+        os.remove(self.path)
+        self.assertEqual(
+            first=self.run_pipeline(values=[1, 2, 4]).executed,
+            second=["export"],
+            msg="Only the stage with a missing output has to run."
+        )
+
+    def test_overwritten_output(self):
+        self.run_pipeline(values=[1, 2, 3])
+        self.run_pipeline(values=[1, 2, 4])
+        # Stages of the first run are cached, but its output is overwritten.
+        self.assertEqual(
+            first=self.run_pipeline(values=[1, 2, 3]).executed,
+            second=["export"],
+            msg="Stage with an overwritten output is not executed."
+        )
+        with open(file=self.path, mode="r") as file:
+            self.assertEqual(
+                first=file.read(), second="12", msg="Output is stale."
+            )
+        self.assertEqual(
+            first=self.run_pipeline(values=[1, 2, 3]).executed,
+            second=[],
+            msg="Restored output is written again."
+        )
+
+
+class TestCodeVersion(unittest.TestCase):
+    def write_module(self, name: str, source: str):
+        with open(
+            file=os.path.join(self.temp_dir.name, f"{name}.py"), mode="w"
+        ) as file:
+            file.write(source)
+
+    def setUp(self):
+        # Under the repository, so the modules are versioned with
+        # the code they reference.
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory(dir=os.path.dirname(__file__))
+        )
+        # Rewritten modules of the same size must not load stale bytecode.
+        self.dont_write_bytecode: bool = sys.dont_write_bytecode
+        sys.dont_write_bytecode = True
+        self.write_module(
+            name="versioned_helpers",
+            source=HELPER_SOURCE.format(scale=2, offset=1)
+        )
+        self.write_module(
+            name="versioned_stages",
+            source=(
+                "from versioned_helpers import scale\n\n\n"
+                "def stage(value):\n    return scale(value)\n"
+            )
+        )
+        sys.path.insert(0, self.temp_dir.name)
+
+    def tearDown(self):
+        sys.dont_write_bytecode = self.dont_write_bytecode
+        sys.path.remove(self.temp_dir.name)
+        for name in ["versioned_helpers", "versioned_stages"]:
+            sys.modules.pop(name, None)
+        self.temp_dir.cleanup()
+
+    def get_stage(self, scale: int, offset: int):
+        """
+        Method rewrites the helper module and imports the stage again,
+        like a new run of edited code.
+        """
+        self.write_module(
+            name="versioned_helpers",
+            source=HELPER_SOURCE.format(scale=scale, offset=offset)
+        )
+        for name in ["versioned_helpers", "versioned_stages"]:
+            sys.modules.pop(name, None)
+
+        return importlib.import_module(name="versioned_stages").stage
+
+    def run_stage(self, cache: StageCache, stage) -> Pipeline:
+        pipeline: Pipeline = Pipeline(cache=cache)
+        pipeline.stage(name="stage", func=stage, value=2)
+        return pipeline
+
+    def test_dependency_edits(self):
+        stage = self.get_stage(scale=2, offset=1)
+        version: str = get_code_version(func=stage)
+        self.assertEqual(
+            first=get_code_version(func=self.get_stage(scale=2, offset=5)),
+            second=version,
+            msg="Editing a function the stage does not use changes it."
+        )
+        self.assertNotEqual(
+            first=get_code_version(func=self.get_stage(scale=3, offset=5)),
+            second=version,
+            msg="Editing a constant of a helper keeps the version."
+        )
+
+    def test_unrelated_edit_reuses_stage(self):
+        cache: StageCache = StageCache(
+            directory=os.path.join(self.temp_dir.name, "cache")
+        )
+        self.run_stage(cache=cache, stage=self.get_stage(scale=2, offset=1))
+        self.assertEqual(
+            first=self.run_stage(
+                cache=cache, stage=self.get_stage(scale=2, offset=5)
+            ).executed,
+            second=[],
+            msg="Stage is executed after an edit of code it does not use."
+        )
+        self.assertEqual(
+            first=self.run_stage(
+                cache=cache, stage=self.get_stage(scale=3, offset=5)
+            ).get("stage"),
+            second=6,
+            msg="Stage is reused after an edit of a helper it uses."
+        )
+
+
+class TestEDAStages(unittest.TestCase):
+    def test_derived_columns(self):
+        main_data: pd.DataFrame = derive_features(
+            main_data=clean_data(data=load_data(path=DATA_PATH)), year=2024
+        )
+        self.assertEqual(
+            first=len(main_data), second=130, msg="Rows are lost."
+        )
+        self.assertFalse(
+            expr=main_data["industry"].isnull().any(),
+            msg="Missing industry is not filled."
+        )
+        self.assertTrue(
+            expr=(
+                main_data["startup_age"] == 2024 - main_data["year_founded"]
+            ).all(),
+            msg="Startup age is wrong."
+        )
+        for column in [
+            "startup_size",
+            "amount_raised_log",
+            "current_funding_level(num)",
+            "startup_size(num)",
+            "growing_rate",
+            "sustainability_rate"
+        ]:
+            self.assertIn(
+                member=column,
+                container=main_data.columns,
+                msg=f"Column {column} is not derived."
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+from implementation.data_analysis.feature_subset_search import (
+    enumerate_low_correlation_subsets,
+    search_feature_subsets
+)
+from implementation.data_analysis.kmeans_implementation import (
+    KMeans,
+    KMeansCache
+)
+import pandas as pd
+import numpy as np
+
+
+class TestFeatureSubsetSearch(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        a: np.ndarray = random_state.rand(200)
+        self.data: pd.DataFrame = pd.DataFrame(
+            data={
+                "a": a,
+                "a_copy": a * 2 + 1,
+                "b": random_state.rand(200),
+                "c": random_state.rand(200),
+                "name": ["startup"] * 200
+            }
+        )
+
+    def test_enumerate_low_correlation_subsets(self):
+        correlation: pd.DataFrame = (
+            self.data[["a", "a_copy", "b", "c"]].corr()
+        )
+        subsets: list[list[str]] = list(
+            enumerate_low_correlation_subsets(
+                correlation=correlation, threshold=0.5
+            )
+        )
+
+        self.assertFalse(
+            expr=any(
+                "a" in subset and "a_copy" in subset for subset in subsets
+            ),
+            msg="Correlated columns are not pruned."
+        )
+        self.assertIn(
+            member=["a", "b", "c"],
+            container=subsets,
+            msg="Low-correlation subset is missing."
+        )
+        self.assertEqual(
+            first=len(subsets),
+            second=7,
+            msg="Wrong number of subsets."
+        )
+
+    def test_search_feature_subsets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache: KMeansCache = KMeansCache(directory=directory)
+            ranking: pd.DataFrame = search_feature_subsets(
+                data=self.data,
+                threshold=0.5,
+                k_variants=[2, 3],
+                runs=2,
+                seed=0,
+                cache=cache,
+                n_jobs=2
+            )
+            rerun_ranking: pd.DataFrame = search_feature_subsets(
+                data=self.data,
+                threshold=0.5,
+                k_variants=[2, 3],
+                runs=2,
+                seed=0,
+                cache=cache,
+                n_jobs=2
+            )
+
+        self.assertEqual(
+            first=len(ranking),
+            second=14,
+            msg="Not every subset is clustered for every k."
+        )
+        self.assertTrue(
+            expr=ranking["score"].is_monotonic_decreasing,
+            msg="Subsets are not ranked by score."
+        )
+        self.assertLessEqual(
+            a=ranking["max_correlation"].max(),
+            b=0.5,
+            msg="Subsets exceed the correlation threshold."
+        )
+        pd.testing.assert_frame_equal(left=ranking, right=rerun_ranking)
+
+    def test_ranking_of_converged_clusters(self):
+        options: dict = {
+            "data": self.data, "threshold": 0.5, "k_variants": [2, 3],
+            "runs": 2, "seed": 0, "n_jobs": 1
+        }
+        ranking: pd.DataFrame = search_feature_subsets(**options)
+        seeding_ranking: pd.DataFrame = search_feature_subsets(
+            max_iter=0, **options
+        )
+
+        for row in ranking.itertuples():
+            kmeans: KMeans = KMeans(
+                data=self.data[list(row.columns)],
+                k=row.k,
+                deduplicate="auto",
+                seed=0
+            )
+            kmeans.get_best_result(runs=2, max_iter=300)
+            self.assertAlmostEqual(
+                first=row.inertia,
+                second=kmeans.inertia,
+                msg="Subsets are not scored by converged clusters."
+            )
+        merged: pd.DataFrame = ranking.merge(
+            right=seeding_ranking, on=["columns", "k"]
+        )
+        self.assertTrue(
+            expr=(merged["inertia_x"] <= merged["inertia_y"] + 1e-9).all()
+            and (merged["inertia_x"] < merged["inertia_y"]).any(),
+            msg="Converged clusters do not lower the inertia of seeding."
+        )
+        self.assertNotEqual(
+            first=list(zip(ranking["columns"], ranking["k"])),
+            second=list(zip(seeding_ranking["columns"], seeding_ranking["k"])),
+            msg="Ranking does not depend on converged clusters."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.figure_rendering import (
+    FigureCache,
+    FigureSpec,
+    render_figures
+)
+from implementation.data_analysis.kmeans_implementation import (
+    plot_clusters,
+    plot_elbow
+)
+
+
+class TestFigureRendering(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_render_in_processes(self):
+        paths: list[str] = [
+            os.path.join(self.temp_dir.name, f"figure{number}.png")
+            for number in range(3)
+        ]
+        specs: list[FigureSpec] = [
+            FigureSpec(
+                func=plot_elbow,
+                kwargs={"elbow_data": {1: 10.0, 2: 4.0, 3: 3.0}, "path": path}
+            )
+            for path in paths[:2]
+        ]
+        specs.append(
+            FigureSpec(
+                func=plot_clusters,
+                kwargs={
+                    "result": {
+                        "columns": ["x", "y"],
+                        "clusters": {
+                            (0.0, 0.0): [[0.0, 1.0], [1.0, 0.0]],
+                            (5.0, 5.0): [[5.0, 6.0], [6.0, 5.0]]
+                        }
+                    },
+                    "colors": ["red", "green"],
+                    "path": paths[2]
+                }
+            )
+        )
+
+        results: list = render_figures(specs=specs, n_jobs=2)
+        self.assertEqual(
+            first=len(results), second=3, msg="Results of specs are lost."
+        )
+        for path in paths:
+            self.assertTrue(
+                expr=os.path.exists(path), msg=f"Figure {path} is not saved."
+            )
+
+    def get_elbow_specs(
+        self, elbow_data: dict[int, float]
+    ) -> list[FigureSpec]:
+        """
+        Method builds specs of one elbow figure saved to two files.
+        Returns a list of figure specs.
+        """
+        return [
+            FigureSpec(
+                func=plot_elbow,
+                kwargs={
+                    "elbow_data": elbow_data,
+                    "path": os.path.join(self.temp_dir.name, file_name)
+                }
+            )
+            for file_name in ["elbow.png", "elbow_copy.png"]
+        ]
+
+    def test_figure_cache(self):
+        cache: FigureCache = FigureCache(
+            manifest_path=os.path.join(self.temp_dir.name, "manifest.json")
+        )
+        render_figures(
+            specs=self.get_elbow_specs(elbow_data={1: 10.0, 2: 4.0}),
+            n_jobs=1,
+            cache=cache
+        )
+        self.assertEqual(
+            first=len(cache.rendered),
+            second=2,
+            msg="New figures are not rendered."
+        )
+        # The manifest is read back by a new cache.
+        cache = FigureCache(manifest_path=cache.manifest_path)
+        render_figures(
+            specs=self.get_elbow_specs(elbow_data={1: 10.0, 2: 4.0}),
+            n_jobs=1,
+            cache=cache
+        )
+        self.assertEqual(
+            first=cache.rendered,
+            second=[],
+            msg="Unchanged figures are rendered again."
+        )
+
+        changed_specs: list[FigureSpec] = self.get_elbow_specs(
+            elbow_data={1: 10.0, 2: 5.0}
+        )
+        render_figures(specs=changed_specs[:1], n_jobs=1, cache=cache)
+        self.assertEqual(
+            first=cache.rendered,
+            second=[changed_specs[0].kwargs["path"]],
+            msg="Changed figure is not rendered."
+        )
+        render_figures(specs=changed_specs[1:], n_jobs=1, cache=cache)
+        self.assertEqual(
+            first=cache.rendered,
+            second=[],
+            msg="Identical figure is rendered instead of copied."
+        )
+        self.assertEqual(
+            first=cache.copied,
+            second=[changed_specs[1].kwargs["path"]],
+            msg="Identical figure is not copied."
+        )
+        # Both files of the identical figure are recorded.
+        render_figures(specs=changed_specs, n_jobs=1, cache=cache)
+        self.assertEqual(
+            first=(cache.rendered, cache.copied),
+            second=([], []),
+            msg="Identical figures at two files are copied again."
+        )
+
+        # An overwritten file is restored from its identical copy.
+        paths: list[str] = [spec.kwargs["path"] for spec in changed_specs]
+        with open(file=paths[0], mode="wb") as file:
+            file.write(b"overwritten")
+        render_figures(specs=changed_specs, n_jobs=1, cache=cache)
+        self.assertEqual(
+            first=(cache.rendered, cache.copied),
+            second=([], [paths[0]]),
+            msg="Overwritten figure is not restored from its copy."
+        )
+        # Without a current copy the figure is rendered again.
+        for path in paths:
+            with open(file=path, mode="wb") as file:
+                file.write(b"overwritten")
+        render_figures(specs=changed_specs, n_jobs=1, cache=cache)
+        self.assertEqual(
+            first=(cache.rendered, cache.copied),
+            second=(paths, []),
+            msg="Overwritten figures are reused."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
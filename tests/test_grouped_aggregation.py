@@ -0,0 +1,87 @@
+import unittest
+from implementation.data_analysis.grouped_aggregation import (
+    MOMENT_STATISTICS,
+    ORDER_STATISTICS,
+    aggregate_groups,
+    get_group_table
+)
+import pandas as pd
+import numpy as np
+
+
+class TestGroupedAggregation(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.data: pd.DataFrame = pd.DataFrame(
+            data={
+                "industry": random_state.choice(a=list("abcde"), size=500),
+                "country": random_state.choice(a=list("xyz"), size=500),
+                "age": random_state.randint(low=1, high=40, size=500),
+                "amount": random_state.exponential(scale=1e6, size=500)
+            }
+        )
+        self.data.loc[::11, "country"] = None
+        self.data.loc[::13, "amount"] = np.nan
+        self.statistics: tuple[str, ...] = MOMENT_STATISTICS + ORDER_STATISTICS
+
+    def test_matches_groupby(self):
+        table: pd.DataFrame = aggregate_groups(
+            data=self.data,
+            keys=["industry", "country"],
+            measures=["age", "amount"],
+            statistics=self.statistics,
+            chunk_size=64
+        )
+        for key in ["industry", "country"]:
+            for measure in ["age", "amount"]:
+                rows: pd.DataFrame = table[
+                    (table["key"] == key) & (table["measure"] == measure)
+                ]
+                for statistic in self.statistics:
+                    expected: pd.Series = getattr(
+                        self.data.groupby(key)[measure], statistic
+                    )()
+                    self.assertTrue(
+                        expr=np.allclose(
+                            rows[statistic].to_numpy(dtype=np.float64),
+                            expected.to_numpy(dtype=np.float64)
+                        ),
+                        msg=f"{statistic} of {measure} by {key} differs "
+                        "from groupby."
+                    )
+
+    def test_group_table(self):
+        table: pd.DataFrame = aggregate_groups(
+            data=self.data, keys=["industry"], measures=["age"]
+        )
+        expected: pd.DataFrame = self.data.groupby("industry")[
+            "age"
+        ].mean().sort_values(ascending=False).reset_index()
+        group_table: pd.DataFrame = get_group_table(
+            table=table, key="industry", measure="age"
+        )
+        self.assertEqual(
+            first=list(group_table["industry"]),
+            second=list(expected["industry"]),
+            msg="Groups are not sorted by the statistic."
+        )
+        self.assertTrue(
+            expr=np.allclose(group_table["age"], expected["age"]),
+            msg="Group table values differ from groupby."
+        )
+
+    def test_unknown_statistic(self):
+        with self.assertRaises(
+            expected_exception=ValueError,
+            msg="Unknown statistic is accepted."
+        ):
+            aggregate_groups(
+                data=self.data,
+                keys=["industry"],
+                measures=["age"],
+                statistics=("mode",)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.grouped_aggregation import aggregate_groups
+from implementation.data_analysis.incremental_aggregates import (
+    STATE_STATISTICS,
+    AggregateState,
+    read_aggregate_state,
+    read_changes,
+    sync_aggregate_state,
+    write_changes
+)
+import pandas as pd
+import numpy as np
+
+
+class TestIncrementalAggregates(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.data: pd.DataFrame = pd.DataFrame(
+            data={
+                "industry": random_state.choice(a=list("abcde"), size=300),
+                "country": random_state.choice(a=list("xyz"), size=300),
+                "age": random_state.randint(low=1, high=40, size=300),
+                "amount": random_state.exponential(scale=1e6, size=300)
+            }
+        )
+        self.data.loc[::11, "country"] = None
+        self.data.loc[::13, "amount"] = np.nan
+        self.options: dict[str, list[str]] = {
+            "keys": ["industry", "country"],
+            "measures": ["age", "amount"],
+            "correlation_columns": ["age", "amount"]
+        }
+
+    def assert_summarizes(self, state: AggregateState, data: pd.DataFrame):
+        table: pd.DataFrame = state.get_table()
+        expected: pd.DataFrame = aggregate_groups(
+            data=data,
+            keys=self.options["keys"],
+            measures=self.options["measures"],
+            statistics=STATE_STATISTICS
+        )
+        pd.testing.assert_frame_equal(
+            left=table,
+            right=expected,
+            check_dtype=False,
+            obj="Aggregates of the state"
+        )
+        pd.testing.assert_frame_equal(
+            left=state.get_correlation(),
+            right=data[self.options["correlation_columns"]].dropna().corr(),
+            obj="Correlation of the state"
+        )
+
+    def test_append_and_retract(self):
+        state: AggregateState = AggregateState(**self.options)
+        for start in range(0, 300, 70):
+            state.append(data=self.data.iloc[start:start + 70])
+        self.assert_summarizes(state=state, data=self.data)
+
+        # Retracting every row of a group leaves the group out.
+        retracted: pd.DataFrame = self.data[
+            (self.data.index < 40) | (self.data["industry"] == "e")
+        ]
+        state.retract(data=retracted)
+        self.assert_summarizes(
+            state=state, data=self.data.drop(index=retracted.index)
+        )
+        with self.assertRaises(
+            ValueError, msg="Rows that were not appended are retracted."
+        ):
+            state.retract(data=retracted)
+
+    def test_sync_with_change_log(self):
+        temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        path: str = os.path.join(temp_dir.name, "aggregates.json")
+        changes_path: str = os.path.join(temp_dir.name, "changes.jsonl")
+        previous: pd.DataFrame = self.data.iloc[:250]
+        state: AggregateState = sync_aggregate_state(
+            state=None,
+            current=previous,
+            version="previous",
+            changes_path=changes_path,
+            **self.options
+        )
+        state.save(path=path)
+
+        current: pd.DataFrame = pd.concat(
+            objs=[self.data.iloc[20:], self.data.iloc[:5]]
+        )
+        write_changes(
+            path=changes_path,
+            appended=pd.concat(
+                objs=[self.data.iloc[250:], self.data.iloc[:5]]
+            ),
+            retracted=self.data.iloc[:20]
+        )
+        batches, position = read_changes(path=changes_path)
+        self.assertEqual(
+            first=[(sign, len(batch)) for sign, batch in batches],
+            second=[(-1, 20), (1, 55)],
+            msg="Changes are not read in batches."
+        )
+        # current is only counted, the state is updated by the changes.
+        synced: AggregateState = sync_aggregate_state(
+            state=read_aggregate_state(path=path),
+            current=current.iloc[:, :0],
+            version="current",
+            changes_path=changes_path,
+            **self.options
+        )
+        self.assertEqual(
+            first=(synced.rows, synced.version, synced.log_position),
+            second=(len(current), "current", position),
+            msg="State is not synced to the changes."
+        )
+        self.assert_summarizes(state=synced, data=current)
+
+        # A table changed without logged changes is summarized again.
+        synced.save(path=path)
+        rebuilt: AggregateState = sync_aggregate_state(
+            state=read_aggregate_state(path=path),
+            current=previous,
+            version="edited",
+            changes_path=changes_path,
+            **self.options
+        )
+        temp_dir.cleanup()
+        self.assertEqual(
+            first=(rebuilt.rows, rebuilt.log_position),
+            second=(len(previous), position),
+            msg="State of an unlogged change is not rebuilt."
+        )
+        self.assert_summarizes(state=rebuilt, data=previous)
+
+
+if __name__ == "__main__":
+    unittest.main()
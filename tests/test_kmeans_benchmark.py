@@ -0,0 +1,64 @@
+import unittest
+from benchmarks.kmeans_benchmark import (
+    SOLVER_VARIANTS,
+    compare_with_baseline,
+    make_blobs,
+    run_benchmarks
+)
+from implementation.data_analysis.kmeans_implementation import KMeans
+import numpy as np
+from numpy.typing import NDArray
+from typing import Any
+
+
+class TestKMeansBenchmark(unittest.TestCase):
+    def test_make_blobs(self):
+        data: NDArray[np.float64] = make_blobs(n=500, d=4, k=3)
+        self.assertEqual(
+            first=data.shape,
+            second=(500, 4),
+            msg="Blobs have a wrong shape."
+        )
+        self.assertTrue(
+            expr=np.array_equal(a1=data, a2=make_blobs(n=500, d=4, k=3)),
+            msg="Blobs are not reproducible with the same seed."
+        )
+
+    def test_run_benchmarks(self):
+        records: list[dict[str, Any]] = run_benchmarks(
+            grid={"n": [300], "d": [2], "k": [3]},
+            variants=["reference", "float64", "float32"],
+            max_iter=2,
+            log=lambda message: None
+        )
+        self.assertEqual(
+            first=[record["variant"] for record in records],
+            second=["reference", "float64", "float32"],
+            msg="Not all variants are benchmarked."
+        )
+        self.assertGreater(
+            a=records[1]["peak_memory"],
+            b=0,
+            msg="Peak memory is not recorded."
+        )
+        np.random.seed(0)
+        kmeans: KMeans = KMeans(
+            data=make_blobs(n=300, d=2, k=3), k=3, **SOLVER_VARIANTS["float64"]
+        )
+        self.assertAlmostEqual(
+            first=records[1]["inertia_value"],
+            second=float(kmeans.fit(max_iter=2, tol=0.0)),
+            msg="Inertia value is not the one of the fitted model."
+        )
+
+        comparison: list[dict[str, Any]] = compare_with_baseline(
+            records=records, baseline=records
+        )
+        self.assertFalse(
+            expr=any(row["regression"] for row in comparison),
+            msg="Results are regressions against themselves."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
-from implementation.data_analysis.kmeans_implementation import KMeans
+from implementation.data_analysis.kmeans_implementation import (
+    KMeans,
+    KMeansCache,
+    fit_subsets
+)
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from numpy.typing import NDArray
+from typing import Callable
 
 
 class TestKMeansClass(unittest.TestCase):
@@ -83,7 +89,397 @@ class TestKMeansClass(unittest.TestCase):
             expr2={},
             msg="Result is empty."
         )
-        
+
+    def test_fit_trace(self):
+        records: list[dict] = []
+        stop_after_two: Callable = lambda kmeans, record: (
+            records.append(record) or record["iteration"] == 2
+        )
+        self.kmeans.fit(max_iter=10, tol=0.0, callbacks=[stop_after_two])
+
+        trace: pd.DataFrame = self.kmeans.get_trace()
+        self.assertEqual(
+            first=list(trace["iteration"]),
+            second=[1, 2],
+            msg="Callback did not stop iterations."
+        )
+        self.assertEqual(
+            first=trace.to_dict(orient="records"),
+            second=records,
+            msg="Callbacks do not receive trace records."
+        )
+        self.assertGreater(
+            a=trace.loc[0, "seeding_time"],
+            b=0.0,
+            msg="Seeding time is not recorded."
+        )
+        self.assertEqual(
+            first=trace.loc[0, "changed_points"],
+            second=len(self.kmeans.data),
+            msg="First assignment does not change all points."
+        )
+        self.assertGreaterEqual(
+            a=trace.loc[0, "inertia"],
+            b=trace.loc[1, "inertia"],
+            msg="Inertia increases between Lloyd iterations."
+        )
+
+
+class TestWeightedKMeans(unittest.TestCase):
+    def setUp(self):
+        # Low-cardinality features, as in for_kmeans.csv.
+        self.data: NDArray[np.int64] = np.random.randint(
+            low=0, high=5, size=(500, 2)
+        )
+
+    def test_deduplicate_expands_labels(self):
+        kmeans: KMeans = KMeans(data=self.data, k=3, deduplicate="auto")
+        self.assertLessEqual(
+            a=len(kmeans.data),
+            b=25,
+            msg="Identical rows are not collapsed."
+        )
+        self.assertEqual(
+            first=np.sum(kmeans.sample_weight),
+            second=len(self.data),
+            msg="Unique points' counts do not cover all rows."
+        )
+
+        kmeans.fit()
+        labels: NDArray[np.int64] = kmeans.get_labels()
+        self.assertEqual(
+            first=labels.shape,
+            second=(len(self.data),),
+            msg="Labels are not expanded back to original rows."
+        )
+        for label in np.unique(labels):
+            rows: NDArray = self.data[labels == label]
+            self.assertTrue(
+                expr=np.allclose(
+                    a=rows.mean(axis=0), b=kmeans.centroids[label]
+                ),
+                msg="Weighted centroid is not the mean of original rows."
+            )
+
+    def assert_weighted_matches_repeated(
+        self,
+        unique_points: NDArray,
+        weights: NDArray[np.float64],
+        centroids: NDArray[np.float64]
+    ):
+        repeated: NDArray = np.repeat(
+            unique_points, weights.astype(np.int64), axis=0
+        )
+        weighted_kmeans: KMeans = KMeans(
+            data=unique_points, k=len(centroids), sample_weight=weights
+        )
+        repeated_kmeans: KMeans = KMeans(data=repeated, k=len(centroids))
+
+        for kmeans in (weighted_kmeans, repeated_kmeans):
+            kmeans.centroids = centroids.copy()
+            kmeans.assign_labels()
+            kmeans.update_centroids()
+            kmeans.assign_labels()
+        self.assertTrue(
+            expr=np.allclose(
+                a=weighted_kmeans.centroids, b=repeated_kmeans.centroids
+            ),
+            msg="Weighted update differs from repeated rows."
+        )
+        self.assertAlmostEqual(
+            first=weighted_kmeans.get_inertia(),
+            second=repeated_kmeans.get_inertia(),
+            msg="Weighted inertia differs from repeated rows."
+        )
+
+    def test_sample_weight_matches_repeated_rows(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        # Integer points, as de-duplicated rows. Centroids are off
+        # the grid, so no point is equally close to two of them.
+        unique_points: NDArray[np.int64] = np.unique(
+            random_state.randint(low=0, high=5, size=(500, 2)), axis=0
+        )
+        self.assert_weighted_matches_repeated(
+            unique_points=unique_points,
+            weights=random_state.randint(
+                low=1, high=4, size=len(unique_points)
+            ).astype(np.float64),
+            centroids=np.array([[0.31, 0.17], [3.63, 1.12], [1.94, 3.71]])
+        )
+
+        # Continuous points, centroids at three of them.
+        continuous_points: NDArray[np.float64] = random_state.rand(40, 2)
+        self.assert_weighted_matches_repeated(
+            unique_points=continuous_points,
+            weights=random_state.randint(
+                low=1, high=4, size=len(continuous_points)
+            ).astype(np.float64),
+            centroids=continuous_points[
+                random_state.choice(
+                    a=len(continuous_points), size=3, replace=False
+                )
+            ]
+        )
+
+
+class TestKMeansPersistence(unittest.TestCase):
+    def setUp(self):
+        self.data: NDArray[np.float64] = np.random.rand(200, 2)
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        kmeans: KMeans = KMeans(data=self.data, k=3, seed=0)
+        kmeans.fit()
+        path: str = os.path.join(self.temp_dir.name, "model.npz")
+        kmeans.save(path=path)
+
+        loaded: KMeans = KMeans.load(path=path)
+        self.assertTrue(
+            expr=np.array_equal(a1=loaded.centroids, a2=kmeans.centroids),
+            msg="Loaded centroids differ."
+        )
+        self.assertEqual(
+            first=loaded.inertia,
+            second=kmeans.inertia,
+            msg="Loaded inertia differs."
+        )
+        self.assertEqual(
+            first=loaded.get_params(),
+            second=kmeans.get_params(),
+            msg="Loaded parameters differ."
+        )
+        self.assertTrue(
+            expr=np.array_equal(
+                a1=loaded.predict(data=self.data), a2=kmeans.labels
+            ),
+            msg="Loaded model predicts other labels."
+        )
+
+    def test_seed_is_reproducible(self):
+        first: KMeans = KMeans(data=self.data, k=3, seed=7)
+        second: KMeans = KMeans(data=self.data, k=3, seed=7)
+        first.fit()
+        second.fit()
+        self.assertTrue(
+            expr=np.array_equal(a1=first.centroids, a2=second.centroids),
+            msg="Fits with the same seed differ."
+        )
+
+    def test_cache(self):
+        cache: KMeansCache = KMeansCache(directory=self.temp_dir.name)
+        kmeans: KMeans = KMeans(data=self.data, k=3, seed=1)
+        clusters: dict = cache.get_best_result(kmeans=kmeans, runs=5)
+
+        cached_kmeans: KMeans = KMeans(data=self.data, k=3, seed=1)
+        self.assertTrue(
+            expr=cache.run(cached_kmeans, "get_best_result", runs=5),
+            msg="Stored result is not used."
+        )
+        self.assertEqual(
+            first=cached_kmeans.inertia,
+            second=kmeans.inertia,
+            msg="Cached inertia differs."
+        )
+        self.assertEqual(
+            first=list(cached_kmeans.build_clusters().keys()),
+            second=list(clusters.keys()),
+            msg="Cached clusters differ."
+        )
+
+        other_kmeans: KMeans = KMeans(data=self.data + 1.0, k=3, seed=1)
+        self.assertFalse(
+            expr=cache.run(other_kmeans, "get_best_result", runs=5),
+            msg="Stored result is used for other data."
+        )
+
+
+class TestKMeansParallelInit(unittest.TestCase):
+    def setUp(self):
+        centers: NDArray[np.float64] = np.random.uniform(
+            low=-50, high=50, size=(8, 2)
+        )
+        self.data: NDArray[np.float64] = (
+            centers[np.random.randint(low=0, high=8, size=2000)]
+            + np.random.standard_normal(size=(2000, 2))
+        )
+
+    def test_kmeans_parallel(self):
+        kmeans: KMeans = KMeans(data=self.data, k=8, init="k-means||", seed=0)
+        kmeans.initialize_centroids()
+        self.assertEqual(
+            first=kmeans.centroids.shape,
+            second=(8, 2),
+            msg="Number of centroids is not equal to defined k."
+        )
+        self.assertEqual(
+            first=len(kmeans.clusters),
+            second=8,
+            msg="Centorids have the same position."
+        )
+
+    def test_kmeans_parallel_quality(self):
+        seeding_inertias: dict[str, list[np.float64]] = {}
+        for init in ("k-means++", "k-means||"):
+            seeding_inertias[init] = []
+            for seed in range(5):
+                kmeans: KMeans = KMeans(
+                    data=self.data, k=8, init=init, seed=seed
+                )
+                kmeans.initialize_centroids()
+                kmeans.assign_labels()
+                seeding_inertias[init].append(kmeans.get_inertia())
+
+        self.assertLessEqual(
+            a=np.median(seeding_inertias["k-means||"]),
+            b=2 * np.median(seeding_inertias["k-means++"]),
+            msg="K-Means|| seeding is much worse than K-Means++."
+        )
+
+    def test_unknown_init(self):
+        with self.assertRaises(ValueError):
+            KMeans(data=self.data, k=8, init="random")
+
+
+class TestKMeansThreads(unittest.TestCase):
+    def test_threads_are_deterministic(self):
+        data: NDArray[np.float64] = np.random.rand(5000, 3)
+        results: list[tuple[NDArray, NDArray, np.float64]] = []
+        for n_jobs in (1, 4):
+            for init in ("k-means++", "k-means||"):
+                kmeans: KMeans = KMeans(
+                    data=data,
+                    k=6,
+                    chunk_size=512,
+                    seed=3,
+                    init=init,
+                    n_jobs=n_jobs
+                )
+                inertia: np.float64 = kmeans.fit()
+                results.append((kmeans.centroids, kmeans.labels, inertia))
+
+        for single, threaded in zip(results[:2], results[2:]):
+            self.assertTrue(
+                expr=np.array_equal(a1=single[0], a2=threaded[0]),
+                msg="Centroids depend on the number of threads."
+            )
+            self.assertTrue(
+                expr=np.array_equal(a1=single[1], a2=threaded[1]),
+                msg="Labels depend on the number of threads."
+            )
+            self.assertEqual(
+                first=single[2],
+                second=threaded[2],
+                msg="Inertia depends on the number of threads."
+            )
+
+
+class TestKMeansRestarts(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=5)
+        centers: NDArray[np.float64] = random_state.uniform(
+            low=-20, high=20, size=(10, 2)
+        )
+        self.data: NDArray[np.float64] = (
+            centers[random_state.randint(low=0, high=10, size=3000)]
+            + random_state.standard_normal(size=(3000, 2)) * 3
+        )
+
+    def test_early_abandon(self):
+        results: dict[bool, KMeans] = {}
+        for early_abandon in (False, True):
+            kmeans: KMeans = KMeans(data=self.data, k=10, seed=11)
+            kmeans.get_best_result(
+                runs=10, max_iter=50, tol=0.0, early_abandon=early_abandon
+            )
+            results[early_abandon] = kmeans
+
+        self.assertEqual(
+            first=results[True].inertia,
+            second=results[False].inertia,
+            msg="Early abandon loses the best run."
+        )
+        iterations: dict[bool, int] = {
+            early_abandon: kmeans.get_restarts()["iterations"].sum()
+            for early_abandon, kmeans in results.items()
+        }
+        self.assertLess(
+            a=iterations[True],
+            b=iterations[False],
+            msg="Early abandon does not save iterations."
+        )
+        self.assertTrue(
+            expr=results[True].get_restarts()["abandoned"].any(),
+            msg="No run is abandoned."
+        )
+
+    def test_patience(self):
+        kmeans: KMeans = KMeans(data=self.data, k=10, seed=11)
+        kmeans.get_best_result(runs=50, max_iter=50, patience=3)
+        restarts: pd.DataFrame = kmeans.get_restarts()
+
+        self.assertLess(
+            a=len(restarts),
+            b=50,
+            msg="Runs do not stop when the best inertia is stable."
+        )
+        self.assertEqual(
+            first=kmeans.inertia,
+            second=restarts["inertia"].min(),
+            msg="Best run is not kept."
+        )
+
+
+class TestFitSubsets(unittest.TestCase):
+    def test_fit_subsets(self):
+        dataframe: pd.DataFrame = pd.DataFrame(
+            columns=["A", "B", "C"],
+            data=np.random.rand(300, 3)
+        )
+        subsets: list[list[str]] = [["A", "B"], ["B", "C"], ["A", "B", "C"]]
+        results: list[dict] = fit_subsets(
+            data=dataframe,
+            subsets=subsets,
+            k_variants=[1, 2, 3],
+            k=[2, 3, 3],
+            runs=3,
+            seed=0,
+            n_jobs=2
+        )
+
+        self.assertEqual(
+            first=[result["columns"] for result in results],
+            second=subsets,
+            msg="Results are not in subsets order."
+        )
+        for result in results:
+            kmeans: KMeans = KMeans(
+                data=dataframe[result["columns"]],
+                k=result["k"],
+                deduplicate="auto",
+                seed=0
+            )
+            kmeans.get_best_result(runs=3)
+            self.assertAlmostEqual(
+                first=result["inertia"],
+                second=kmeans.inertia,
+                msg="Batched fit differs from a separate fit."
+            )
+            self.assertEqual(
+                first=list(result["elbow"].keys()),
+                second=[1, 2, 3],
+                msg="Elbow data does not cover k variants."
+            )
+            self.assertEqual(
+                first=result["labels"].shape,
+                second=(300,),
+                msg="Labels do not cover all rows."
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
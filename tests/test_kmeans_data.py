@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.kmeans_data import (
+    iterate_blocks,
+    load_kmeans_data
+)
+from implementation.data_analysis.kmeans_implementation import KMeans
+import pandas as pd
+import numpy as np
+from numpy.typing import NDArray
+
+
+class TestKMeansDataSources(unittest.TestCase):
+    def setUp(self):
+        self.data: NDArray[np.float64] = np.random.randint(
+            low=0, high=100, size=(300, 3)
+        ).astype(np.float64)
+        self.temp_dir: tempfile.TemporaryDirectory = (
+            tempfile.TemporaryDirectory()
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load_npy_memory_mapped(self):
+        path: str = os.path.join(self.temp_dir.name, "data.npy")
+        np.save(file=path, arr=self.data)
+
+        data: NDArray = load_kmeans_data(source=path)
+        self.assertIsInstance(
+            obj=data,
+            cls=np.memmap,
+            msg=".npy file is not opened memory-mapped."
+        )
+        del data
+
+    def test_load_chunked_reader(self):
+        chunks: list[pd.DataFrame] = [
+            pd.DataFrame(data=self.data[start:start + 70])
+            for start in range(0, len(self.data), 70)
+        ]
+        data: NDArray = load_kmeans_data(source=iter(chunks), dtype=np.float32)
+
+        self.assertEqual(
+            first=data.shape,
+            second=self.data.shape,
+            msg="Spooled chunks lost rows."
+        )
+        self.assertTrue(
+            expr=np.array_equal(a1=data, a2=self.data.astype(np.float32)),
+            msg="Spooled chunks differ from the source."
+        )
+
+    def test_iterate_blocks(self):
+        blocks: list[tuple[int, NDArray]] = list(
+            iterate_blocks(data=self.data, chunk_size=64, dtype=np.float32)
+        )
+        self.assertEqual(
+            first=[start for start, _ in blocks],
+            second=list(range(0, len(self.data), 64)),
+            msg="Blocks do not cover all data rows."
+        )
+        self.assertTrue(
+            expr=all(block.dtype == np.float32 for _, block in blocks),
+            msg="Blocks are not cast to the compute dtype."
+        )
+
+    def test_float32_fit_matches_float64(self):
+        np.random.seed(0)
+        kmeans64: KMeans = KMeans(data=self.data, k=3, chunk_size=64)
+        inertia64: np.float64 = kmeans64.fit()
+
+        np.random.seed(0)
+        kmeans32: KMeans = KMeans(
+            data=self.data, k=3, dtype=np.float32, chunk_size=64
+        )
+        inertia32: np.float64 = kmeans32.fit()
+
+        self.assertTrue(
+            expr=np.array_equal(a1=kmeans64.labels, a2=kmeans32.labels),
+            msg="float32 compute dtype changes cluster labels."
+        )
+        self.assertAlmostEqual(
+            first=inertia64 / inertia32,
+            second=1.0,
+            places=5,
+            msg="float32 inertia is not accumulated in safe precision."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
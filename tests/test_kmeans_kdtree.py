@@ -0,0 +1,104 @@
+import unittest
+from implementation.data_analysis.kmeans_kdtree import KDTree, expand_ranges
+from implementation.data_analysis.kmeans_implementation import KMeans
+import numpy as np
+
+
+class TestKDTree(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.data: np.ndarray = random_state.rand(3000, 2) * 10
+        self.centroids: np.ndarray = random_state.rand(40, 2) * 10
+        self.weights: np.ndarray = random_state.rand(3000)
+        self.distances: np.ndarray = np.sum(
+            a=(self.data[:, np.newaxis] - self.centroids[np.newaxis])**2,
+            axis=2
+        )
+
+    def test_expand_ranges(self):
+        self.assertEqual(
+            first=list(
+                expand_ranges(
+                    starts=np.array([2, 7, 0]), ends=np.array([4, 7, 3])
+                )
+            ),
+            second=[2, 3, 0, 1, 2],
+            msg="Ranges are not concatenated."
+        )
+
+    def test_assign(self):
+        tree: KDTree = KDTree(
+            data=self.data, sample_weight=self.weights, leaf_size=8
+        )
+        labels, inertia = tree.assign(centroids=self.centroids)
+
+        self.assertTrue(
+            expr=np.array_equal(
+                a1=labels, a2=np.argmin(a=self.distances, axis=1)
+            ),
+            msg="Filtering assignment differs from brute force."
+        )
+        self.assertAlmostEqual(
+            first=inertia,
+            second=np.min(a=self.distances, axis=1) @ self.weights,
+            places=6,
+            msg="Wrong weighted inertia."
+        )
+
+    def test_assign_ties(self):
+        # Integer points and centroids, so equal distances are exact:
+        # points on bisectors and duplicated centroids.
+        random_state: np.random.RandomState = np.random.RandomState(seed=1)
+        data: np.ndarray = random_state.randint(
+            low=0, high=9, size=(2000, 2)
+        ).astype(np.float64)
+        centroids: np.ndarray = np.array(
+            [[6, 6], [2, 2], [2, 6], [6, 2], [4, 4], [2, 2], [4, 4], [0, 8]],
+            dtype=np.float64
+        )
+        distances: np.ndarray = np.sum(
+            a=(data[:, np.newaxis] - centroids[np.newaxis])**2, axis=2
+        )
+        for leaf_size in (1, 4, 32):
+            labels, _ = KDTree(data=data, leaf_size=leaf_size).assign(
+                centroids=centroids
+            )
+            self.assertTrue(
+                expr=np.array_equal(
+                    a1=labels, a2=np.argmin(a=distances, axis=1)
+                ),
+                msg="Ties are not broken by the lowest centroid index."
+            )
+
+    def test_kmeans_algorithm(self):
+        self.assertEqual(
+            first=KMeans(data=self.data, k=40).get_algorithm(),
+            second="kdtree",
+            msg="Kd-tree is not selected for large k on 2D data."
+        )
+        self.assertEqual(
+            first=KMeans(data=self.data, k=3).get_algorithm(),
+            second="brute",
+            msg="Kd-tree is selected for small k."
+        )
+
+        results: list[KMeans] = []
+        for algorithm in ("brute", "kdtree"):
+            kmeans: KMeans = KMeans(
+                data=self.data, k=40, seed=0, algorithm=algorithm
+            )
+            kmeans.fit(max_iter=10)
+            results.append(kmeans)
+        self.assertTrue(
+            expr=np.array_equal(a1=results[0].labels, a2=results[1].labels),
+            msg="Kd-tree fit differs from brute force fit."
+        )
+        self.assertAlmostEqual(
+            first=results[0].inertia,
+            second=results[1].inertia,
+            msg="Kd-tree fit has other inertia."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.kprototypes import (
+    KPrototypes,
+    decode_prototypes,
+    encode_categoricals
+)
+import pandas as pd
+import numpy as np
+
+
+class TestKPrototypes(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.labels: np.ndarray = np.repeat(a=[0, 1, 2], repeats=50)
+        self.data: pd.DataFrame = pd.DataFrame(
+            data={
+                "size": random_state.randn(150) + self.labels * 6,
+                "industry": np.array(
+                    ["Launch", "Satellites", "Robotics"]
+                )[self.labels],
+                "country": np.where(
+                    random_state.rand(150) < 0.8,
+                    np.array(["US", "UK", "Japan"])[self.labels],
+                    "US"
+                )
+            }
+        )
+        self.encoded, self.categories = encode_categoricals(
+            data=self.data, columns=["industry", "country"]
+        )
+
+    def test_encode_categoricals(self):
+        self.assertEqual(
+            first=list(self.categories["industry"]),
+            second=["Launch", "Robotics", "Satellites"],
+            msg="Categories are not sorted."
+        )
+        pd.testing.assert_frame_equal(
+            left=decode_prototypes(
+                centroids=self.encoded.to_numpy(dtype=np.float64),
+                columns=list(self.encoded.columns),
+                categories=self.categories
+            ),
+            right=self.data,
+            check_dtype=False
+        )
+
+    def test_fit(self):
+        kprototypes: KPrototypes = KPrototypes(
+            data=self.encoded,
+            k=3,
+            categorical=["industry", "country"],
+            seed=0
+        )
+        kprototypes.get_best_result(runs=5, max_iter=50)
+
+        self.assertEqual(
+            first=kprototypes.categorical,
+            second=[1, 2],
+            msg="Categorical column names are not converted to positions."
+        )
+        self.assertEqual(
+            first=len(set(zip(kprototypes.labels, self.labels))),
+            second=3,
+            msg="Clusters are not recovered."
+        )
+        for centroid in kprototypes.centroids:
+            label: int = int(np.argmin(np.abs(centroid[0] - [0, 6, 12])))
+            self.assertEqual(
+                first=decode_prototypes(
+                    centroids=centroid[np.newaxis, :],
+                    columns=list(self.encoded.columns),
+                    categories=self.categories
+                )["country"][0],
+                second=["US", "UK", "Japan"][label],
+                msg="Prototype category is not the cluster mode."
+            )
+
+        inertia: float = sum(
+            np.sum((self.encoded["size"][self.labels == label]
+                    - np.mean(self.encoded["size"][self.labels == label]))**2)
+            for label in range(3)
+        ) + kprototypes.get_gamma() * np.count_nonzero(
+            self.data["country"]
+            != np.array(["US", "UK", "Japan"])[self.labels]
+        )
+        self.assertAlmostEqual(
+            first=kprototypes.inertia,
+            second=inertia,
+            msg="Wrong mixed inertia."
+        )
+
+    def test_weighted_modes(self):
+        kprototypes: KPrototypes = KPrototypes(
+            data=np.array([[0.0, 0.0], [0.0, 1.0], [0.0, 1.0]]),
+            k=1,
+            categorical=[1],
+            sample_weight=np.array([5.0, 1.0, 1.0])
+        )
+        kprototypes.centroids = np.array([[0.0, 1.0]])
+        kprototypes.assign_labels()
+        kprototypes.update_centroids()
+
+        self.assertEqual(
+            first=kprototypes.centroids[0, 1],
+            second=0.0,
+            msg="Mode does not count sample weights."
+        )
+
+    def test_invalid_codes(self):
+        with self.assertRaises(expected_exception=ValueError):
+            KPrototypes(
+                data=np.array([[0.0, 0.5], [1.0, 1.0]]), k=1, categorical=[1]
+            )
+
+    def test_file_sources(self):
+        fitted: KPrototypes = KPrototypes(
+            data=self.encoded, k=3, categorical=["industry", "country"], seed=0
+        )
+        fitted.fit()
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path: str = os.path.join(directory, "encoded.csv")
+            self.encoded.to_csv(path_or_buf=csv_path, index=False)
+            kprototypes: KPrototypes = KPrototypes(
+                data=csv_path, k=3, categorical=["industry", "country"], seed=0
+            )
+            kprototypes.fit()
+            self.assertEqual(
+                first=kprototypes.categorical,
+                second=[1, 2],
+                msg="Column names of a table file are not converted."
+            )
+            self.assertTrue(
+                expr=np.allclose(a=kprototypes.centroids, b=fitted.centroids),
+                msg="Fit of a table file differs from the dataframe fit."
+            )
+
+            npy_path: str = os.path.join(directory, "encoded.npy")
+            np.save(file=npy_path, arr=self.encoded.to_numpy(dtype=np.float64))
+            with self.assertRaises(
+                expected_exception=ValueError,
+                msg="Names of columns of a .npy file are resolved."
+            ):
+                KPrototypes(data=npy_path, k=3, categorical=["industry"])
+            self.assertEqual(
+                first=KPrototypes(
+                    data=npy_path, k=3, categorical=[2, 1]
+                ).categorical,
+                second=[1, 2],
+                msg="Column positions are not kept."
+            )
+
+    def test_save_and_load(self):
+        kprototypes: KPrototypes = KPrototypes(
+            data=self.encoded,
+            k=3,
+            categorical=["industry", "country"],
+            seed=0
+        )
+        kprototypes.fit()
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "kprototypes.npz")
+            kprototypes.save(path=path)
+            loaded: KPrototypes = KPrototypes.load(path=path)
+
+        self.assertTrue(
+            expr=np.array_equal(
+                a1=loaded.predict(data=self.encoded), a2=kprototypes.labels
+            ),
+            msg="Loaded model predicts other labels."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
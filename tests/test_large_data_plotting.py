@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.exploratory_data_analysis import (
+    get_binned_figure_specs
+)
+from implementation.data_analysis.figure_rendering import render_figures
+from implementation.data_analysis.large_data_plotting import (
+    get_box_statistics,
+    get_density,
+    get_histogram,
+    get_stratified_sample,
+    sample_clusters
+)
+import pandas as pd
+import numpy as np
+
+
+class TestLargeDataPlotting(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.values: np.ndarray = random_state.normal(size=10000)
+        self.values[::100] = np.nan
+
+    def test_bins(self):
+        counts, edges = get_histogram(values=self.values, bins=20)
+        self.assertEqual(
+            first=(len(counts), len(edges)),
+            second=(20, 21),
+            msg="Histogram does not have the requested bins."
+        )
+        self.assertEqual(
+            first=counts.sum(),
+            second=9900,
+            msg="Histogram does not count every present value."
+        )
+        density, x_edges, y_edges = get_density(
+            x=self.values, y=self.values[::-1], bins=16
+        )
+        self.assertEqual(
+            first=(density.shape, density.sum()),
+            second=((16, 16), 9800),
+            msg="Density does not count every complete pair."
+        )
+
+    def test_box_statistics(self):
+        from matplotlib.cbook import boxplot_stats
+
+        present: np.ndarray = self.values[~np.isnan(self.values)]
+        expected: dict = boxplot_stats(X=present)[0]
+        statistics: dict = get_box_statistics(values=self.values, fliers=10)
+        for name in ["med", "q1", "q3", "whislo", "whishi"]:
+            self.assertAlmostEqual(
+                first=statistics[name],
+                second=expected[name],
+                msg=f"Box plot {name} differs from matplotlib."
+            )
+        self.assertEqual(
+            first=len(statistics["fliers"]),
+            second=10,
+            msg="Outliers are not limited."
+        )
+        self.assertEqual(
+            first=(statistics["fliers"].min(), statistics["fliers"].max()),
+            second=(present.min(), present.max()),
+            msg="Extreme outliers are not kept."
+        )
+
+    def test_stratified_sample(self):
+        labels: np.ndarray = np.repeat(a=[0, 1, 2], repeats=[20000, 1000, 10])
+        sample: np.ndarray = get_stratified_sample(
+            labels=labels, size=2000, minimum=50
+        )
+        self.assertEqual(
+            first=len(np.unique(sample)),
+            second=len(sample),
+            msg="Rows are sampled more than once."
+        )
+        self.assertEqual(
+            first=np.bincount(labels[sample]).tolist(),
+            second=[1903, 95, 10],
+            msg="Strata are not sampled proportionally with a minimum."
+        )
+
+        clusters: dict[tuple, list] = {
+            (0.0, 0.0): np.zeros(shape=(5000, 2)).tolist(),
+            (1.0, 1.0): np.ones(shape=(20, 2)).tolist()
+        }
+        sampled: dict[tuple, np.ndarray] = sample_clusters(
+            clusters=clusters, size=500, minimum=50
+        )
+        self.assertEqual(
+            first={
+                centroid: len(points) for centroid, points in sampled.items()
+            },
+            second={(0.0, 0.0): 498, (1.0, 1.0): 20},
+            msg="Cluster points are not sampled by cluster."
+        )
+        self.assertTrue(
+            expr=np.all(sampled[(1.0, 1.0)] == 1.0),
+            msg="Sampled points belong to another cluster."
+        )
+
+    def test_binned_figures(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        main_data: pd.DataFrame = pd.DataFrame(
+            data={
+                "startup_age": random_state.randint(low=1, high=40, size=5000),
+                "year_founded": random_state.randint(
+                    low=1990, high=2022, size=5000
+                ),
+                "amount_raised(usd)": random_state.exponential(
+                    scale=1e7, size=5000
+                )
+            }
+        )
+        main_data["amount_raised_log"] = np.log1p(
+            main_data["amount_raised(usd)"]
+        )
+        for column in [
+            "industry",
+            "country",
+            "startup_size",
+            "employees_number",
+            "current_funding_level"
+        ]:
+            main_data[column] = pd.Categorical(
+                values=random_state.choice(a=list("abc"), size=5000)
+            )
+
+        temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        paths: list = render_figures(
+            specs=get_binned_figure_specs(
+                main_data=main_data, image_save_dir=temp_dir.name
+            ),
+            n_jobs=1
+        )
+        for path in paths:
+            self.assertTrue(
+                expr=os.path.exists(path), msg=f"Figure {path} is not saved."
+            )
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
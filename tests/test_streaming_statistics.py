@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from implementation.data_analysis.data_store import iterate_table
+from implementation.data_analysis.streaming_statistics import (
+    MomentState,
+    get_streaming_moments,
+    stream_moments
+)
+import pandas as pd
+import numpy as np
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    def setUp(self):
+        random_state: np.random.RandomState = np.random.RandomState(seed=0)
+        self.data: pd.DataFrame = pd.DataFrame(
+            data=random_state.normal(size=(3000, 3)) * [1.0, 1e6, 5.0]
+            + [0.0, 1e9, 3.0],
+            columns=["age", "amount", "level"]
+        )
+        self.data["level"] += self.data["age"] * 2.0
+        self.data.loc[::7, "age"] = np.nan
+        self.data.loc[::11, "level"] = np.nan
+        self.columns: list[str] = list(self.data.columns)
+
+    def assert_summarizes(self, state: MomentState, data: pd.DataFrame):
+        pd.testing.assert_frame_equal(
+            left=state.get_correlation(),
+            right=data.corr(),
+            obj="Streamed correlation"
+        )
+        statistics: pd.DataFrame = state.get_statistics()
+        pd.testing.assert_series_equal(
+            left=statistics["mean"],
+            right=data.mean(),
+            check_names=False,
+            obj="Streamed means"
+        )
+        pd.testing.assert_series_equal(
+            left=statistics["std"],
+            right=data.std(),
+            check_names=False,
+            obj="Streamed stds"
+        )
+
+    def test_chunks_and_subtraction(self):
+        state: MomentState = stream_moments(
+            chunks=[
+                self.data.iloc[start:start + 400]
+                for start in range(0, len(self.data), 400)
+            ],
+            columns=self.columns
+        )
+        self.assert_summarizes(state=state, data=self.data)
+
+        state.subtract(
+            other=MomentState.from_frame(data=self.data.iloc[:1000])
+        )
+        self.assert_summarizes(state=state, data=self.data.iloc[1000:])
+        with self.assertRaises(
+            ValueError, msg="Rows that were not added are subtracted."
+        ):
+            state.subtract(
+                other=MomentState.from_frame(data=self.data.iloc[:2500])
+            )
+
+    def test_files_in_processes(self):
+        temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        paths: list[str] = [
+            os.path.join(temp_dir.name, "part1.csv"),
+            os.path.join(temp_dir.name, "part2.jsonl")
+        ]
+        self.data.iloc[:1200].to_csv(path_or_buf=paths[0], index=False)
+        self.data.iloc[1200:].to_json(
+            path_or_buf=paths[1], orient="records", lines=True
+        )
+        self.assertEqual(
+            first=[
+                len(chunk) for chunk in iterate_table(
+                    path=paths[0], columns=["age"], chunk_size=500
+                )
+            ],
+            second=[500, 500, 200],
+            msg="Table is not read in chunks."
+        )
+
+        state: MomentState = get_streaming_moments(
+            paths=paths, columns=self.columns, chunk_size=500, n_jobs=2
+        )
+        temp_dir.cleanup()
+        self.assert_summarizes(state=state, data=self.data)
+        self.assert_summarizes(
+            state=MomentState.from_dict(saved=state.to_dict()), data=self.data
+        )
+
+    def test_parquet(self):
+        temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        path: str = os.path.join(temp_dir.name, "table.parquet")
+        self.data.to_parquet(path=path, index=False)
+        self.assertEqual(
+            first=[
+                list(chunk.columns) for chunk in iterate_table(
+                    path=path, columns=["age"], chunk_size=1000
+                )
+            ],
+            second=[["age"]] * 3,
+            msg="Parquet table is not read in batches of the columns."
+        )
+        state: MomentState = get_streaming_moments(
+            paths=[path], columns=self.columns, chunk_size=500
+        )
+        temp_dir.cleanup()
+        self.assert_summarizes(state=state, data=self.data)
+
+
+if __name__ == "__main__":
+    unittest.main()